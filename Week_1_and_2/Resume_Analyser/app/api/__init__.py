@@ -0,0 +1,4 @@
+"""API module exports."""
+from app.api.ranking import router as ranking_router
+
+__all__ = ["ranking_router"]
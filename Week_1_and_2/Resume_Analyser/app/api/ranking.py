@@ -0,0 +1,72 @@
+from fastapi import APIRouter, HTTPException
+
+from app.schemas import (
+    IngestRequest, IngestSummary, ParsedJD, ParsedResume, ParseJDRequest, ParseResumeRequest,
+    RankingResponse, RankRequest, SearchHit, SearchRequest, SearchResponse
+)
+from app.services import ranking_service
+
+router = APIRouter()
+
+
+@router.post("/ingest", response_model=IngestSummary)
+async def ingest_resumes(request: IngestRequest):
+    """Sync the resume folder into the vector store (only new or changed files are embedded)."""
+    try:
+        return await ranking_service.ingest(request.resume_folder, request.parse_profiles)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Ingest failed: {str(e)}")
+
+
+@router.post("/search", response_model=SearchResponse)
+async def search_resumes(request: SearchRequest):
+    """Vector search only: the closest resumes to a JD and the cascade plan used."""
+    try:
+        results, plan = await ranking_service.search(
+            request.jd_text,
+            top_k_final=request.top_k_final,
+            top_k_stage1=request.top_k_stage1
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Search failed: {str(e)}")
+
+    return SearchResponse(
+        results=[
+            SearchHit(filename=filename, score=score, text=text if request.include_text else None)
+            for filename, text, score in results
+        ],
+        plan=plan
+    )
+
+
+@router.post("/parse/jd", response_model=ParsedJD)
+async def parse_jd(request: ParseJDRequest):
+    try:
+        return await ranking_service.parse_jd(request.jd_text)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"JD parsing failed: {str(e)}")
+
+
+@router.post("/parse/resume", response_model=ParsedResume)
+async def parse_resume(request: ParseResumeRequest):
+    try:
+        return await ranking_service.parse_resume(request.resume_text, request.candidate_id)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Resume parsing failed: {str(e)}")
+
+
+@router.post("/rank", response_model=RankingResponse)
+async def rank_resumes(request: RankRequest):
+    """Full pipeline: parse, search, score, evaluate and rerank candidates for a JD."""
+    try:
+        return await ranking_service.rank(
+            request.jd_text,
+            top_k=request.top_k,
+            evaluate=request.evaluate,
+            rerank=request.rerank,
+            cross_encoder=request.cross_encoder
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Ranking failed: {str(e)}")
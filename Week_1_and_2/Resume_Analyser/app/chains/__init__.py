@@ -1,12 +1,12 @@
 """Chains module exports."""
-from app.chains.jd_parser_chain import JDParserChain, jd_parser_chain
-from app.chains.resume_parser_chain import ResumeParserChain, resume_parser_chain
-from app.chains.llm_evaluator_chain import LLMEvaluatorChain, llm_evaluator_chain
-from app.chains.reranker_chain import RerankerChain, reranker_chain
+from app.chains.jd_parser_chain import JDParserChain, jd_parser_chain, get_jd_parser_chain
+from app.chains.resume_parser_chain import ResumeParserChain, resume_parser_chain, get_resume_parser_chain
+from app.chains.llm_evaluator_chain import LLMEvaluatorChain, llm_evaluator_chain, get_llm_evaluator_chain
+from app.chains.reranker_chain import RerankerChain, reranker_chain, get_reranker_chain
 
 __all__ = [
-    "JDParserChain", "jd_parser_chain",
-    "ResumeParserChain", "resume_parser_chain",
-    "LLMEvaluatorChain", "llm_evaluator_chain",
-    "RerankerChain", "reranker_chain"
+    "JDParserChain", "jd_parser_chain", "get_jd_parser_chain",
+    "ResumeParserChain", "resume_parser_chain", "get_resume_parser_chain",
+    "LLMEvaluatorChain", "llm_evaluator_chain", "get_llm_evaluator_chain",
+    "RerankerChain", "reranker_chain", "get_reranker_chain"
 ]
@@ -1,7 +1,12 @@
-from langchain_openai import AzureChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate
+from app.chains.parse_cache import ParseCache, schema_fingerprint
 from app.config import settings
+from app.llm import get_chat_model
 from app.schemas import ParsedJD
+from app.utils.lazy import LazyProxy, LazySingleton
+
+
+JD_PARSER_SYSTEM_PROMPT = "You are an expert recruiter analyzing job descriptions."
 
 
 JD_PARSER_PROMPT = """You are an expert recruiter. Analyze this job description and extract structured requirements.
@@ -26,26 +31,62 @@ class JDParserChain:
 
     
     def __init__(self):
-        self.llm = AzureChatOpenAI(
-            azure_deployment=settings.azure.openai_deployment,
-            azure_endpoint=settings.azure.openai_endpoint,
-            api_key=settings.azure.openai_api_key,
-            api_version=settings.azure.openai_api_version,
-            temperature=0,
-            max_retries=5
-        )
+        self.llm = get_chat_model(temperature=0)
         
         self.prompt = ChatPromptTemplate.from_messages([
-            ("system", "You are an expert recruiter analyzing job descriptions."),
+            ("system", JD_PARSER_SYSTEM_PROMPT),
             ("human", JD_PARSER_PROMPT)
         ])
         
         # Structured output chain
         self.chain = self.prompt | self.llm.with_structured_output(ParsedJD)
+        
+        # Cache of LLM extractions, invalidated when the prompt or schema changes
+        self.cache = ParseCache(
+            settings.llm.parse_cache_dir,
+            "jds",
+            ParsedJD,
+            schema_fingerprint(
+                [JD_PARSER_SYSTEM_PROMPT, JD_PARSER_PROMPT],
+                ParsedJD,
+                settings.azure.openai_deployment
+            )
+        ) if settings.llm.parse_cache_enabled else None
+        if self.cache is not None and settings.llm.parse_cache_max_age_days > 0:
+            self.cache.prune(settings.llm.parse_cache_max_age_days)
     
     def parse(self, jd_text: str) -> ParsedJD:
-        return self.chain.invoke({"jd_text": jd_text})
+        if self.cache is not None:
+            cached = self.cache.get(jd_text)
+            if cached is not None:
+                return cached
+        
+        result = self.chain.invoke({"jd_text": jd_text})
+        if self.cache is not None:
+            self.cache.put(jd_text, result)
+        return result
+    
+    async def aparse(self, jd_text: str) -> ParsedJD:
+        """Async variant of parse."""
+        if self.cache is not None:
+            cached = self.cache.get(jd_text)
+            if cached is not None:
+                return cached
+        
+        result = await self.chain.ainvoke({"jd_text": jd_text})
+        if self.cache is not None:
+            self.cache.put(jd_text, result)
+        return result
+
+
+# Shared instance, built on first use
+_default_chain = LazySingleton(JDParserChain)
+
+
+def get_jd_parser_chain() -> JDParserChain:
+    """Shared JDParserChain (the LLM client is created on the first call)."""
+    return _default_chain.get()
 
 
-# Singleton instance
-jd_parser_chain = JDParserChain()
+# Backward-compatible name; building is deferred until first attribute access
+jd_parser_chain = LazyProxy(get_jd_parser_chain)
@@ -1,7 +1,23 @@
-from langchain_openai import AzureChatOpenAI
+"""
+LLM Evaluator Chain - qualitative candidate evaluation.
+
+evaluate() sends one candidate per call. evaluate_many() / aevaluate_many()
+pack several candidates into one structured-output call, so the job
+requirements block is sent once per pack instead of once per candidate.
+Packs are filled up to a prompt token budget, and any candidate whose
+evaluation is missing or malformed in the packed reply falls back to a
+single-candidate call.
+"""
+import asyncio
+from typing import Dict, List, Optional, Sequence, Union
+from langchain_core.language_models import BaseChatModel
 from langchain_core.prompts import ChatPromptTemplate
+from pydantic import BaseModel
 from app.config import settings
+from app.llm import get_chat_model
 from app.schemas import CandidateEvaluation, ParsedJD, ParsedResume
+from app.utils.lazy import LazyProxy, LazySingleton
+from app.utils.tokens import count_tokens
 
 
 EVALUATOR_PROMPT = """You are a senior hiring manager evaluating a candidate against a job description.
@@ -36,18 +52,53 @@ Provide a qualitative evaluation:
 Be honest and specific. Don't just repeat the scores."""
 
 
+BATCH_EVALUATOR_PROMPT = """You are a senior hiring manager evaluating several candidates against a job description.
+
+## Job Requirements:
+Role: {role}
+Must-Have Skills: {must_have_skills}
+Nice-to-Have Skills: {nice_to_have_skills}
+Experience Required: {min_experience}+ years
+Domain: {domain}
+
+## Candidates:
+{candidates_block}
+
+Evaluate each candidate independently against the job requirements. For every candidate provide:
+1. Key strengths that make this candidate a good fit
+2. Potential risks or gaps
+3. Skills that are missing but could be learned
+4. Brief overall fit summary (2-3 sentences)
+
+Return exactly one evaluation per candidate, with its candidate_id copied exactly.
+Be honest and specific. Don't just repeat the scores."""
+
+
+CANDIDATE_BLOCK = """### Candidate {candidate_id}
+Name: {candidate_name}
+Skills: {candidate_skills}
+Experience: {candidate_experience} years
+Projects: {candidate_projects}
+Education: {candidate_education}
+Scores: semantic={semantic_score:.2f}, skill={skill_score:.2f}, experience={experience_score:.2f}, project={project_score:.2f}, aggregate={aggregate_score:.2f}
+"""
+
+
+class KeyedEvaluation(CandidateEvaluation):
+    """Evaluation tagged with the candidate it belongs to."""
+    candidate_id: str
+
+
+class BatchEvaluationOutput(BaseModel):
+    """Batch evaluator output."""
+    evaluations: List[KeyedEvaluation]
+
+
 class LLMEvaluatorChain:
     """Chain for qualitative candidate evaluation."""
     
-    def __init__(self):
-        self.llm = AzureChatOpenAI(
-            azure_deployment=settings.azure.openai_deployment,
-            azure_endpoint=settings.azure.openai_endpoint,
-            api_key=settings.azure.openai_api_key,
-            api_version=settings.azure.openai_api_version,
-            temperature=0.3,  # Slight creativity for nuanced evaluation
-            max_retries=5
-        )
+    def __init__(self, llm: Optional[BaseChatModel] = None):
+        self.llm = llm or get_chat_model(temperature=0.3)  # Slight creativity for nuanced evaluation
         
         self.prompt = ChatPromptTemplate.from_messages([
             ("system", "You are a senior hiring manager providing candidate evaluations."),
@@ -55,21 +106,27 @@ class LLMEvaluatorChain:
         ])
         
         self.chain = self.prompt | self.llm.with_structured_output(CandidateEvaluation)
-    
-    def evaluate(
-        self,
-        jd: ParsedJD,
-        candidate: ParsedResume,
-        scores: dict
-    ) -> CandidateEvaluation:
-        """Evaluate a candidate against JD with scoring context."""
         
-        return self.chain.invoke({
+        self.batch_prompt = ChatPromptTemplate.from_messages([
+            ("system", "You are a senior hiring manager providing candidate evaluations."),
+            ("human", BATCH_EVALUATOR_PROMPT)
+        ])
+        
+        self.batch_chain = self.batch_prompt | self.llm.with_structured_output(BatchEvaluationOutput)
+    
+    @staticmethod
+    def _jd_inputs(jd: ParsedJD) -> dict:
+        return {
             "role": jd.role,
             "must_have_skills": ", ".join(jd.must_have_skills),
             "nice_to_have_skills": ", ".join(jd.nice_to_have_skills),
             "min_experience": jd.min_experience_years,
-            "domain": jd.domain,
+            "domain": jd.domain
+        }
+    
+    @staticmethod
+    def _candidate_inputs(candidate: ParsedResume, scores: dict) -> dict:
+        return {
             "candidate_name": candidate.name,
             "candidate_skills": ", ".join(candidate.skills),
             "candidate_experience": candidate.experience_years,
@@ -80,8 +137,200 @@ class LLMEvaluatorChain:
             "experience_score": scores.get("experience", 0),
             "project_score": scores.get("project", 0),
             "aggregate_score": scores.get("aggregate", 0)
-        })
+        }
+    
+    def _inputs(self, jd: ParsedJD, candidate: ParsedResume, scores: dict) -> dict:
+        return {**self._jd_inputs(jd), **self._candidate_inputs(candidate, scores)}
+    
+    def evaluate(
+        self,
+        jd: ParsedJD,
+        candidate: ParsedResume,
+        scores: dict
+    ) -> CandidateEvaluation:
+        """Evaluate a candidate against JD with scoring context."""
+        return self.chain.invoke(self._inputs(jd, candidate, scores))
+    
+    async def aevaluate(
+        self,
+        jd: ParsedJD,
+        candidate: ParsedResume,
+        scores: dict
+    ) -> CandidateEvaluation:
+        """Async variant of evaluate."""
+        return await self.chain.ainvoke(self._inputs(jd, candidate, scores))
+    
+    def plan_packs(
+        self,
+        jd: ParsedJD,
+        candidates: Sequence[ParsedResume],
+        scores: Sequence[dict],
+        token_budget: Optional[int] = None,
+        max_pack: Optional[int] = None
+    ) -> List[List[int]]:
+        """
+        Group candidate indices into packs, in order.
+        
+        A pack is closed once adding the next candidate's block would push the
+        prompt (shared job block + candidate blocks) past token_budget, or it
+        holds max_pack candidates. A candidate too large for the budget on its
+        own still gets a pack of one.
+        """
+        token_budget = token_budget or settings.llm.evaluation_token_budget
+        max_pack = max_pack or settings.llm.evaluation_max_pack
+        
+        header = count_tokens(BATCH_EVALUATOR_PROMPT.format(candidates_block="", **self._jd_inputs(jd)))
+        packs: List[List[int]] = []
+        current: List[int] = []
+        used = header
+        
+        for i, (candidate, candidate_scores) in enumerate(zip(candidates, scores)):
+            tokens = count_tokens(self._candidate_block(candidate, candidate_scores))
+            if current and (used + tokens > token_budget or len(current) >= max_pack):
+                packs.append(current)
+                current, used = [], header
+            current.append(i)
+            used += tokens
+        
+        if current:
+            packs.append(current)
+        return packs
+    
+    def _candidate_block(self, candidate: ParsedResume, scores: dict) -> str:
+        return CANDIDATE_BLOCK.format(
+            candidate_id=candidate.candidate_id,
+            **self._candidate_inputs(candidate, scores)
+        )
+    
+    def _batch_inputs(self, jd: ParsedJD, candidates: List[ParsedResume], scores: List[dict]) -> dict:
+        return {
+            **self._jd_inputs(jd),
+            "candidates_block": "\n".join(self._candidate_block(c, s) for c, s in zip(candidates, scores))
+        }
+    
+    @staticmethod
+    def _match(output: Optional[BatchEvaluationOutput], candidate_ids: List[str]) -> Dict[str, CandidateEvaluation]:
+        """Evaluations from a packed reply, keyed by candidate_id; unknown or duplicated IDs are dropped."""
+        if output is None:
+            return {}
+        
+        counts: Dict[str, int] = {}
+        for item in output.evaluations:
+            counts[item.candidate_id] = counts.get(item.candidate_id, 0) + 1
+        
+        wanted = set(candidate_ids)
+        return {
+            item.candidate_id: CandidateEvaluation(**item.model_dump(exclude={"candidate_id"}))
+            for item in output.evaluations
+            if item.candidate_id in wanted and counts[item.candidate_id] == 1
+        }
+    
+    def evaluate_many(
+        self,
+        jd: ParsedJD,
+        candidates: List[ParsedResume],
+        scores: List[dict],
+        token_budget: Optional[int] = None,
+        max_pack: Optional[int] = None
+    ) -> List[Union[CandidateEvaluation, Exception]]:
+        """
+        Evaluate many candidates, several per LLM call.
+        
+        Args:
+            jd: Parsed job description
+            candidates: Parsed candidates (candidate_id must be unique)
+            scores: Per-candidate score dicts, as for evaluate
+            token_budget: Max prompt tokens per packed call (default: LLM_EVALUATION_TOKEN_BUDGET)
+            max_pack: Max candidates per call (default: LLM_EVALUATION_MAX_PACK)
+        
+        Returns:
+            Evaluations in input order. A candidate whose single-call fallback
+            also failed is returned as the exception it raised.
+        """
+        results: List[Union[CandidateEvaluation, Exception, None]] = [None] * len(candidates)
+        
+        for pack in self.plan_packs(jd, candidates, scores, token_budget, max_pack):
+            matched = {}
+            if len(pack) > 1:
+                try:
+                    output = self.batch_chain.invoke(
+                        self._batch_inputs(jd, [candidates[i] for i in pack], [scores[i] for i in pack])
+                    )
+                    matched = self._match(output, [candidates[i].candidate_id for i in pack])
+                except Exception as e:
+                    print(f"  Packed evaluation of {len(pack)} candidates failed, evaluating singly: {e}")
+            
+            for i in pack:
+                result = matched.get(candidates[i].candidate_id)
+                if result is None:
+                    try:
+                        result = self.evaluate(jd, candidates[i], scores[i])
+                    except Exception as e:
+                        result = e
+                results[i] = result
+        
+        return results
+    
+    async def aevaluate_many(
+        self,
+        jd: ParsedJD,
+        candidates: List[ParsedResume],
+        scores: List[dict],
+        token_budget: Optional[int] = None,
+        max_pack: Optional[int] = None,
+        max_concurrency: Optional[int] = None
+    ) -> List[Union[CandidateEvaluation, Exception]]:
+        """
+        Async variant of evaluate_many; packs are sent concurrently.
+        
+        Args:
+            max_concurrency: Max in-flight LLM calls (default: LLM_MAX_CONCURRENCY)
+        """
+        semaphore = asyncio.Semaphore(max_concurrency or settings.llm.max_concurrency)
+        
+        async def single(i: int) -> Union[CandidateEvaluation, Exception]:
+            try:
+                async with semaphore:
+                    return await self.aevaluate(jd, candidates[i], scores[i])
+            except Exception as e:
+                return e
+        
+        async def run_pack(pack: List[int]) -> List[Union[CandidateEvaluation, Exception]]:
+            if len(pack) == 1:
+                return [await single(pack[0])]
+            
+            matched = {}
+            try:
+                async with semaphore:
+                    output = await self.batch_chain.ainvoke(
+                        self._batch_inputs(jd, [candidates[i] for i in pack], [scores[i] for i in pack])
+                    )
+                matched = self._match(output, [candidates[i].candidate_id for i in pack])
+            except Exception as e:
+                print(f"  Packed evaluation of {len(pack)} candidates failed, evaluating singly: {e}")
+            
+            missing = [i for i in pack if candidates[i].candidate_id not in matched]
+            fallback = dict(zip(missing, await asyncio.gather(*[single(i) for i in missing])))
+            return [matched.get(candidates[i].candidate_id) or fallback[i] for i in pack]
+        
+        packs = self.plan_packs(jd, candidates, scores, token_budget, max_pack)
+        pack_results = await asyncio.gather(*[run_pack(pack) for pack in packs])
+        
+        results: List[Union[CandidateEvaluation, Exception, None]] = [None] * len(candidates)
+        for pack, pack_result in zip(packs, pack_results):
+            for i, result in zip(pack, pack_result):
+                results[i] = result
+        return results
+
+
+# Shared instance, built on first use
+_default_chain = LazySingleton(LLMEvaluatorChain)
+
+
+def get_llm_evaluator_chain() -> LLMEvaluatorChain:
+    """Shared LLMEvaluatorChain (the LLM client is created on the first call)."""
+    return _default_chain.get()
 
 
-# Singleton instance
-llm_evaluator_chain = LLMEvaluatorChain()
+# Backward-compatible name; building is deferred until first attribute access
+llm_evaluator_chain = LazyProxy(get_llm_evaluator_chain)
@@ -0,0 +1,113 @@
+"""
+Parse Cache - stores structured LLM extractions as JSON files keyed by text hash.
+
+Entries live under a fingerprint of the prompt, output schema and deployment,
+so editing the prompt or the pydantic schema invalidates old entries
+automatically. Several fingerprints can be live at once (e.g. two deployments,
+or compression switched on and off), so other fingerprint directories are
+only removed by prune(): those not opened within a maximum age, or all of them.
+"""
+import hashlib
+import json
+import os
+import shutil
+import time
+import uuid
+from pathlib import Path
+from typing import Generic, List, Optional, Type, TypeVar, Union
+
+from pydantic import BaseModel, ValidationError
+
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+def schema_fingerprint(prompts: List[str], schema: Type[BaseModel], model: str = "") -> str:
+    """Hash of everything that determines an extraction's output besides the input text."""
+    digest = hashlib.sha256()
+    for prompt in prompts:
+        digest.update(prompt.encode("utf-8"))
+        digest.update(b"\x1f")
+    digest.update(json.dumps(schema.model_json_schema(), sort_keys=True).encode("utf-8"))
+    digest.update(b"\x1f")
+    digest.update(model.encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+class ParseCache(Generic[ModelT]):
+    """Directory of JSON-serialized parse results for one chain."""
+
+    def __init__(
+        self,
+        cache_dir: Union[str, Path],
+        namespace: str,
+        schema: Type[ModelT],
+        fingerprint: str
+    ):
+        """
+        Args:
+            cache_dir: Root cache directory
+            namespace: Sub-directory per chain (e.g. "resumes", "jds")
+            schema: Pydantic model stored in this cache
+            fingerprint: Prompt/schema fingerprint (see schema_fingerprint)
+        """
+        self.schema = schema
+        self.fingerprint = fingerprint
+
+        self.namespace_dir = Path(cache_dir) / namespace
+        self.dir = self.namespace_dir / fingerprint
+        self.dir.mkdir(parents=True, exist_ok=True)
+        # The directory's mtime records when this fingerprint was last opened (see prune)
+        os.utime(self.dir)
+
+    def prune(self, max_age_days: Optional[float] = None) -> int:
+        """
+        Remove entries of other fingerprints in this namespace.
+
+        Args:
+            max_age_days: Only remove fingerprints not opened for this many days
+                (None = remove every other fingerprint)
+
+        Returns:
+            Number of fingerprint directories removed
+        """
+        cutoff = None if max_age_days is None else time.time() - max_age_days * 86400
+        removed = 0
+        for other in self.namespace_dir.iterdir():
+            if not other.is_dir() or other.name == self.fingerprint:
+                continue
+            try:
+                if cutoff is not None and other.stat().st_mtime >= cutoff:
+                    continue
+            except OSError:
+                continue
+            shutil.rmtree(other, ignore_errors=True)
+            removed += 1
+        return removed
+
+    def _path(self, text: str) -> Path:
+        key = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return self.dir / key[:2] / f"{key}.json"
+
+    def get(self, text: str, update: Optional[dict] = None) -> Optional[ModelT]:
+        """
+        Cached result for this exact text, or None.
+
+        Args:
+            text: Input text the result was stored under
+            update: Fields to set before validation (e.g. per-call fields excluded by put)
+        """
+        path = self._path(text)
+        try:
+            cached = json.loads(path.read_text(encoding="utf-8"))
+            return self.schema.model_validate({**cached, **(update or {})})
+        except (OSError, ValueError, ValidationError):
+            return None
+
+    def put(self, text: str, result: ModelT, exclude: Optional[set] = None):
+        """Store a result (atomic write)."""
+        path = self._path(text)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{uuid.uuid4().hex}.tmp")
+        tmp_path.write_text(result.model_dump_json(exclude=exclude), encoding="utf-8")
+        os.replace(tmp_path, path)
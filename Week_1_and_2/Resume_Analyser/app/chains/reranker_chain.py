@@ -1,12 +1,32 @@
 """
 Reranker Chain - final ranking with LLM reasoning.
+
+A single listwise prompt only works for a handful of candidates, so larger
+shortlists are reranked in overlapping windows:
+
+    score order:  c1 c2 ... c20 | c21 ... cN
+                  [ window 1  ]    (beyond LLM_RERANK_TOP_M: score order)
+                        [ window 2  ]
+                              [ window 3  ]
+
+Each window is ranked by its own LLM call, all in parallel. A candidate's
+position in a window maps to an estimated overall position (window offset +
+local rank - 1); candidates are ordered by the mean of their estimates, ties
+broken by score order. A final call then ranks the merged top window
+together, so the leaders of different windows are compared directly.
+
+Only the top-M are ranked by the LLM, so the number of calls stays fixed and
+latency stays at two rounds however long the shortlist grows.
 """
-from typing import List
-from langchain_openai import AzureChatOpenAI
+import asyncio
+from typing import Dict, List, Optional, Tuple
+from langchain_core.language_models import BaseChatModel
 from langchain_core.prompts import ChatPromptTemplate
 from pydantic import BaseModel, Field
 from app.config import settings
+from app.llm import get_chat_model
 from app.schemas import ParsedJD, RankedCandidate
+from app.utils.lazy import LazyProxy, LazySingleton
 
 
 class RerankedResult(BaseModel):
@@ -46,15 +66,8 @@ Provide a brief reason for each ranking position."""
 class RerankerChain:
     """Chain for final candidate reranking."""
     
-    def __init__(self):
-        self.llm = AzureChatOpenAI(
-            azure_deployment=settings.azure.openai_deployment,
-            azure_endpoint=settings.azure.openai_endpoint,
-            api_key=settings.azure.openai_api_key,
-            api_version=settings.azure.openai_api_version,
-            temperature=0.2,
-            max_retries=5
-        )
+    def __init__(self, llm: Optional[BaseChatModel] = None):
+        self.llm = llm or get_chat_model(temperature=0.2)
         
         self.prompt = ChatPromptTemplate.from_messages([
             ("system", "You are a senior recruiter making final hiring decisions."),
@@ -63,13 +76,8 @@ class RerankerChain:
         
         self.chain = self.prompt | self.llm.with_structured_output(RerankerOutput)
     
-    def rerank(
-        self,
-        jd: ParsedJD,
-        candidates: List[RankedCandidate]
-    ) -> List[RerankedResult]:
-        """Rerank candidates with LLM reasoning."""
-        
+    @staticmethod
+    def _inputs(jd: ParsedJD, candidates: List[RankedCandidate]) -> dict:
         # Build candidate summary
         summaries = []
         for c in candidates:
@@ -81,16 +89,238 @@ class RerankerChain:
 """
             summaries.append(summary)
         
-        result = self.chain.invoke({
+        return {
             "role": jd.role,
             "must_have_skills": ", ".join(jd.must_have_skills),
             "domain": jd.domain,
             "min_experience": jd.min_experience_years,
             "candidates_summary": "\n".join(summaries)
-        })
+        }
+    
+    @staticmethod
+    def plan_windows(count: int, window: Optional[int] = None, step: Optional[int] = None) -> List[Tuple[int, int]]:
+        """
+        Overlapping [start, end) windows covering positions 0..count-1.
+        
+        Args:
+            count: Candidates to rerank
+            window: Candidates per window (default: settings)
+            step: Offset between window starts (default: settings)
+            
+        Returns:
+            Windows in order; a single window when everything fits in one call,
+            none when there is nothing to order
+        """
+        window = max(2, window or settings.llm.rerank_window)
+        step = max(1, min(step or settings.llm.rerank_step, window))
+        if count < 2:
+            return []
+        if count <= window:
+            return [(0, count)]
+        
+        starts = list(range(0, count - window, step)) + [count - window]
+        return [(start, start + window) for start in starts]
+    
+    def _split(
+        self,
+        candidates: List[RankedCandidate],
+        top_m: Optional[int]
+    ) -> Tuple[List[RankedCandidate], List[RankedCandidate]]:
+        """Score-ordered head sent to the LLM and the tail kept in score order."""
+        ordered = sorted(candidates, key=lambda c: c.final_score, reverse=True)
+        top_m = top_m or settings.llm.rerank_top_m
+        return ordered[:top_m], ordered[top_m:]
+    
+    @staticmethod
+    def merge_windows(
+        head: List[RankedCandidate],
+        tail: List[RankedCandidate],
+        windows: List[Tuple[int, int]],
+        window_results: List[Optional[List[RerankedResult]]]
+    ) -> List[RerankedResult]:
+        """
+        Merge per-window rankings into one ranking of every candidate.
+        
+        Args:
+            head: Score-ordered candidates that were reranked
+            tail: Score-ordered candidates below the cutoff
+            windows: [start, end) positions of each window in head
+            window_results: LLM ranking per window (None if that call failed)
+            
+        Returns:
+            RerankedResults ranked 1..N: the head by mean estimated position, then the tail
+        """
+        estimates: Dict[str, List[float]] = {c.candidate_id: [] for c in head}
+        best: Dict[str, Tuple[float, str]] = {}
+        
+        for (start, end), results in zip(windows, window_results):
+            members = [c.candidate_id for c in head[start:end]]
+            local: Dict[str, RerankedResult] = {}
+            for result in sorted(results or [], key=lambda r: r.rank):
+                # Ignore IDs outside the window and repeats
+                if result.candidate_id in members and result.candidate_id not in local:
+                    local[result.candidate_id] = result
+            
+            # Ranked members first in the model's order, omitted ones after in score order
+            order = list(local) + [cid for cid in members if cid not in local]
+            for position, cid in enumerate(order):
+                estimate = start + position
+                estimates[cid].append(estimate)
+                if cid in local and (cid not in best or estimate < best[cid][0]):
+                    best[cid] = (estimate, local[cid].reason)
+        
+        score_order = {c.candidate_id: i for i, c in enumerate(head)}
+        merged = sorted(
+            head,
+            key=lambda c: (
+                sum(estimates[c.candidate_id]) / len(estimates[c.candidate_id])
+                if estimates[c.candidate_id] else score_order[c.candidate_id],
+                score_order[c.candidate_id]
+            )
+        )
+        
+        rankings = [
+            RerankedResult(candidate_id=c.candidate_id, rank=i + 1, reason=best.get(c.candidate_id, (0, ""))[1])
+            for i, c in enumerate(merged)
+        ]
+        rankings += [
+            RerankedResult(
+                candidate_id=c.candidate_id,
+                rank=len(rankings) + i + 1,
+                reason="Below the rerank cutoff; ordered by score"
+            )
+            for i, c in enumerate(tail)
+        ]
+        return rankings
+    
+    @staticmethod
+    def apply_final(rankings: List[RerankedResult], results: List[RerankedResult], size: int) -> List[RerankedResult]:
+        """
+        Reorder the first `size` merged rankings by the final call's ranking.
+        
+        Candidates the final call omits keep their merged order after the ones it ranked.
+        """
+        top = {r.candidate_id: r for r in rankings[:size]}
+        final: Dict[str, RerankedResult] = {}
+        for result in sorted(results, key=lambda r: r.rank):
+            if result.candidate_id in top and result.candidate_id not in final:
+                final[result.candidate_id] = result
         
-        return result.rankings
+        order = [final[cid] for cid in final] + [r for cid, r in top.items() if cid not in final]
+        return [
+            RerankedResult(candidate_id=r.candidate_id, rank=i + 1, reason=r.reason)
+            for i, r in enumerate(order + rankings[size:])
+        ]
+    
+    def _final_inputs(
+        self,
+        jd: ParsedJD,
+        candidates: List[RankedCandidate],
+        rankings: List[RerankedResult]
+    ) -> Tuple[dict, int]:
+        """Prompt inputs for the final call over the merged top window, and its size."""
+        by_id = {c.candidate_id: c for c in candidates}
+        size = min(max(2, settings.llm.rerank_window), len(rankings))
+        return self._inputs(jd, [by_id[r.candidate_id] for r in rankings[:size]]), size
+    
+    def rerank(
+        self,
+        jd: ParsedJD,
+        candidates: List[RankedCandidate],
+        top_m: Optional[int] = None
+    ) -> List[RerankedResult]:
+        """
+        Rerank candidates with LLM reasoning: windows, then a final call over the merged top window.
+        
+        Args:
+            jd: Parsed job description
+            candidates: Candidates to rank
+            top_m: Candidates ranked by the LLM (default: settings); the rest keep score order
+            
+        Returns:
+            RerankedResults for every candidate, ranked 1..N
+        """
+        head, tail = self._split(candidates, top_m)
+        windows = self.plan_windows(len(head))
+        window_results = []
+        for start, end in windows:
+            try:
+                window_results.append(self.chain.invoke(self._inputs(jd, head[start:end])).rankings)
+            except Exception as e:
+                if len(windows) == 1:
+                    raise
+                print(f"  Rerank window {start}-{end} failed, keeping its score order: {e}")
+                window_results.append(None)
+        rankings = self.merge_windows(head, tail, windows, window_results)
+        
+        if len(windows) > 1:
+            inputs, size = self._final_inputs(jd, head, rankings)
+            try:
+                rankings = self.apply_final(rankings, self.chain.invoke(inputs).rankings, size)
+            except Exception as e:
+                print(f"  Final rerank failed, keeping the merged window order: {e}")
+        return rankings
+    
+    async def arerank(
+        self,
+        jd: ParsedJD,
+        candidates: List[RankedCandidate],
+        top_m: Optional[int] = None,
+        max_concurrency: Optional[int] = None
+    ) -> List[RerankedResult]:
+        """
+        Async variant of rerank; the windows are ranked concurrently.
+        
+        Args:
+            jd: Parsed job description
+            candidates: Candidates to rank
+            top_m: Candidates ranked by the LLM (default: settings); the rest keep score order
+            max_concurrency: Max window calls in flight (default: LLM_MAX_CONCURRENCY)
+            
+        Returns:
+            RerankedResults for every candidate, ranked 1..N
+        """
+        head, tail = self._split(candidates, top_m)
+        windows = self.plan_windows(len(head))
+        semaphore = asyncio.Semaphore(max_concurrency or settings.llm.max_concurrency)
+        
+        async def rank_window(start: int, end: int) -> List[RerankedResult]:
+            async with semaphore:
+                result = await self.chain.ainvoke(self._inputs(jd, head[start:end]))
+            return result.rankings
+        
+        outcomes = await asyncio.gather(
+            *[rank_window(start, end) for start, end in windows], return_exceptions=True
+        )
+        failures = [o for o in outcomes if isinstance(o, Exception)]
+        if failures and len(failures) == len(outcomes):
+            raise failures[0]
+        
+        window_results = []
+        for (start, end), outcome in zip(windows, outcomes):
+            if isinstance(outcome, Exception):
+                print(f"  Rerank window {start}-{end} failed, keeping its score order: {outcome}")
+                outcome = None
+            window_results.append(outcome)
+        rankings = self.merge_windows(head, tail, windows, window_results)
+        
+        if len(windows) > 1:
+            inputs, size = self._final_inputs(jd, head, rankings)
+            try:
+                rankings = self.apply_final(rankings, (await self.chain.ainvoke(inputs)).rankings, size)
+            except Exception as e:
+                print(f"  Final rerank failed, keeping the merged window order: {e}")
+        return rankings
+
+
+# Shared instance, built on first use
+_default_chain = LazySingleton(RerankerChain)
+
+
+def get_reranker_chain() -> RerankerChain:
+    """Shared RerankerChain (the LLM client is created on the first call)."""
+    return _default_chain.get()
 
 
-# Singleton instance
-reranker_chain = RerankerChain()
+# Backward-compatible name; building is deferred until first attribute access
+reranker_chain = LazyProxy(get_reranker_chain)
@@ -1,10 +1,18 @@
 """
 Resume Parser Chain - extracts structured candidate profiles from resumes.
 """
-from langchain_openai import AzureChatOpenAI
+from typing import List, Optional, Tuple, Union
+from langchain_core.language_models import BaseChatModel
 from langchain_core.prompts import ChatPromptTemplate
+from app.chains.parse_cache import ParseCache, schema_fingerprint
 from app.config import settings
+from app.llm import get_chat_model
 from app.schemas import ParsedResume
+from app.utils.lazy import LazyProxy, LazySingleton
+from app.utils.resume_compressor import COMPRESSOR_VERSION, compress_resume
+
+
+RESUME_PARSER_SYSTEM_PROMPT = "You are an expert resume analyst extracting candidate information."
 
 
 RESUME_PARSER_PROMPT = """You are an expert resume analyst. Extract structured information from this resume.
@@ -28,31 +36,153 @@ Be thorough but only extract what's explicitly stated or clearly implied."""
 class ResumeParserChain:
     """Chain for parsing resumes into structured candidate profiles."""
     
-    def __init__(self):
-        self.llm = AzureChatOpenAI(
-            azure_deployment=settings.azure.openai_deployment,
-            azure_endpoint=settings.azure.openai_endpoint,
-            api_key=settings.azure.openai_api_key,
-            api_version=settings.azure.openai_api_version,
-            temperature=0,
-            max_retries=5
-        )
+    def __init__(self, llm: Optional[BaseChatModel] = None):
+        self.llm = llm or get_chat_model(temperature=0)
         
         self.prompt = ChatPromptTemplate.from_messages([
-            ("system", "You are an expert resume analyst extracting candidate information."),
+            ("system", RESUME_PARSER_SYSTEM_PROMPT),
             ("human", RESUME_PARSER_PROMPT)
         ])
         
         # Structured output chain
         self.chain = self.prompt | self.llm.with_structured_output(ParsedResume)
+        
+        # Cache of LLM extractions, invalidated when the prompt or schema changes
+        self.cache = ParseCache(
+            settings.llm.parse_cache_dir,
+            "resumes",
+            ParsedResume,
+            schema_fingerprint(
+                [RESUME_PARSER_SYSTEM_PROMPT, RESUME_PARSER_PROMPT, self._compression_key()],
+                ParsedResume,
+                settings.azure.openai_deployment
+            )
+        ) if settings.llm.parse_cache_enabled else None
+        if self.cache is not None and settings.llm.parse_cache_max_age_days > 0:
+            self.cache.prune(settings.llm.parse_cache_max_age_days)
     
-    def parse(self, resume_text: str, candidate_id: str) -> ParsedResume:
-        """Parse resume text into structured profile."""
-        result = self.chain.invoke({"resume_text": resume_text})
+    @staticmethod
+    def _compression_key() -> str:
+        # Part of the cache fingerprint: a different compression means a different prompt
+        if not settings.llm.resume_compression:
+            return "compression:off"
+        return f"compression:v{COMPRESSOR_VERSION}:{settings.llm.resume_token_budget}"
+    
+    @staticmethod
+    def _inputs(resume_text: str) -> dict:
+        """Prompt inputs; the resume is compressed to the token budget unless disabled."""
+        if settings.llm.resume_compression:
+            resume_text = compress_resume(resume_text, settings.llm.resume_token_budget) or resume_text
+        return {"resume_text": resume_text}
+    
+    def _from_cache(self, resume_text: str, candidate_id: str) -> Optional[ParsedResume]:
+        if self.cache is None:
+            return None
+        # candidate_id and raw_text are excluded from entries (see _finalize); restore them before validation
+        return self.cache.get(resume_text, update={"candidate_id": candidate_id, "raw_text": resume_text})
+    
+    def _finalize(self, result: ParsedResume, resume_text: str, candidate_id: str) -> ParsedResume:
+        if self.cache is not None:
+            self.cache.put(resume_text, result, exclude={"candidate_id", "raw_text"})
         result.candidate_id = candidate_id
         result.raw_text = resume_text
         return result
+    
+    def parse(self, resume_text: str, candidate_id: str) -> ParsedResume:
+        """Parse resume text into structured profile."""
+        cached = self._from_cache(resume_text, candidate_id)
+        if cached is not None:
+            return cached
+        
+        result = self.chain.invoke(self._inputs(resume_text))
+        return self._finalize(result, resume_text, candidate_id)
+    
+    async def aparse(self, resume_text: str, candidate_id: str) -> ParsedResume:
+        """Async variant of parse."""
+        cached = self._from_cache(resume_text, candidate_id)
+        if cached is not None:
+            return cached
+        
+        result = await self.chain.ainvoke(self._inputs(resume_text))
+        return self._finalize(result, resume_text, candidate_id)
+    
+    def _merge_fresh(self, resumes: List[Tuple[str, str]], results: list, misses: List[int], fresh: list) -> list:
+        for i, result in zip(misses, fresh):
+            text, candidate_id = resumes[i]
+            if not isinstance(result, Exception):
+                result = self._finalize(result, text, candidate_id)
+            results[i] = result
+        return results
+    
+    def parse_many(
+        self,
+        resumes: List[Tuple[str, str]],
+        max_concurrency: Optional[int] = None
+    ) -> List[Union[ParsedResume, Exception]]:
+        """
+        Parse many resumes concurrently from sync code (LLM calls run on a thread pool).
+        
+        Use this instead of asyncio.run(aparse_many(...)) outside an event loop:
+        the async HTTP client is shared and must not be driven from a fresh loop.
+        
+        Args:
+            resumes: (resume_text, candidate_id) pairs
+            max_concurrency: Max in-flight LLM calls (default: LLM_MAX_CONCURRENCY)
+            
+        Returns:
+            Results in input order, failures returned as exceptions (see aparse_many)
+        """
+        results = [self._from_cache(text, candidate_id) for text, candidate_id in resumes]
+        misses = [i for i, r in enumerate(results) if r is None]
+        
+        if misses:
+            fresh = self.chain.batch(
+                [self._inputs(resumes[i][0]) for i in misses],
+                config={"max_concurrency": max_concurrency or settings.llm.max_concurrency},
+                return_exceptions=True
+            )
+            results = self._merge_fresh(resumes, results, misses, fresh)
+        
+        return results
+    
+    async def aparse_many(
+        self,
+        resumes: List[Tuple[str, str]],
+        max_concurrency: Optional[int] = None
+    ) -> List[Union[ParsedResume, Exception]]:
+        """
+        Parse many resumes concurrently.
+        
+        Args:
+            resumes: (resume_text, candidate_id) pairs
+            max_concurrency: Max in-flight LLM calls (default: LLM_MAX_CONCURRENCY)
+            
+        Returns:
+            Results in input order. A resume that failed to parse is returned
+            as the exception it raised instead of failing the whole batch.
+        """
+        results = [self._from_cache(text, candidate_id) for text, candidate_id in resumes]
+        misses = [i for i, r in enumerate(results) if r is None]
+        
+        if misses:
+            fresh = await self.chain.abatch(
+                [self._inputs(resumes[i][0]) for i in misses],
+                config={"max_concurrency": max_concurrency or settings.llm.max_concurrency},
+                return_exceptions=True
+            )
+            results = self._merge_fresh(resumes, results, misses, fresh)
+        
+        return results
+
+
+# Shared instance, built on first use
+_default_chain = LazySingleton(ResumeParserChain)
+
+
+def get_resume_parser_chain() -> ResumeParserChain:
+    """Shared ResumeParserChain (the LLM client is created on the first call)."""
+    return _default_chain.get()
 
 
-# Singleton instance
-resume_parser_chain = ResumeParserChain()
+# Backward-compatible name; building is deferred until first attribute access
+resume_parser_chain = LazyProxy(get_resume_parser_chain)
@@ -1,4 +1,26 @@
 """Config module exports."""
-from app.config.settings import settings, Settings, AzureOpenAISettings, ScoringSettings
+from app.config.settings import (
+    settings,
+    Settings,
+    AzureOpenAISettings,
+    ScoringSettings,
+    LLMSettings,
+    EmbeddingSettings,
+    IngestSettings,
+    StoreSettings,
+    CrossEncoderSettings,
+    ServiceSettings
+)
 
-__all__ = ["settings", "Settings", "AzureOpenAISettings", "ScoringSettings"]
+__all__ = [
+    "settings",
+    "Settings",
+    "AzureOpenAISettings",
+    "ScoringSettings",
+    "LLMSettings",
+    "EmbeddingSettings",
+    "IngestSettings",
+    "StoreSettings",
+    "CrossEncoderSettings",
+    "ServiceSettings"
+]
@@ -2,6 +2,7 @@
 Pydantic Settings for Resume Ranker.
 Loads configuration from .env file.
 """
+from typing import Optional
 from pydantic_settings import BaseSettings
 from pydantic import Field
 
@@ -28,6 +29,8 @@ class ScoringSettings(BaseSettings):
     skill_weight: float = Field(default=0.30, description="Weight for skill match")
     experience_weight: float = Field(default=0.20, description="Weight for experience fit")
     project_weight: float = Field(default=0.10, description="Weight for project relevance")
+    skill_aliases_path: Optional[str] = Field(default=None, description="JSON skill alias table (defaults to bundled file)")
+    batch_size: int = Field(default=32, description="Max candidates scored per batch in the ranking pipeline")
     
     class Config:
         env_prefix = "SCORE_"
@@ -35,6 +38,117 @@ class ScoringSettings(BaseSettings):
         extra = "ignore"
 
 
+class LLMSettings(BaseSettings):
+    """LLM call configuration."""
+    
+    max_concurrency: int = Field(default=8, description="Max concurrent LLM calls per batch")
+    global_concurrency: int = Field(default=16, description="Max LLM calls in flight across all chains (AIMD ceiling)")
+    requests_per_minute: int = Field(default=0, description="Deployment RPM quota (0 = unlimited)")
+    tokens_per_minute: int = Field(default=0, description="Deployment TPM quota (0 = unlimited)")
+    output_token_reserve: int = Field(default=800, description="Completion tokens reserved per call until usage is known")
+    max_retries: int = Field(default=6, description="Retries per call on 429, timeouts and 5xx")
+    request_timeout: float = Field(default=120.0, description="Seconds per LLM HTTP request")
+    pool_connections: int = Field(default=32, description="Shared HTTP connection pool size")
+    parse_cache_enabled: bool = Field(default=True, description="Reuse parsed resumes/JDs across runs")
+    parse_cache_dir: str = Field(default="./parse_cache", description="Directory for cached parse results")
+    parse_cache_max_age_days: float = Field(default=30.0, description="Remove cache entries of prompts/schemas not used for this many days (0 = never)")
+    resume_compression: bool = Field(default=True, description="Compress resumes (drop boilerplate, fit sections to a budget) before parsing")
+    resume_token_budget: int = Field(default=1200, description="Max resume tokens sent to the parser (0 = only drop boilerplate)")
+    evaluation_token_budget: int = Field(default=6000, description="Max prompt tokens per packed evaluation call")
+    evaluation_max_pack: int = Field(default=8, description="Max candidates evaluated per LLM call (1 = one call each)")
+    rerank_window: int = Field(default=10, description="Candidates per listwise rerank call")
+    rerank_step: int = Field(default=5, description="Offset between overlapping rerank windows")
+    rerank_top_m: int = Field(default=20, description="Only the top-M candidates by score are reranked by the LLM")
+    
+    class Config:
+        env_prefix = "LLM_"
+        env_file = ".env"
+        extra = "ignore"
+
+
+class EmbeddingSettings(BaseSettings):
+    """Embedding model and cache configuration."""
+    
+    model_name: str = Field(default="Alibaba-NLP/gte-modernbert-base", description="SentenceTransformer model")
+    backend: str = Field(default="torch", description="Inference backend: torch, onnx or onnx-int8")
+    onnx_dir: str = Field(default="./onnx_models", description="Directory for exported ONNX models")
+    onnx_quantization: str = Field(default="avx512_vnni", description="int8 quantization target: arm64, avx2, avx512 or avx512_vnni")
+    cache_enabled: bool = Field(default=True, description="Persist embeddings across runs")
+    cache_path: str = Field(default="./embedding_cache/embeddings.sqlite", description="SQLite cache file")
+    cache_max_entries: int = Field(default=100_000, description="Max embeddings kept on disk (LRU eviction)")
+    cache_memory_entries: int = Field(default=2048, description="Max embeddings kept in the in-memory LRU")
+    token_budget: int = Field(default=16384, description="Max padded tokens per forward pass")
+    max_batch_size: int = Field(default=64, description="Max texts per forward pass")
+    encode_workers: int = Field(default=1, description="Encode processes (1 = in-process, 0 = one per physical core)")
+    torch_threads: int = Field(default=0, description="Torch intra-op threads per encode process (0 = default)")
+    parallel_min_texts: int = Field(default=128, description="Smallest job sharded across encode workers")
+    
+    class Config:
+        env_prefix = "EMBED_"
+        env_file = ".env"
+        extra = "ignore"
+
+
+class IngestSettings(BaseSettings):
+    """Resume ingestion configuration."""
+    
+    extract_workers: int = Field(default=0, description="Extraction processes (0 = CPU count)")
+    extract_timeout: float = Field(default=60.0, description="Per-file extraction timeout in seconds")
+    batch_size: int = Field(default=32, description="Resumes embedded and upserted per micro-batch")
+    
+    class Config:
+        env_prefix = "INGEST_"
+        env_file = ".env"
+        extra = "ignore"
+
+
+class StoreSettings(BaseSettings):
+    """Vector store configuration."""
+    
+    search_backend: str = Field(default="qdrant", description="Vector search backend: qdrant or local")
+    matrix_enabled: bool = Field(default=True, description="Maintain the memory-mapped local vector matrix")
+    matrix_dtype: str = Field(default="float16", description="Local matrix storage type: float16 or int8")
+    binary_shortlist: int = Field(default=0, description="Hamming stage-0 shortlist size for local search (0 = off)")
+    recall_target: float = Field(default=0.95, description="Recall@k the cascade planner must reach vs exact search")
+    calibration_queries: int = Field(default=64, description="JD embeddings kept (or pseudo-queries generated) for calibration")
+    chunked: bool = Field(default=False, description="Store per-chunk multivectors and rank resumes by max-sim over chunks")
+    chunk_words: int = Field(default=200, description="Words per resume chunk")
+    chunk_overlap: int = Field(default=40, description="Words shared by consecutive chunks")
+    max_chunks: int = Field(default=32, description="Max chunks embedded per resume")
+    
+    class Config:
+        env_prefix = "STORE_"
+        env_file = ".env"
+        extra = "ignore"
+
+
+class CrossEncoderSettings(BaseSettings):
+    """Cross-encoder pre-pass between vector search and the LLM stages."""
+    
+    enabled: bool = Field(default=False, description="Cut the vector shortlist with a local cross-encoder before LLM calls")
+    model_name: str = Field(default="cross-encoder/ms-marco-MiniLM-L-6-v2", description="sentence-transformers CrossEncoder")
+    shortlist: int = Field(default=40, description="Vector search candidates scored by the cross-encoder")
+    batch_size: int = Field(default=16, description="(JD, resume) pairs per forward pass")
+    max_length: int = Field(default=512, description="Max tokens per (JD, resume) pair")
+    
+    class Config:
+        env_prefix = "CROSS_ENCODER_"
+        env_file = ".env"
+        extra = "ignore"
+
+
+class ServiceSettings(BaseSettings):
+    """Ranking API service configuration."""
+    
+    resume_folder: str = Field(default="./resumes", description="Folder synced by POST /api/ingest when none is given")
+    warmup_on_startup: bool = Field(default=True, description="Load the model, store and LLM clients before serving")
+    
+    class Config:
+        env_prefix = "SERVICE_"
+        env_file = ".env"
+        extra = "ignore"
+
+
 class Settings(BaseSettings):
     """Main application settings."""
     
@@ -43,6 +157,12 @@ class Settings(BaseSettings):
     
     azure: AzureOpenAISettings = Field(default_factory=AzureOpenAISettings)
     scoring: ScoringSettings = Field(default_factory=ScoringSettings)
+    llm: LLMSettings = Field(default_factory=LLMSettings)
+    embedding: EmbeddingSettings = Field(default_factory=EmbeddingSettings)
+    ingest: IngestSettings = Field(default_factory=IngestSettings)
+    store: StoreSettings = Field(default_factory=StoreSettings)
+    cross_encoder: CrossEncoderSettings = Field(default_factory=CrossEncoderSettings)
+    service: ServiceSettings = Field(default_factory=ServiceSettings)
     
     class Config:
         env_file = ".env"
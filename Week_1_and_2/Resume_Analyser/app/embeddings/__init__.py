@@ -1,6 +1,11 @@
 """Embeddings module exports."""
-from app.embeddings.embedder import Embedder, embedder
-from app.embeddings.matryoshka_embedder import MatryoshkaEmbedder, matryoshka_embedder
-
-__all__ = ["Embedder", "embedder", "MatryoshkaEmbedder", "matryoshka_embedder"]
+from app.embeddings.embedding_cache import EmbeddingCache
+from app.embeddings.encoding_engine import EncodingEngine
+from app.embeddings.embedder import Embedder, embedder, get_embedder
+from app.embeddings.matryoshka_embedder import MatryoshkaEmbedder, matryoshka_embedder, get_matryoshka_embedder
 
+__all__ = [
+    "EmbeddingCache", "EncodingEngine",
+    "Embedder", "embedder", "get_embedder",
+    "MatryoshkaEmbedder", "matryoshka_embedder", "get_matryoshka_embedder"
+]
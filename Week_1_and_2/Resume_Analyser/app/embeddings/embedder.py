@@ -4,15 +4,17 @@ Uses the same model as matryoshka_embedder for consistency.
 """
 from typing import List
 import numpy as np
-from app.embeddings.matryoshka_embedder import matryoshka_embedder
+from app.embeddings.matryoshka_embedder import MatryoshkaEmbedder, get_matryoshka_embedder
+from app.utils.lazy import LazyProxy, LazySingleton
 
 
 class Embedder:
     """Handles text embedding using local Sentence Transformers."""
     
-    def __init__(self):
-        # Reuse the matryoshka embedder's model
-        self._embedder = matryoshka_embedder
+    @property
+    def _embedder(self) -> MatryoshkaEmbedder:
+        # Reuse the matryoshka embedder's model (loaded on first embed)
+        return get_matryoshka_embedder()
     
     def embed_text(self, text: str) -> List[float]:
         """Embed a single text string."""
@@ -40,6 +42,14 @@ class Embedder:
         return float(dot_product / (norm1 * norm2))
 
 
-# Singleton instance
-embedder = Embedder()
+# Shared instance, built on first use
+_default_embedder = LazySingleton(Embedder)
 
+
+def get_embedder() -> Embedder:
+    """Shared Embedder instance."""
+    return _default_embedder.get()
+
+
+# Backward-compatible name; building is deferred until first attribute access
+embedder = LazyProxy(get_embedder)
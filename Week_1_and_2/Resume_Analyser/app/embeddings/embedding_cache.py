@@ -0,0 +1,179 @@
+"""
+Embedding cache - SQLite-backed embedding store with an in-memory LRU tier.
+
+Vectors are stored as float16 blobs keyed by a hash of (model, normalize flag,
+text). The disk tier is bounded by entry count and evicts least recently used
+rows first. Hits served from memory refresh the rows' last_used in batches
+(and always before eviction), so hot entries are not the first to go.
+"""
+import atexit
+import hashlib
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, Union
+
+import numpy as np
+
+
+# SQLite's default limit on bound parameters is 999
+SQLITE_BATCH_SIZE = 500
+
+# Memory hits pending a last_used update before they are written to disk
+TOUCH_BATCH_SIZE = 256
+
+
+class EmbeddingCache:
+    """Two-tier (memory LRU + SQLite) cache of text embeddings."""
+
+    def __init__(
+        self,
+        db_path: Union[str, Path] = "./embedding_cache/embeddings.sqlite",
+        max_entries: int = 100_000,
+        memory_entries: int = 2048
+    ):
+        """
+        Open (or create) the cache database.
+
+        Args:
+            db_path: SQLite file location
+            max_entries: Maximum rows kept on disk before LRU eviction
+            memory_entries: Maximum vectors kept in the in-memory LRU tier
+        """
+        self.db_path = Path(db_path)
+        self.max_entries = max_entries
+        self.memory_entries = memory_entries
+
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._touched: Dict[str, float] = {}  # key -> last hit time not yet written to disk
+        self._lock = threading.Lock()
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            "key TEXT PRIMARY KEY, vector BLOB NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_embeddings_last_used ON embeddings(last_used)"
+        )
+        self._conn.commit()
+        atexit.register(self.flush)
+
+    @staticmethod
+    def make_key(model_name: str, normalize: bool, text: str) -> str:
+        """Cache key for one text under a given model configuration."""
+        raw = f"{model_name}\x1f{int(normalize)}\x1f{text}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, np.ndarray]:
+        """Look up keys in memory, then on disk. Missing keys are omitted."""
+        keys = list(keys)
+        found: Dict[str, np.ndarray] = {}
+        now = time.time()
+
+        with self._lock:
+            for key in keys:
+                if key in found:
+                    continue
+                vector = self._memory.get(key)
+                if vector is not None:
+                    self._memory.move_to_end(key)
+                    self._touched[key] = now
+                    found[key] = vector
+
+            missing = [k for k in dict.fromkeys(keys) if k not in found]
+            disk_hits = []
+
+            for start in range(0, len(missing), SQLITE_BATCH_SIZE):
+                chunk = missing[start:start + SQLITE_BATCH_SIZE]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})",
+                    chunk
+                ).fetchall()
+
+                for key, blob in rows:
+                    vector = np.frombuffer(blob, dtype=np.float16).astype(np.float32)
+                    found[key] = vector
+                    disk_hits.append(key)
+                    self._touched[key] = now
+                    self._remember(key, vector)
+
+            # Disk hits are written right away; memory hits wait for a full batch
+            if disk_hits or len(self._touched) >= TOUCH_BATCH_SIZE:
+                self._write_touched()
+                self._conn.commit()
+
+        return found
+
+    def put_many(self, items: Dict[str, np.ndarray]):
+        """Store vectors (as float16) and evict the oldest rows if over capacity."""
+        if not items:
+            return
+
+        now = time.time()
+        rows = [
+            (key, np.asarray(vector, dtype=np.float16).tobytes(), now)
+            for key, vector in items.items()
+        ]
+
+        with self._lock:
+            # Before eviction picks the least recently used rows
+            self._write_touched()
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector, last_used) VALUES (?, ?, ?)",
+                rows
+            )
+            for key, vector in items.items():
+                self._remember(key, np.asarray(vector, dtype=np.float16).astype(np.float32))
+
+            self._evict()
+            self._conn.commit()
+
+    def flush(self):
+        """Write pending last_used updates from memory hits."""
+        with self._lock:
+            self._write_touched()
+            self._conn.commit()
+
+    def clear(self):
+        """Drop every cached embedding."""
+        with self._lock:
+            self._memory.clear()
+            self._touched.clear()
+            self._conn.execute("DELETE FROM embeddings")
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def _write_touched(self):
+        if not self._touched:
+            return
+        self._conn.executemany(
+            "UPDATE embeddings SET last_used = ? WHERE key = ?",
+            [(used, key) for key, used in self._touched.items()]
+        )
+        self._touched = {}
+
+    def _remember(self, key: str, vector: np.ndarray):
+        """Insert into the memory tier, dropping the least recently used entry."""
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _evict(self):
+        count = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        overflow = count - self.max_entries
+        if overflow > 0:
+            self._conn.execute(
+                "DELETE FROM embeddings WHERE key IN "
+                "(SELECT key FROM embeddings ORDER BY last_used ASC LIMIT ?)",
+                (overflow,)
+            )
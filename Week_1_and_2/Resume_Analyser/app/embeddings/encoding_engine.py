@@ -0,0 +1,213 @@
+"""
+Encoding Engine - length-bucketed, token-budgeted SentenceTransformer encoding.
+
+Texts are sorted by token length and cut into batches whose padded size
+(batch size x longest sequence) stays under a token budget, so short resumes
+are not padded to the length of long ones. Large jobs can be sharded across a
+pool of worker processes, each pinned to its own physical cores with an
+explicit torch thread count. Results always come back in input order.
+"""
+import atexit
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from queue import Empty
+from typing import List, Optional
+
+import numpy as np
+
+
+# Per-worker state (set by _worker_init in each pool process)
+_worker_model = None
+
+
+def physical_cores() -> List[int]:
+    """One logical CPU per physical core available to this process."""
+    if hasattr(os, "sched_getaffinity"):
+        available = sorted(os.sched_getaffinity(0))
+    else:
+        available = list(range(os.cpu_count() or 1))
+
+    seen = set()
+    cores = []
+    for cpu in available:
+        siblings_path = Path(f"/sys/devices/system/cpu/cpu{cpu}/topology/thread_siblings_list")
+        try:
+            siblings = siblings_path.read_text().strip()
+        except OSError:
+            siblings = str(cpu)
+        if siblings not in seen:
+            seen.add(siblings)
+            cores.append(cpu)
+    return cores
+
+
+def configure_torch_threads(intra_op: int, inter_op: int = 1):
+    """Set torch's thread pools (inter-op can only be set before first use)."""
+    import torch
+
+    if intra_op > 0:
+        torch.set_num_threads(intra_op)
+    try:
+        torch.set_num_interop_threads(inter_op)
+    except RuntimeError:
+        pass
+
+
+def _worker_init(model_name: str, backend: str, core_groups, torch_threads: int):
+    """Pin this worker to a core group, set torch threads and load the model once."""
+    global _worker_model
+
+    try:
+        cores = core_groups.get(timeout=5)
+    except Empty:
+        cores = None
+
+    if cores and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, cores)
+    configure_torch_threads(torch_threads or (len(cores) if cores else 1))
+
+    from app.embeddings.model_backends import load_embedding_model
+    _worker_model = load_embedding_model(model_name, backend)
+
+
+def _worker_encode(texts: List[str], normalize: bool) -> np.ndarray:
+    return _worker_model.encode(
+        texts,
+        batch_size=len(texts),
+        normalize_embeddings=normalize,
+        convert_to_numpy=True,
+        show_progress_bar=False
+    )
+
+
+class EncodingEngine:
+    """Encodes texts in token-budgeted, length-sorted batches, optionally across processes."""
+
+    def __init__(
+        self,
+        model,
+        model_name: str,
+        backend: str = "torch",
+        normalize: bool = True,
+        token_budget: int = 16384,
+        max_batch_size: int = 64,
+        workers: int = 1,
+        torch_threads: int = 0,
+        parallel_min_texts: int = 128
+    ):
+        """
+        Args:
+            model: Loaded SentenceTransformer (used in-process)
+            model_name: Model name, loaded again by each pool worker
+            backend: Inference backend the workers load (see model_backends)
+            normalize: L2-normalize embeddings
+            token_budget: Max padded tokens (batch size x longest sequence) per forward pass
+            max_batch_size: Max texts per forward pass
+            workers: Encode processes (1 = in-process only, 0 = one per physical core)
+            torch_threads: Intra-op threads per process (0 = torch default in-process,
+                the worker's share of physical cores in the pool)
+            parallel_min_texts: Smallest job sharded across the pool
+        """
+        self.model = model
+        self.model_name = model_name
+        self.backend = backend
+        self.normalize = normalize
+        self.token_budget = token_budget
+        self.max_batch_size = max_batch_size
+        cores = len(physical_cores())
+        self.workers = min(workers, cores) if workers > 0 else cores
+        self.torch_threads = torch_threads
+        self.parallel_min_texts = parallel_min_texts
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+        if torch_threads > 0:
+            configure_torch_threads(torch_threads)
+
+    @property
+    def dim(self) -> int:
+        return self.model.get_sentence_embedding_dimension()
+
+    def token_lengths(self, texts: List[str]) -> np.ndarray:
+        """Token count of each text after truncation to the model's max sequence length."""
+        max_length = getattr(self.model, "max_seq_length", None) or 512
+        tokenizer = getattr(self.model, "tokenizer", None)
+        if tokenizer is None:
+            # Rough estimate (~4 characters per token) when no tokenizer is exposed
+            return np.array([min(max_length, len(t) // 4 + 2) for t in texts])
+
+        encoded = tokenizer(texts, add_special_tokens=True, truncation=True, max_length=max_length)
+        return np.array([len(ids) for ids in encoded["input_ids"]])
+
+    def plan_batches(self, lengths: np.ndarray) -> List[np.ndarray]:
+        """
+        Group text indices into batches, longest first.
+
+        Because texts are sorted by decreasing length, a batch's padded size
+        is its first text's length times its size; a batch is closed once
+        adding another text would exceed the token budget or max batch size.
+        """
+        order = np.argsort(-lengths, kind="stable")
+        batches = []
+        start = 0
+        while start < len(order):
+            longest = max(int(lengths[order[start]]), 1)
+            size = max(1, min(self.max_batch_size, self.token_budget // longest))
+            batches.append(order[start:start + size])
+            start += size
+        return batches
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """Embed texts; rows are returned in input order."""
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        if not texts:
+            return out
+
+        batches = self.plan_batches(self.token_lengths(texts))
+
+        if self.workers > 1 and len(texts) >= self.parallel_min_texts:
+            pool = self._get_pool()
+            futures = [
+                (indices, pool.submit(_worker_encode, [texts[i] for i in indices], self.normalize))
+                for indices in batches
+            ]
+            for indices, future in futures:
+                out[indices] = future.result()
+            return out
+
+        for indices in batches:
+            out[indices] = self.model.encode(
+                [texts[i] for i in indices],
+                batch_size=len(indices),
+                normalize_embeddings=self.normalize,
+                convert_to_numpy=True,
+                show_progress_bar=False
+            )
+        return out
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        """Start the worker pool on first use, one core group per worker."""
+        if self._pool is not None:
+            return self._pool
+
+        context = multiprocessing.get_context("spawn")  # torch is not fork-safe
+
+        core_groups = context.Queue()
+        for group in np.array_split(np.array(physical_cores()), self.workers):
+            core_groups.put([int(c) for c in group])
+
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=context,
+            initializer=_worker_init,
+            initargs=(self.model_name, self.backend, core_groups, self.torch_threads)
+        )
+        atexit.register(self.close)
+        return self._pool
+
+    def close(self):
+        """Shut down the worker pool (it is restarted on the next large job)."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
@@ -1,18 +1,83 @@
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 import numpy as np
-from sentence_transformers import SentenceTransformer
+
+from app.config import settings
+from app.embeddings.embedding_cache import EmbeddingCache
+from app.embeddings.encoding_engine import EncodingEngine
+from app.embeddings.model_backends import load_embedding_model
+from app.utils.lazy import LazyProxy, LazySingleton
+
+
+def _top_k(similarities: np.ndarray, top_k: int) -> List[int]:
+    """Indices of the top_k similarities, best first (argpartition, then sort k)."""
+    if top_k < len(similarities):
+        candidates = np.argpartition(-similarities, top_k - 1)[:top_k]
+    else:
+        candidates = np.arange(len(similarities))
+    return candidates[np.argsort(-similarities[candidates], kind="stable")].tolist()
 
 
 class MatryoshkaEmbedder:
     
-    def __init__(self, model_name: str = "Alibaba-NLP/gte-modernbert-base"):
-        self.model = SentenceTransformer(model_name, trust_remote_code=True)
+    def __init__(
+        self,
+        model_name: Optional[str] = None,
+        normalize: bool = True,
+        cache: Optional[EmbeddingCache] = None,
+        backend: Optional[str] = None
+    ):
+        self.model_name = model_name or settings.embedding.model_name
+        self.backend = backend or settings.embedding.backend
+        self.normalize = normalize
+        self.model = load_embedding_model(self.model_name, self.backend)
+        self.cache = cache
+        self.engine = EncodingEngine(
+            self.model,
+            self.model_name,
+            backend=self.backend,
+            normalize=normalize,
+            token_budget=settings.embedding.token_budget,
+            max_batch_size=settings.embedding.max_batch_size,
+            workers=settings.embedding.encode_workers,
+            torch_threads=settings.embedding.torch_threads,
+            parallel_min_texts=settings.embedding.parallel_min_texts
+        )
+    
+    @property
+    def cache_namespace(self) -> str:
+        """Model identity used in cache keys (ONNX backends get their own entries)."""
+        if self.backend == "torch":
+            return self.model_name
+        return f"{self.model_name}@{self.backend}"
+    
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        return self.engine.encode(texts)
     
     def embed_texts(self, texts: List[str]) -> np.ndarray:
-        return self.model.encode(texts, normalize_embeddings=True)
+        if self.cache is None or not texts:
+            return self._encode(texts)
+        
+        keys = [EmbeddingCache.make_key(self.cache_namespace, self.normalize, t) for t in texts]
+        vectors = self.cache.get_many(keys)
+        
+        # Embed only cache misses (deduplicated, order preserved)
+        misses = {}
+        for key, text in zip(keys, texts):
+            if key not in vectors and key not in misses:
+                misses[key] = text
+        
+        if misses:
+            fresh = self._encode(list(misses.values()))
+            # Round through float16 so hits and misses return identical values
+            fresh = fresh.astype(np.float16).astype(np.float32)
+            new_vectors = dict(zip(misses.keys(), fresh))
+            self.cache.put_many(new_vectors)
+            vectors.update(new_vectors)
+        
+        return np.stack([vectors[k] for k in keys])
     
     def embed_text(self, text: str) -> np.ndarray:
-        return self.model.encode([text], normalize_embeddings=True)[0]
+        return self.embed_texts([text])[0]
     
     @staticmethod
     def cosine_similarity(vec1: np.ndarray, vec2: np.ndarray) -> float:
@@ -37,8 +102,7 @@ class MatryoshkaEmbedder:
         similarities = np.dot(embs_256, query_256)
         
         # Get top-k indices
-        top_indices = np.argsort(similarities)[::-1][:top_k]
-        return top_indices.tolist()
+        return _top_k(similarities, top_k)
     
     def search_full(
         self, 
@@ -51,9 +115,27 @@ class MatryoshkaEmbedder:
         similarities = np.dot(embeddings, query_emb)
         
         # Get top-k indices
-        top_indices = np.argsort(similarities)[::-1][:top_k]
-        return top_indices.tolist()
+        return _top_k(similarities, top_k)
+
+
+def _build_default_embedder() -> MatryoshkaEmbedder:
+    return MatryoshkaEmbedder(
+        cache=EmbeddingCache(
+            settings.embedding.cache_path,
+            max_entries=settings.embedding.cache_max_entries,
+            memory_entries=settings.embedding.cache_memory_entries
+        ) if settings.embedding.cache_enabled else None
+    )
+
+
+# Shared instance, loaded on first use
+_default_embedder = LazySingleton(_build_default_embedder)
+
+
+def get_matryoshka_embedder() -> MatryoshkaEmbedder:
+    """Shared embedder (the model is loaded on the first call)."""
+    return _default_embedder.get()
 
 
-# Singleton instance
-matryoshka_embedder = MatryoshkaEmbedder()
+# Backward-compatible name; building is deferred until first attribute access
+matryoshka_embedder = LazyProxy(get_matryoshka_embedder)
@@ -0,0 +1,135 @@
+"""
+Model Backends - loads the embedding model for PyTorch, ONNX or int8 ONNX inference.
+
+- "torch": the SentenceTransformer as published (fp32 PyTorch)
+- "onnx": exported once to ONNX and served through onnxruntime
+- "onnx-int8": the ONNX export with dynamic int8 weight quantization
+
+Exports are written under EMBED_ONNX_DIR on first use and reused afterwards.
+A fresh export is checked against the fp32 PyTorch model (parity_check) and
+a warning is printed if the embeddings drift.
+
+The ONNX backends need sentence-transformers>=3.2 and optimum[onnxruntime].
+sentence-transformers (and with it torch) is only imported when a model is
+loaded, so importing this module stays cheap.
+"""
+import re
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+import numpy as np
+
+from app.config import settings
+
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer
+
+
+BACKENDS = ("torch", "onnx", "onnx-int8")
+
+# Minimum cosine agreement with the fp32 model accepted without a warning
+PARITY_THRESHOLD = 0.99
+
+PARITY_SAMPLE = [
+    "Senior Python developer with 6 years building data pipelines on AWS.",
+    "Java backend engineer experienced in Spring Boot, Kafka and PostgreSQL.",
+    "Data analyst skilled in SQL, Tableau and stakeholder reporting.",
+    "SAP ABAP consultant with S/4HANA migration and OData experience.",
+    "Frontend developer focused on React, TypeScript and accessibility.",
+    "Machine learning engineer who deployed PyTorch models to production.",
+    "DevOps engineer managing Kubernetes clusters and Terraform modules.",
+    "Recent computer science graduate with internship experience in QA automation."
+]
+
+
+def _export_dir(model_name: str) -> Path:
+    safe_name = re.sub(r"[^A-Za-z0-9_.-]+", "__", model_name)
+    return Path(settings.embedding.onnx_dir) / safe_name
+
+
+def _quantized_file(quantization: str) -> str:
+    return f"onnx/model_qint8_{quantization}.onnx"
+
+
+def parity_check(
+    reference: "SentenceTransformer",
+    candidate: "SentenceTransformer",
+    texts: Optional[List[str]] = None
+) -> Dict[str, float]:
+    """
+    Cosine agreement between two models' embeddings of the same texts.
+
+    Returns:
+        {"min_cosine": ..., "mean_cosine": ...}
+    """
+    texts = texts or PARITY_SAMPLE
+    a = reference.encode(texts, normalize_embeddings=True, convert_to_numpy=True)
+    b = candidate.encode(texts, normalize_embeddings=True, convert_to_numpy=True)
+    cosine = np.sum(a * b, axis=1)
+    return {"min_cosine": float(cosine.min()), "mean_cosine": float(cosine.mean())}
+
+
+def _report_parity(model_name: str, backend: str, model: "SentenceTransformer"):
+    from sentence_transformers import SentenceTransformer
+
+    reference = SentenceTransformer(model_name, trust_remote_code=True)
+    parity = parity_check(reference, model)
+    print(f"  {backend} parity vs fp32: min cosine {parity['min_cosine']:.4f}, mean {parity['mean_cosine']:.4f}")
+    if parity["min_cosine"] < PARITY_THRESHOLD:
+        print(f"  WARNING: {backend} embeddings drift from the fp32 model (min cosine < {PARITY_THRESHOLD})")
+
+
+def export_onnx(model_name: str, quantize: bool = False, check_parity: bool = True) -> Path:
+    """
+    Export a model to ONNX (optionally int8-quantized) unless already exported.
+
+    Returns:
+        Directory holding the exported model
+    """
+    from sentence_transformers import SentenceTransformer, export_dynamic_quantized_onnx_model
+
+    export_dir = _export_dir(model_name)
+    fp32_file = export_dir / "onnx" / "model.onnx"
+    quantization = settings.embedding.onnx_quantization
+
+    if not fp32_file.exists():
+        print(f"Exporting {model_name} to ONNX ({export_dir})...")
+        model = SentenceTransformer(model_name, backend="onnx", trust_remote_code=True)
+        model.save_pretrained(str(export_dir))
+        if check_parity:
+            _report_parity(model_name, "onnx", model)
+
+    if quantize and not (export_dir / _quantized_file(quantization)).exists():
+        print(f"Quantizing ONNX model to int8 ({quantization})...")
+        model = SentenceTransformer(str(export_dir), backend="onnx", trust_remote_code=True)
+        export_dynamic_quantized_onnx_model(model, quantization, str(export_dir))
+        if check_parity:
+            quantized = SentenceTransformer(
+                str(export_dir),
+                backend="onnx",
+                model_kwargs={"file_name": _quantized_file(quantization)},
+                trust_remote_code=True
+            )
+            _report_parity(model_name, "onnx-int8", quantized)
+
+    return export_dir
+
+
+def load_embedding_model(model_name: str, backend: str = "torch") -> "SentenceTransformer":
+    """Load the embedding model for the given backend (exporting ONNX on first use)."""
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown embedding backend: {backend} (expected one of {BACKENDS})")
+
+    from sentence_transformers import SentenceTransformer
+
+    if backend == "torch":
+        return SentenceTransformer(model_name, trust_remote_code=True)
+
+    export_dir = export_onnx(model_name, quantize=backend == "onnx-int8")
+    model_kwargs = {"file_name": _quantized_file(settings.embedding.onnx_quantization)} if backend == "onnx-int8" else None
+    return SentenceTransformer(
+        str(export_dir),
+        backend="onnx",
+        model_kwargs=model_kwargs,
+        trust_remote_code=True
+    )
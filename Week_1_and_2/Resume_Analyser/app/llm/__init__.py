@@ -0,0 +1,11 @@
+"""LLM client module exports."""
+from app.llm.rate_limiter import LLMRateLimiter, TokenBucket
+from app.llm.client import RateLimitedAzureChatOpenAI, get_chat_model, get_rate_limiter
+
+__all__ = [
+    "LLMRateLimiter",
+    "TokenBucket",
+    "RateLimitedAzureChatOpenAI",
+    "get_chat_model",
+    "get_rate_limiter"
+]
@@ -0,0 +1,120 @@
+"""
+LLM Client - the one place chat models are built.
+
+All chains get their AzureChatOpenAI from get_chat_model(), so they share:
+
+- one httpx connection pool (sync and async) to the deployment
+- one LLMRateLimiter: a global concurrency limit with AIMD backoff on 429s
+  and RPM/TPM token buckets sized from the deployment quota
+
+The OpenAI SDK's own retries are disabled; the limiter retries instead, so
+a 429 slows every chain down rather than each client retrying on its own.
+"""
+from typing import Any, List, Optional
+
+import httpx
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatResult
+from langchain_openai import AzureChatOpenAI
+
+from app.config import settings
+from app.llm.rate_limiter import LLMRateLimiter
+from app.utils.lazy import LazySingleton
+from app.utils.tokens import count_tokens
+
+
+def _build_rate_limiter() -> LLMRateLimiter:
+    return LLMRateLimiter(
+        max_concurrency=settings.llm.global_concurrency,
+        requests_per_minute=settings.llm.requests_per_minute,
+        tokens_per_minute=settings.llm.tokens_per_minute,
+        max_retries=settings.llm.max_retries
+    )
+
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=settings.llm.pool_connections,
+        max_keepalive_connections=settings.llm.pool_connections
+    )
+
+
+# Shared instances, built on first use
+_default_limiter = LazySingleton(_build_rate_limiter)
+_default_http_client = LazySingleton(
+    lambda: httpx.Client(limits=_limits(), timeout=settings.llm.request_timeout)
+)
+_default_async_http_client = LazySingleton(
+    lambda: httpx.AsyncClient(limits=_limits(), timeout=settings.llm.request_timeout)
+)
+
+
+def get_rate_limiter() -> LLMRateLimiter:
+    """Process-wide LLMRateLimiter."""
+    return _default_limiter.get()
+
+
+def estimate_tokens(messages: List[BaseMessage], kwargs: dict) -> int:
+    """Prompt tokens of a request (messages plus tool / response schemas) and the output reserve."""
+    prompt = sum(count_tokens(m.content if isinstance(m.content, str) else str(m.content)) for m in messages)
+    schema = kwargs.get("tools") or kwargs.get("response_format")
+    return prompt + (count_tokens(str(schema)) if schema else 0) + settings.llm.output_token_reserve
+
+
+def _usage(result: ChatResult) -> Optional[int]:
+    usage = (result.llm_output or {}).get("token_usage") or {}
+    return usage.get("total_tokens")
+
+
+class RateLimitedAzureChatOpenAI(AzureChatOpenAI):
+    """AzureChatOpenAI whose requests go through the shared LLMRateLimiter."""
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any
+    ) -> ChatResult:
+        generate = super()._generate
+        return get_rate_limiter().call(
+            lambda: generate(messages, stop=stop, run_manager=run_manager, **kwargs),
+            estimate_tokens(messages, kwargs),
+            _usage
+        )
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any
+    ) -> ChatResult:
+        agenerate = super()._agenerate
+        return await get_rate_limiter().acall(
+            lambda: agenerate(messages, stop=stop, run_manager=run_manager, **kwargs),
+            estimate_tokens(messages, kwargs),
+            _usage
+        )
+
+
+def get_chat_model(temperature: float = 0) -> AzureChatOpenAI:
+    """
+    Chat model for the configured deployment on the shared pool and rate limiter.
+
+    Args:
+        temperature: Sampling temperature
+
+    Returns:
+        AzureChatOpenAI (cheap to build; the clients and limiter are shared)
+    """
+    return RateLimitedAzureChatOpenAI(
+        azure_deployment=settings.azure.openai_deployment,
+        azure_endpoint=settings.azure.openai_endpoint,
+        api_key=settings.azure.openai_api_key,
+        api_version=settings.azure.openai_api_version,
+        temperature=temperature,
+        max_retries=0,
+        http_client=_default_http_client.get(),
+        http_async_client=_default_async_http_client.get()
+    )
@@ -0,0 +1,251 @@
+"""
+LLM Rate Limiter - one process-wide gate in front of the chat deployment.
+
+Every LLM call passes through:
+
+- a concurrency limit adjusted by AIMD: it grows by one slot per `limit`
+  successful calls and halves on every 429
+- request and token buckets refilled at the deployment's RPM / TPM quota
+
+A call reserves its estimated tokens (prompt + an output reserve) up front;
+the estimate is corrected from the reported usage afterwards. A 429 halves
+the concurrency limit, empties both buckets and pauses every caller until
+the Retry-After time, so callers back off together instead of retrying in a
+storm. Timeouts, connection errors and 5xx responses are retried with
+exponential backoff.
+
+State is guarded by a plain lock and callers sleep outside it (time.sleep or
+asyncio.sleep), so chain.batch worker threads and async callers on any event
+loop share one limiter.
+"""
+import asyncio
+import random
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+
+T = TypeVar("T")
+
+# Seconds between checks for a free concurrency slot
+POLL_INTERVAL = 0.02
+
+# Exponential backoff without a Retry-After hint: BACKOFF_BASE * 2^attempt, capped
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 60.0
+
+# Buckets hold this many seconds of quota; Azure enforces quotas over short windows
+BURST_SECONDS = 10.0
+
+RATE_LIMITED = "rate_limited"
+TRANSIENT = "transient"
+
+
+class TokenBucket:
+    """Refills at `per_minute`, holding at most BURST_SECONDS of it (0 = unlimited)."""
+
+    def __init__(self, per_minute: float):
+        self.rate = per_minute / 60.0
+        self.capacity = self.rate * BURST_SECONDS
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until `amount` is available (0 if it is now)."""
+        if not self.rate:
+            return 0.0
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+        # A call larger than the bucket waits for a full bucket, then runs into debt
+        amount = min(amount, self.capacity)
+        return 0.0 if self.level >= amount else (amount - self.level) / self.rate
+
+    def take(self, amount: float):
+        if self.rate:
+            self.level -= amount
+
+    def drain(self):
+        self.level = min(self.level, 0.0)
+
+
+def classify_error(error: BaseException) -> Optional[str]:
+    """RATE_LIMITED for 429s, TRANSIENT for timeouts / connection errors / 5xx, None otherwise."""
+    status = getattr(error, "status_code", None)
+    if status == 429:
+        return RATE_LIMITED
+    if isinstance(status, int) and status >= 500:
+        return TRANSIENT
+
+    try:
+        import openai
+    except ImportError:
+        return None
+    if isinstance(error, openai.RateLimitError):
+        return RATE_LIMITED
+    if isinstance(error, (openai.APIConnectionError, openai.InternalServerError)):
+        return TRANSIENT
+    return None
+
+
+def retry_after(error: BaseException) -> Optional[float]:
+    """Seconds from a 429's retry-after-ms / retry-after header, if present."""
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if not headers:
+        return None
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000
+        if headers.get("retry-after"):
+            return float(headers["retry-after"])
+    except (TypeError, ValueError):
+        pass
+    return None
+
+
+class LLMRateLimiter:
+    """Concurrency (AIMD) and RPM/TPM gate shared by every LLM call in the process."""
+
+    def __init__(
+        self,
+        max_concurrency: int = 16,
+        requests_per_minute: float = 0,
+        tokens_per_minute: float = 0,
+        max_retries: int = 6
+    ):
+        """
+        Args:
+            max_concurrency: Ceiling of the AIMD concurrency limit
+            requests_per_minute: Deployment RPM quota (0 = unlimited)
+            tokens_per_minute: Deployment TPM quota (0 = unlimited)
+            max_retries: Retries per call on 429s and transient errors
+        """
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_retries = max_retries
+        self.limit = float(self.max_concurrency)
+        self.in_flight = 0
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.paused_until = 0.0
+        self.counters = {"calls": 0, "rate_limited": 0, "retries": 0, "tokens": 0}
+        self._lock = threading.Lock()
+
+    def _try_acquire(self, tokens: int) -> float:
+        """Take a slot and quota and return 0, or return the seconds to wait first."""
+        with self._lock:
+            now = time.monotonic()
+            if now < self.paused_until:
+                return self.paused_until - now
+            if self.in_flight >= int(self.limit):
+                return POLL_INTERVAL
+            wait = max(self.requests.wait_time(1, now), self.tokens.wait_time(tokens, now))
+            if wait > 0:
+                return wait
+
+            self.in_flight += 1
+            self.requests.take(1)
+            self.tokens.take(tokens)
+            return 0.0
+
+    def _succeeded(self, reserved: int, used: Optional[int]):
+        with self._lock:
+            self.in_flight -= 1
+            self.counters["calls"] += 1
+            if used is not None:
+                # Replace the estimate with what the call actually consumed
+                self.tokens.take(used - reserved)
+            self.counters["tokens"] += reserved if used is None else used
+            self.limit = min(float(self.max_concurrency), self.limit + 1.0 / self.limit)
+
+    def _failed(self, error: BaseException, attempt: int) -> Optional[float]:
+        """Record a failed call; returns the delay before retrying, or None to give up."""
+        kind = classify_error(error)
+        with self._lock:
+            self.in_flight -= 1
+            if kind == RATE_LIMITED:
+                now = time.monotonic()
+                self.counters["rate_limited"] += 1
+                # Calls already in flight when the first 429 arrived fail together: decrease once per pause
+                if now >= self.paused_until:
+                    self.limit = max(1.0, self.limit / 2)
+                self.requests.drain()
+                self.tokens.drain()
+                delay = retry_after(error) or _backoff(attempt)
+                self.paused_until = max(self.paused_until, now + delay)
+
+            if kind is None or attempt >= self.max_retries:
+                return None
+            self.counters["retries"] += 1
+
+        # After a 429 the shared pause does the waiting
+        return 0.0 if kind == RATE_LIMITED else _backoff(attempt)
+
+    def call(self, fn: Callable[[], T], tokens: int, usage: Optional[Callable[[T], Optional[int]]] = None) -> T:
+        """
+        Run a blocking LLM call through the gate, retrying 429s and transient errors.
+
+        Args:
+            fn: The call
+            tokens: Estimated tokens (prompt + completion) to reserve
+            usage: Reads the actual total tokens from the result, if reported
+        """
+        for attempt in range(self.max_retries + 1):
+            wait = self._try_acquire(tokens)
+            while wait > 0:
+                time.sleep(wait)
+                wait = self._try_acquire(tokens)
+
+            try:
+                result = fn()
+            except Exception as e:
+                delay = self._failed(e, attempt)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                continue
+
+            self._succeeded(tokens, usage(result) if usage else None)
+            return result
+
+    async def acall(
+        self,
+        fn: Callable[[], Awaitable[T]],
+        tokens: int,
+        usage: Optional[Callable[[T], Optional[int]]] = None
+    ) -> T:
+        """Async variant of call; fn returns a fresh awaitable per attempt."""
+        for attempt in range(self.max_retries + 1):
+            wait = self._try_acquire(tokens)
+            while wait > 0:
+                await asyncio.sleep(wait)
+                wait = self._try_acquire(tokens)
+
+            try:
+                result = await fn()
+            except asyncio.CancelledError:
+                with self._lock:
+                    self.in_flight -= 1
+                raise
+            except Exception as e:
+                delay = self._failed(e, attempt)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                continue
+
+            self._succeeded(tokens, usage(result) if usage else None)
+            return result
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters plus the current concurrency limit and calls in flight."""
+        with self._lock:
+            return {
+                **self.counters,
+                "concurrency_limit": int(self.limit),
+                "in_flight": self.in_flight,
+                "paused_for": round(max(0.0, self.paused_until - time.monotonic()), 2)
+            }
+
+
+def _backoff(attempt: int) -> float:
+    # Jitter keeps retries of concurrent callers apart
+    return min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt) * random.uniform(0.5, 1.0)
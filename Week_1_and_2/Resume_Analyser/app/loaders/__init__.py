@@ -1,10 +1,14 @@
 """Loaders module exports."""
-from app.loaders.resume_loader import load_resume_from_pdf, load_resume_from_bytes
+from app.loaders.resume_loader import load_resume_from_pdf, load_resume_from_bytes, load_resume_from_path
+from app.loaders.parallel_loader import extract_resumes_parallel, ExtractionTimeout
 from app.loaders.jd_loader import load_jd_from_file, load_jd_from_text
 
 __all__ = [
     "load_resume_from_pdf",
     "load_resume_from_bytes",
+    "load_resume_from_path",
+    "extract_resumes_parallel",
+    "ExtractionTimeout",
     "load_jd_from_file",
     "load_jd_from_text"
 ]
@@ -0,0 +1,133 @@
+"""
+Parallel resume extraction - fans PDF/DOCX text extraction out to a process pool.
+
+pypdf's extract_text is pure Python and CPU-bound, so bulk ingestion runs it
+across processes. Results are yielded in completion order so downstream steps
+can start on the first files while slow ones are still being parsed.
+"""
+import os
+import signal
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Tuple, Union
+
+from app.loaders.resume_loader import load_resume_from_path
+
+
+# (path, extracted text or None, error or None)
+ExtractionResult = Tuple[Path, Optional[str], Optional[Exception]]
+
+# Extra seconds the parent waits past the per-file timeout before giving up
+# on a worker that did not honour its own alarm (e.g. no SIGALRM on Windows).
+TIMEOUT_GRACE_SECONDS = 5.0
+
+
+class ExtractionTimeout(Exception):
+    """Raised when a single file takes longer than the extraction timeout."""
+
+
+def _raise_timeout(signum, frame):
+    raise ExtractionTimeout("extraction timed out")
+
+
+def _extract_with_timeout(file_path: str, timeout: float) -> str:
+    """Extract one file, interrupted by SIGALRM after `timeout` seconds where supported."""
+    use_alarm = (
+        timeout > 0
+        and hasattr(signal, "SIGALRM")
+        and threading.current_thread() is threading.main_thread()
+    )
+
+    if use_alarm:
+        previous = signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+
+    try:
+        return load_resume_from_path(file_path)
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous)
+
+
+def extract_resumes_parallel(
+    file_paths: Iterable[Union[str, Path]],
+    max_workers: int = 0,
+    timeout: float = 60.0
+) -> Iterator[ExtractionResult]:
+    """
+    Extract resume texts across a process pool.
+
+    At most `max_workers` files are in flight at once, so memory stays bounded
+    and per-file deadlines start close to when the file is actually picked up.
+    A failing or timed-out file yields its error without affecting the others.
+
+    Args:
+        file_paths: PDF/DOCX files to extract
+        max_workers: Number of processes (0 = CPU count)
+        timeout: Per-file timeout in seconds (0 disables)
+
+    Yields:
+        (path, text, error) tuples in completion order
+    """
+    paths = [Path(p) for p in file_paths]
+    if not paths:
+        return
+
+    workers = min(max_workers or os.cpu_count() or 1, len(paths))
+
+    # Not worth spinning up a pool for a single worker
+    if workers <= 1:
+        for path in paths:
+            try:
+                yield path, _extract_with_timeout(str(path), timeout), None
+            except Exception as e:
+                yield path, None, e
+        return
+
+    queue = iter(paths)
+    in_flight = {}  # future -> (path, deadline)
+    abandoned = []
+    executor = ProcessPoolExecutor(max_workers=workers)
+
+    def submit_next():
+        path = next(queue, None)
+        if path is None:
+            return
+        future = executor.submit(_extract_with_timeout, str(path), timeout)
+        deadline = time.monotonic() + timeout + TIMEOUT_GRACE_SECONDS if timeout > 0 else None
+        in_flight[future] = (path, deadline)
+
+    try:
+        for _ in range(workers):
+            submit_next()
+
+        while in_flight:
+            deadlines = [d for _, d in in_flight.values() if d is not None]
+            wait_for = max(0.0, min(deadlines) - time.monotonic()) if deadlines else None
+            done, _ = wait(list(in_flight), timeout=wait_for, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                path, _ = in_flight.pop(future)
+                submit_next()
+                try:
+                    yield path, future.result(), None
+                except Exception as e:
+                    yield path, None, e
+
+            # Backstop for workers that never returned
+            now = time.monotonic()
+            for future, (path, deadline) in list(in_flight.items()):
+                if deadline is not None and now >= deadline:
+                    in_flight.pop(future)
+                    abandoned.append(future)
+                    submit_next()
+                    yield path, None, ExtractionTimeout(f"extraction exceeded {timeout:.0f}s")
+    finally:
+        if any(not f.done() for f in abandoned):
+            # A stuck worker would block shutdown forever; stop it forcibly
+            for process in list(getattr(executor, "_processes", {}).values()):
+                process.terminate()
+        executor.shutdown(wait=False, cancel_futures=True)
@@ -102,3 +102,20 @@ def load_resume_from_bytes(file_bytes: bytes, filename: str = "") -> str:
     # Default to PDF if we can't detect
     return load_resume_from_pdf_bytes(file_bytes)
 
+
+def load_resume_from_path(file_path: Union[str, Path]) -> str:
+    """
+    Load resume text from a PDF or DOCX file on disk.
+    
+    Args:
+        file_path: Path to the resume file
+        
+    Returns:
+        Extracted text content
+    """
+    path = Path(file_path)
+    if path.suffix.lower() == ".pdf":
+        return load_resume_from_pdf(path)
+    
+    with open(path, "rb") as f:
+        return load_resume_from_docx_bytes(f.read())
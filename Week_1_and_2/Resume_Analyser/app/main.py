@@ -0,0 +1,71 @@
+"""
+Resume ranking API.
+
+Run with a single worker (the embedded Qdrant store is locked to one process):
+    uvicorn app.main:app --host 0.0.0.0 --port 8000
+"""
+import asyncio
+from contextlib import asynccontextmanager
+
+from dotenv import load_dotenv
+load_dotenv()
+
+from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
+
+from app.api import ranking_router
+from app.config import settings
+from app.llm import get_rate_limiter
+from app.services import ranking_service
+from app.warmup import warmup
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Pay the model load and client setup once per deploy, not on the first request
+    if settings.service.warmup_on_startup:
+        print("Warming up models and clients...")
+        await asyncio.to_thread(warmup)
+    yield
+
+
+# Create FastAPI app
+app = FastAPI(
+    title=settings.app_name,
+    description="Rank resumes against job descriptions with warm models and vector store",
+    version="1.0.0",
+    lifespan=lifespan
+)
+
+# Configure CORS
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
+# Register routers
+app.include_router(ranking_router, prefix="/api", tags=["ranking"])
+
+
+@app.get("/")
+async def root():
+    """Health check endpoint."""
+    return {
+        "status": "healthy",
+        "message": f"{settings.app_name} API is running"
+    }
+
+
+@app.get("/health")
+async def health_check():
+    """Detailed health check."""
+    return {
+        "status": "healthy",
+        "version": "1.0.0",
+        "resumes": await ranking_service.count(),
+        "ingesting": ranking_service.ingesting,
+        "llm": get_rate_limiter().stats()
+    }
@@ -5,8 +5,20 @@ from app.schemas.ranking_schema import (
     ScoringSignals,
     CandidateEvaluation,
     RankedCandidate,
+    StageTiming,
     RankingResponse
 )
+from app.schemas.ingest_schema import IngestSummary
+from app.schemas.search_schema import CascadeStage, CascadePlan
+from app.schemas.api_schema import (
+    IngestRequest,
+    SearchRequest,
+    SearchHit,
+    SearchResponse,
+    ParseJDRequest,
+    ParseResumeRequest,
+    RankRequest
+)
 
 __all__ = [
     "ParsedJD",
@@ -15,5 +27,16 @@ __all__ = [
     "ScoringSignals",
     "CandidateEvaluation",
     "RankedCandidate",
-    "RankingResponse"
+    "StageTiming",
+    "RankingResponse",
+    "IngestSummary",
+    "CascadeStage",
+    "CascadePlan",
+    "IngestRequest",
+    "SearchRequest",
+    "SearchHit",
+    "SearchResponse",
+    "ParseJDRequest",
+    "ParseResumeRequest",
+    "RankRequest"
 ]
@@ -0,0 +1,53 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+
+from app.schemas.search_schema import CascadePlan
+
+
+class IngestRequest(BaseModel):
+
+    resume_folder: Optional[str] = Field(default=None, description="Folder to sync (default: SERVICE_RESUME_FOLDER)")
+    parse_profiles: bool = Field(default=False, description="Also LLM-parse new resumes and store their profiles")
+
+
+class SearchRequest(BaseModel):
+
+    jd_text: str = Field(..., min_length=1, description="Job description text")
+    top_k_final: int = Field(default=4, ge=1, le=100, description="Resumes returned")
+    top_k_stage1: Optional[int] = Field(default=None, ge=1, description="Prefix-stage width (default: planned)")
+    include_text: bool = Field(default=False, description="Return each resume's full text")
+
+
+class SearchHit(BaseModel):
+
+    filename: str
+    score: float = Field(description="Full-dim cosine similarity")
+    text: Optional[str] = None
+
+
+class SearchResponse(BaseModel):
+
+    results: List[SearchHit]
+    plan: CascadePlan
+
+
+class ParseJDRequest(BaseModel):
+
+    jd_text: str = Field(..., min_length=1)
+
+
+class ParseResumeRequest(BaseModel):
+
+    resume_text: str = Field(..., min_length=1)
+    candidate_id: Optional[str] = Field(default=None, description="ID stamped on the profile (default: random)")
+
+
+class RankRequest(BaseModel):
+
+    jd_text: str = Field(..., min_length=1, description="Job description text")
+    top_k: int = Field(default=4, ge=1, le=50, description="Candidates retrieved and ranked")
+    evaluate: bool = Field(default=True, description="Add a qualitative LLM evaluation per candidate")
+    rerank: bool = Field(default=True, description="Let the LLM reranker set the final order")
+    cross_encoder: Optional[bool] = Field(
+        default=None, description="Cut a wider vector shortlist with the local cross-encoder (default: settings)"
+    )
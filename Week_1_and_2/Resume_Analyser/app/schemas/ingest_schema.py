@@ -0,0 +1,14 @@
+from pydantic import BaseModel, Field
+
+
+class IngestSummary(BaseModel):
+
+    added: int = Field(default=0, description="New resumes extracted and embedded")
+    updated: int = Field(default=0, description="Modified resumes re-embedded")
+    removed: int = Field(default=0, description="Resumes deleted from the folder")
+    skipped: int = Field(default=0, description="Unchanged resumes left as-is")
+    failed: int = Field(default=0, description="Files that could not be loaded")
+
+    @property
+    def changed(self) -> int:
+        return self.added + self.updated + self.removed
@@ -24,6 +24,7 @@ class RankedCandidate(BaseModel):
     
     candidate_id: str
     name: str
+    filename: Optional[str] = Field(default=None, description="Source resume file")
     rank: int
     final_score: float = Field(description="Aggregated score (0-100)")
     signals: ScoringSignals
@@ -31,9 +32,18 @@ class RankedCandidate(BaseModel):
     reason: str = Field(default="", description="Ranking reason from reranker")
 
 
+class StageTiming(BaseModel):
+    
+    stage: str = Field(description="Pipeline node, e.g. parse_jd, retrieve, cross_encode, parse_resume, score, evaluate, rerank")
+    candidate_id: Optional[str] = Field(default=None, description="Candidate the node ran for (None = whole request)")
+    start_ms: float = Field(description="Start, relative to the start of the run")
+    end_ms: float = Field(description="End, relative to the start of the run")
+
+
 class RankingResponse(BaseModel):
     
     
     jd_summary: str = Field(description="Parsed JD summary")
     total_candidates: int
     rankings: List[RankedCandidate]
+    timeline: List[StageTiming] = Field(default_factory=list, description="Per-stage timings of the run")
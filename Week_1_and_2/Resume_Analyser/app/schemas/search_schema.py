@@ -0,0 +1,36 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+
+
+class CascadeStage(BaseModel):
+
+    kind: str = Field(default="prefix", description="prefix (float matryoshka slice) or binary (sign-bit Hamming)")
+    dim: int = Field(description="Embedding dimensions compared in this stage")
+    width: int = Field(description="Candidates kept after this stage")
+
+
+class CascadePlan(BaseModel):
+
+    corpus_size: int
+    corpus_version: int = Field(default=-1, description="Manifest corpus version the plan was made for")
+    top_k: int = Field(description="Results returned per query")
+    stages: List[CascadeStage] = Field(default_factory=list, description="Shortlisting stages before full-dim rescoring (empty = exact search)")
+    estimated_cost: int = Field(description="Approximate multiply-adds per query")
+    exact_cost: int = Field(description="Multiply-adds per query of exact full-dim search")
+    recall_target: Optional[float] = None
+    estimated_recall: Optional[float] = Field(default=None, description="Recall@k measured during calibration")
+    calibrated: bool = Field(default=False, description="Widths come from calibration rather than a heuristic")
+
+    @property
+    def is_exact(self) -> bool:
+        return not self.stages
+
+    def describe(self) -> str:
+        """One-line summary, e.g. 'binary->2000 | 128d->300 | full->4 (~1.23M MACs/query)'."""
+        parts = [
+            f"{'binary' if s.kind == 'binary' else str(s.dim) + 'd'}->{s.width}"
+            for s in self.stages
+        ]
+        parts.append(f"full->{self.top_k}")
+        recall = f", recall~{self.estimated_recall:.2f}" if self.estimated_recall is not None else ""
+        return f"{' | '.join(parts)} (~{self.estimated_cost / 1e6:.2f}M MACs/query{recall})"
@@ -1,17 +1,32 @@
 """Scoring module exports."""
 from app.scoring.semantic_match import compute_semantic_score, batch_semantic_scores
 from app.scoring.skill_match import compute_skill_match_score
-from app.scoring.experience_score import compute_experience_score
-from app.scoring.aggregate_score import compute_aggregate_score, create_scoring_signals
+from app.scoring.skill_ontology import SkillOntology, skill_ontology, get_skill_ontology, batch_skill_match_scores
+from app.scoring.experience_score import compute_experience_score, compute_experience_scores
+from app.scoring.aggregate_score import compute_aggregate_score, create_scoring_signals, scoring_weights
+from app.scoring.batch_scoring import compute_batch_scores, SIGNAL_NAMES
 from app.scoring.resume_filter import filter_resumes
+from app.scoring.cross_encoder import CrossEncoderReranker, get_cross_encoder, ranking_agreement
 
 __all__ = [
     "compute_semantic_score",
     "batch_semantic_scores",
     "compute_skill_match_score",
+    "SkillOntology",
+    "skill_ontology",
+    "get_skill_ontology",
+    "batch_skill_match_scores",
     "compute_experience_score",
+    "compute_experience_scores",
     "compute_aggregate_score",
     "create_scoring_signals",
-    "filter_resumes"
+    "scoring_weights",
+    "compute_batch_scores",
+    "SIGNAL_NAMES",
+    "filter_resumes",
+    "CrossEncoderReranker",
+    "get_cross_encoder",
+    "ranking_agreement"
 ]
 
+
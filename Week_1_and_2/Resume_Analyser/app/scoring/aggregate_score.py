@@ -1,7 +1,18 @@
+import numpy as np
 from app.config import settings
 from app.schemas import ScoringSignals
 
 
+def scoring_weights() -> np.ndarray:
+    """Signal weights in (semantic, skill, experience, project) order."""
+    return np.array([
+        settings.scoring.semantic_weight,
+        settings.scoring.skill_weight,
+        settings.scoring.experience_weight,
+        settings.scoring.project_weight
+    ])
+
+
 def compute_aggregate_score(
     semantic_score: float,
     skill_match_score: float,
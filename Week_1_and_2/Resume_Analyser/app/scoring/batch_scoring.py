@@ -0,0 +1,93 @@
+"""
+Batch Scoring - computes every scoring signal for N candidates in one pass.
+"""
+from typing import List, Tuple
+import numpy as np
+
+from app.embeddings.matryoshka_embedder import get_matryoshka_embedder
+from app.schemas import ParsedJD, ParsedResume
+from app.scoring.aggregate_score import scoring_weights
+from app.scoring.experience_score import compute_experience_scores
+from app.scoring.skill_ontology import batch_skill_match_scores
+
+
+# Column order of the signal matrix
+SIGNAL_NAMES = ("semantic", "skill", "experience", "project")
+
+# Score used when a candidate lists no projects
+NEUTRAL_PROJECT_SCORE = 0.5
+
+
+def _project_text(resume: ParsedResume) -> str:
+    return " ".join([p.name + " " + p.description for p in resume.projects])
+
+
+def _cosine_rows(matrix: np.ndarray, query: np.ndarray) -> np.ndarray:
+    """Cosine similarity of each row of `matrix` with `query`."""
+    norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(query)
+    sims = matrix @ query
+    return np.divide(sims, norms, out=np.zeros_like(sims), where=norms > 0)
+
+
+def compute_batch_scores(
+    parsed_jd: ParsedJD,
+    resumes: List[ParsedResume]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Score all candidates against a JD at once.
+
+    The JD summary, every resume summary and every non-empty project text
+    are embedded in a single embed_texts call.
+
+    Args:
+        parsed_jd: Parsed job description
+        resumes: Parsed candidate resumes
+
+    Returns:
+        (signals, aggregates): N x 4 signal matrix in SIGNAL_NAMES order and
+        N aggregate scores (0-100)
+    """
+    n = len(resumes)
+    if n == 0:
+        return np.zeros((0, len(SIGNAL_NAMES))), np.zeros(0)
+
+    project_texts = [_project_text(r) for r in resumes]
+    has_project = np.array([bool(t.strip()) for t in project_texts])
+
+    texts = (
+        [parsed_jd.summary]
+        + [r.summary for r in resumes]
+        + [t for t, keep in zip(project_texts, has_project) if keep]
+    )
+    embeddings = get_matryoshka_embedder().embed_texts(texts)
+
+    jd_embedding = embeddings[0]
+    summary_embeddings = embeddings[1:n + 1]
+    project_embeddings = embeddings[n + 1:]
+
+    # Signal 1: Semantic similarity
+    semantic = _cosine_rows(summary_embeddings, jd_embedding)
+
+    # Signal 2: Skill match
+    skill = batch_skill_match_scores(
+        parsed_jd.must_have_skills,
+        parsed_jd.nice_to_have_skills,
+        [r.skills for r in resumes]
+    )
+
+    # Signal 3: Experience fit
+    experience = compute_experience_scores(
+        np.array([r.experience_years for r in resumes]),
+        parsed_jd.min_experience_years,
+        parsed_jd.max_experience_years
+    )
+
+    # Signal 4: Project relevance
+    project = np.full(n, NEUTRAL_PROJECT_SCORE)
+    if len(project_embeddings):
+        project[has_project] = _cosine_rows(project_embeddings, jd_embedding)
+
+    signals = np.column_stack([semantic, skill, experience, project])
+    aggregates = np.round(signals @ scoring_weights() * 100, 2)
+
+    return signals, aggregates
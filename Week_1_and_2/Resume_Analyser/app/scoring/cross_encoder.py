@@ -0,0 +1,154 @@
+"""
+Cross-Encoder Pre-pass - local (JD, resume) relevance scoring before the LLM stages.
+
+Vector search compares independently embedded texts; a cross-encoder reads
+the JD and a resume together and scores their relevance directly. It runs on
+CPU in milliseconds per pair, so it can cut a wide vector shortlist down to
+the few candidates worth LLM parsing, evaluation and reranking.
+
+The model is pluggable: anything with a sentence-transformers style
+predict(pairs, batch_size=...) returning one score per pair works, so tests
+and benchmarks can pass a tiny locally built model. The default is loaded
+from CROSS_ENCODER_MODEL_NAME on first use.
+"""
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.config import settings
+from app.utils.lazy import LazySingleton
+from app.utils.text_cleaner import truncate_text
+
+if TYPE_CHECKING:
+    from sentence_transformers import CrossEncoder
+
+
+# Characters kept per text before tokenization; generously above max_length tokens
+CHARS_PER_TOKEN = 6
+
+
+def load_cross_encoder(model_name: Optional[str] = None, max_length: Optional[int] = None) -> "CrossEncoder":
+    """Load a sentence-transformers CrossEncoder (imports torch on first call)."""
+    from sentence_transformers import CrossEncoder
+
+    return CrossEncoder(
+        model_name or settings.cross_encoder.model_name,
+        max_length=max_length or settings.cross_encoder.max_length
+    )
+
+
+class CrossEncoderReranker:
+    """Scores (JD, resume) pairs in batches and keeps the best candidates."""
+
+    def __init__(self, model: Optional[Any] = None, batch_size: Optional[int] = None, max_length: Optional[int] = None):
+        """
+        Args:
+            model: Object with predict(pairs, batch_size=...) (default: load CROSS_ENCODER_MODEL_NAME on first use)
+            batch_size: Pairs per forward pass (default: settings)
+            max_length: Max tokens per pair (default: settings)
+        """
+        self._model = model
+        self.batch_size = batch_size or settings.cross_encoder.batch_size
+        self.max_length = max_length or settings.cross_encoder.max_length
+
+    @property
+    def model(self) -> Any:
+        if self._model is None:
+            self._model = load_cross_encoder(max_length=self.max_length)
+        return self._model
+
+    def score(self, query: str, documents: Sequence[str]) -> np.ndarray:
+        """
+        Relevance score of each document for the query (higher is better).
+
+        Pairs are sent in length order so each batch pads to similar lengths,
+        then scores are returned in the input order.
+
+        Args:
+            query: Job description text
+            documents: Resume texts
+
+        Returns:
+            float32 array of shape (len(documents),)
+        """
+        if not documents:
+            return np.zeros(0, dtype=np.float32)
+
+        max_chars = self.max_length * CHARS_PER_TOKEN
+        query = truncate_text(query, max_chars)
+        texts = [truncate_text(d, max_chars) for d in documents]
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+
+        scores = self.model.predict(
+            [(query, texts[i]) for i in order],
+            batch_size=self.batch_size
+        )
+        result = np.empty(len(texts), dtype=np.float32)
+        result[order] = np.asarray(scores, dtype=np.float32).reshape(len(texts))
+        return result
+
+    def select(
+        self,
+        query: str,
+        candidates: List[Tuple[str, str, float]],
+        keep: int
+    ) -> List[Tuple[str, str, float]]:
+        """
+        Cut a vector shortlist to the `keep` best candidates by cross-encoder score.
+
+        Args:
+            query: Job description text
+            candidates: (filename, text, vector score) from search_resumes
+            keep: Candidates to keep
+
+        Returns:
+            (filename, text, cross-encoder score), best first
+        """
+        if not candidates:
+            return []
+
+        scores = self.score(query, [text for _, text, _ in candidates])
+        # Stable sort: equal scores keep the vector search order
+        order = np.argsort(-scores, kind="stable")[:keep]
+        return [(candidates[i][0], candidates[i][1], float(scores[i])) for i in order]
+
+
+def ranking_agreement(reference: List[str], predicted: List[str], k: Optional[int] = None) -> Dict[str, float]:
+    """
+    Agreement between two rankings of candidate IDs, best first.
+
+    Args:
+        reference: Reference order (e.g. the LLM ranking)
+        predicted: Order to compare (e.g. cross-encoder scores)
+        k: Cutoff for the top-k overlap (default: len(predicted))
+
+    Returns:
+        {"kendall_tau": ..., "top_k_recall": ...}: Kendall tau over the IDs in both
+        rankings, and the share of the reference top-k found in the predicted top-k
+    """
+    position = {c: i for i, c in enumerate(predicted)}
+    common = [c for c in reference if c in position]
+    concordant = discordant = 0
+    for i in range(len(common)):
+        for j in range(i + 1, len(common)):
+            if position[common[i]] < position[common[j]]:
+                concordant += 1
+            else:
+                discordant += 1
+    pairs = concordant + discordant
+
+    k = k or len(predicted)
+    reference_top = set(reference[:k])
+    return {
+        "kendall_tau": (concordant - discordant) / pairs if pairs else 1.0,
+        "top_k_recall": len(reference_top & set(predicted[:k])) / len(reference_top) if reference_top else 1.0
+    }
+
+
+# Shared instance; the model is loaded on the first score
+_default_reranker = LazySingleton(CrossEncoderReranker)
+
+
+def get_cross_encoder() -> CrossEncoderReranker:
+    """Shared CrossEncoderReranker."""
+    return _default_reranker.get()
@@ -2,6 +2,7 @@
 Experience Score - curve-based scoring for experience fit.
 """
 import math
+import numpy as np
 
 
 def compute_experience_score(
@@ -44,3 +45,38 @@ def compute_experience_score(
         return max(0.3, math.exp(-0.3 * (gap / tolerance) ** 2))
     
     return 0.5  # Fallback
+
+
+def compute_experience_scores(
+    candidate_years: np.ndarray,
+    min_required: float,
+    max_required: float = None,
+    tolerance: float = 2.0
+) -> np.ndarray:
+    """
+    Vectorized compute_experience_score over an array of candidate years.
+    
+    Args:
+        candidate_years: Array of candidates' years of experience
+        min_required: Minimum required years
+        max_required: Maximum preferred years (if None, uses min + 5)
+        tolerance: Years of tolerance outside range (default 2)
+        
+    Returns:
+        Array of experience scores (0-1)
+    """
+    if max_required is None:
+        max_required = min_required + 5  # Default range
+    
+    years = np.asarray(candidate_years, dtype=np.float64)
+    
+    under_gap = np.maximum(min_required - years, 0.0)
+    over_gap = np.maximum(years - max_required, 0.0)
+    
+    under = np.maximum(0.0, np.exp(-0.5 * (under_gap / tolerance) ** 2))
+    over = np.maximum(0.3, np.exp(-0.3 * (over_gap / tolerance) ** 2))
+    
+    return np.where(
+        years < min_required, under,
+        np.where(years > max_required, over, 1.0)
+    )
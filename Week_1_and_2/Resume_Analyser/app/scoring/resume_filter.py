@@ -1,35 +1,57 @@
-from typing import List
-from app.embeddings.matryoshka_embedder import matryoshka_embedder
+import math
+from typing import List, Optional
+from app.embeddings.matryoshka_embedder import get_matryoshka_embedder
 
 
-def filter_resumes(jd_text: str, resume_texts: List[str], top_k_final: int = 4) -> List[int]:
-   
+# Below this many resumes a 256-dim pre-pass costs more than it saves
+EXACT_SEARCH_LIMIT = 1024
+
+
+def stage1_width(num_resumes: int, top_k_final: int) -> int:
+    """Stage-1 width for an in-memory list: exact up to EXACT_SEARCH_LIMIT, ~2*sqrt(N) beyond."""
+    if num_resumes <= EXACT_SEARCH_LIMIT:
+        return num_resumes
+    return min(num_resumes, max(4 * top_k_final, math.ceil(2 * math.sqrt(num_resumes))))
+
+
+def filter_resumes(
+    jd_text: str,
+    resume_texts: List[str],
+    top_k_final: int = 4,
+    top_k_stage1: Optional[int] = None
+) -> List[int]:
+
     # If few resumes, skip filtering
     if len(resume_texts) <= top_k_final:
         return list(range(len(resume_texts)))
-    
+
+    if top_k_stage1 is None:
+        top_k_stage1 = stage1_width(len(resume_texts), top_k_final)
+
     # Embed JD and all resumes
+    matryoshka_embedder = get_matryoshka_embedder()
     jd_embedding = matryoshka_embedder.embed_text(jd_text)
     resume_embeddings = matryoshka_embedder.embed_texts(resume_texts)
-    
-    # Stage 1: 256-dim search → top 7
-    top_7_indices = matryoshka_embedder.search_256(
-        jd_embedding, 
-        resume_embeddings, 
-        top_k=7
-    )
-    
-    # Get embeddings for top 7 only
-    top_7_embeddings = resume_embeddings[top_7_indices]
-    
-    # Stage 2: Full-dim search on top 7 → top 4
-    top_4_relative = matryoshka_embedder.search_full(
-        jd_embedding, 
-        top_7_embeddings, 
+
+    # Stage 1: 256-dim search -> top_k_stage1 (skipped when it would keep everything)
+    if top_k_stage1 >= len(resume_texts):
+        stage1_indices = list(range(len(resume_texts)))
+    else:
+        stage1_indices = matryoshka_embedder.search_256(
+            jd_embedding,
+            resume_embeddings,
+            top_k=top_k_stage1
+        )
+
+    # Get embeddings for stage-1 survivors only
+    stage1_embeddings = resume_embeddings[stage1_indices]
+
+    # Stage 2: Full-dim search on survivors -> top_k_final
+    final_relative = matryoshka_embedder.search_full(
+        jd_embedding,
+        stage1_embeddings,
         top_k=top_k_final
     )
-    
+
     # Map back to original indices
-    top_4_indices = [top_7_indices[i] for i in top_4_relative]
-    
-    return top_4_indices
+    return [stage1_indices[i] for i in final_relative]
@@ -2,7 +2,7 @@
 Semantic Match - cosine similarity between JD and resume embeddings.
 """
 from typing import List
-from app.embeddings import embedder
+from app.embeddings import get_embedder
 
 
 def compute_semantic_score(jd_summary: str, resume_summary: str) -> float:
@@ -16,6 +16,7 @@ def compute_semantic_score(jd_summary: str, resume_summary: str) -> float:
     Returns:
         Similarity score (0-1)
     """
+    embedder = get_embedder()
     jd_embedding = embedder.embed_text(jd_summary)
     resume_embedding = embedder.embed_text(resume_summary)
     
@@ -33,6 +34,7 @@ def batch_semantic_scores(jd_summary: str, resume_summaries: List[str]) -> List[
     Returns:
         List of similarity scores
     """
+    embedder = get_embedder()
     jd_embedding = embedder.embed_text(jd_summary)
     resume_embeddings = embedder.embed_texts(resume_summaries)
     
@@ -1,38 +1,11 @@
 from typing import List, Set
 
-def normalize_skill(skill: str) -> str:
-    return skill.lower().strip().replace("-", " ").replace("_", " ")
+from app.scoring.skill_ontology import normalize_skill, get_skill_ontology, batch_skill_match_scores
 
 
 def get_skill_variants(skill: str) -> Set[str]:
     """Get common variants of a skill name."""
-    base = normalize_skill(skill)
-    variants = {base}
-    
-    # Common aliases
-    aliases = {
-        "javascript": {"js", "ecmascript"},
-        "typescript": {"ts"},
-        "python": {"py"},
-        "postgresql": {"postgres", "psql"},
-        "mongodb": {"mongo"},
-        "kubernetes": {"k8s"},
-        "react": {"reactjs", "react.js"},
-        "node": {"nodejs", "node.js"},
-        "fastapi": {"fast api"},
-        "machine learning": {"ml"},
-        "artificial intelligence": {"ai"},
-        "amazon web services": {"aws"},
-        "google cloud platform": {"gcp"},
-        "microsoft azure": {"azure"},
-    }
-    
-    for key, vals in aliases.items():
-        if base == key or base in vals:
-            variants.add(key)
-            variants.update(vals)
-    
-    return variants
+    return get_skill_ontology().variants(skill)
 
 
 def compute_skill_match_score(
@@ -46,33 +19,10 @@ def compute_skill_match_score(
     if not must_have_skills and not nice_to_have_skills:
         return 1.0  # No requirements = perfect match
     
-    # Normalize candidate skills with variants
-    candidate_variants = set()
-    for skill in candidate_skills:
-        candidate_variants.update(get_skill_variants(skill))
-    
-    # Count must-have matches
-    must_have_matches = 0
-    for skill in must_have_skills:
-        skill_variants = get_skill_variants(skill)
-        if skill_variants & candidate_variants:
-            must_have_matches += 1
-    
-    must_have_score = must_have_matches / len(must_have_skills) if must_have_skills else 1.0
-    
-    # Count nice-to-have matches
-    nice_matches = 0
-    for skill in nice_to_have_skills:
-        skill_variants = get_skill_variants(skill)
-        if skill_variants & candidate_variants:
-            nice_matches += 1
-    
-    nice_score = nice_matches / len(nice_to_have_skills) if nice_to_have_skills else 1.0
-    
-    # Weighted combination
-    if must_have_skills and nice_to_have_skills:
-        return (must_have_weight * must_have_score) + (nice_to_have_weight * nice_score)
-    elif must_have_skills:
-        return must_have_score
-    else:
-        return nice_score
+    return float(batch_skill_match_scores(
+        must_have_skills,
+        nice_to_have_skills,
+        [candidate_skills],
+        must_have_weight,
+        nice_to_have_weight
+    )[0])
@@ -0,0 +1,170 @@
+"""
+Skill Ontology - alias table compiled once into a canonical-ID interning table.
+
+Every known spelling of a skill maps to one integer ID, so skill matching is an
+ID intersection instead of a scan over the alias table. The table is fixed once
+compiled. Skills outside it are given IDs past the alias-table IDs from a
+per-call table, so they only match themselves within that call and never
+collide with another call's skills.
+"""
+import json
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Union
+
+import numpy as np
+
+from app.config import settings
+from app.utils.lazy import LazyProxy, LazySingleton
+
+
+DEFAULT_ALIASES_PATH = Path(__file__).parent / "data" / "skill_aliases.json"
+
+
+def normalize_skill(skill: str) -> str:
+    return skill.lower().strip().replace("-", " ").replace("_", " ")
+
+
+class SkillOntology:
+    """Interning table from skill spellings to canonical skill IDs."""
+
+    def __init__(self, aliases: Dict[str, Iterable[str]]):
+        """
+        Compile an alias table.
+
+        Args:
+            aliases: Canonical skill name -> alternative spellings
+        """
+        self._ids: Dict[str, int] = {}
+        self._canonical: List[str] = []
+        self._variants: List[Set[str]] = []
+
+        for canonical, terms in aliases.items():
+            key = normalize_skill(canonical)
+            skill_id = self._ids.get(key)
+            if skill_id is None:
+                skill_id = len(self._canonical)
+                self._ids[key] = skill_id
+                self._canonical.append(key)
+                self._variants.append({key})
+            for term in terms:
+                key = normalize_skill(term)
+                if key not in self._ids:
+                    self._ids[key] = skill_id
+                    self._variants[skill_id].add(key)
+
+    @classmethod
+    def from_file(cls, path: Union[str, Path] = DEFAULT_ALIASES_PATH) -> "SkillOntology":
+        """Load an alias table from a JSON file ({canonical: [aliases]})."""
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    @property
+    def size(self) -> int:
+        """Number of canonical skills in the alias table."""
+        return len(self._canonical)
+
+    def skill_id(self, skill: str, local: Optional[Dict[str, int]] = None) -> int:
+        """
+        Canonical ID for a skill.
+
+        Args:
+            skill: Skill spelling
+            local: Per-call table for skills outside the alias table; an unseen
+                skill is added to it with the next ID past the alias-table IDs
+
+        Raises:
+            KeyError: If the skill is not in the alias table and no local table is given
+        """
+        key = normalize_skill(skill)
+        skill_id = self._ids.get(key)
+        if skill_id is not None:
+            return skill_id
+        if local is None:
+            raise KeyError(f"Skill not in the alias table: {skill!r}")
+        return local.setdefault(key, self.size + len(local))
+
+    def canonical(self, skill: str) -> str:
+        """Canonical name for a skill (e.g. "k8s" -> "kubernetes"); unknown skills are their own."""
+        key = normalize_skill(skill)
+        skill_id = self._ids.get(key)
+        return key if skill_id is None else self._canonical[skill_id]
+
+    def variants(self, skill: str) -> Set[str]:
+        """All known spellings of a skill, including itself."""
+        key = normalize_skill(skill)
+        skill_id = self._ids.get(key)
+        return {key} if skill_id is None else set(self._variants[skill_id])
+
+    def encode(self, skills: Iterable[str], local: Optional[Dict[str, int]] = None) -> np.ndarray:
+        """Sorted array of unique canonical IDs for a skill list (see skill_id for local)."""
+        return np.unique(np.array([self.skill_id(s, local) for s in skills], dtype=np.int64))
+
+
+def batch_skill_match_scores(
+    must_have_skills: List[str],
+    nice_to_have_skills: List[str],
+    candidate_skills: List[List[str]],
+    must_have_weight: float = 0.7,
+    nice_to_have_weight: float = 0.3,
+    ontology: SkillOntology = None
+) -> np.ndarray:
+    """
+    Skill match scores for many candidates against one JD.
+
+    Candidate skills are encoded to canonical IDs and matched against the JD's
+    skills with a single scatter into an N x |JD skills| hit matrix.
+
+    Returns:
+        Array of skill match scores (0-1), one per candidate
+    """
+    n = len(candidate_skills)
+    if not must_have_skills and not nice_to_have_skills:
+        return np.ones(n)  # No requirements = perfect match
+
+    ontology = ontology or get_skill_ontology()
+
+    # IDs for skills outside the alias table, private to this call
+    local: Dict[str, int] = {}
+    must_ids = np.array([ontology.skill_id(s, local) for s in must_have_skills], dtype=np.int64)
+    nice_ids = np.array([ontology.skill_id(s, local) for s in nice_to_have_skills], dtype=np.int64)
+    encoded = [ontology.encode(skills, local) for skills in candidate_skills]
+
+    # Map each JD skill ID to a hit-matrix column
+    jd_ids = np.unique(np.concatenate([must_ids, nice_ids]))
+    column = np.full(ontology.size + len(local), -1, dtype=np.int64)
+    column[jd_ids] = np.arange(len(jd_ids))
+
+    rows = np.repeat(np.arange(n), [len(e) for e in encoded])
+    ids = np.concatenate(encoded) if encoded else np.zeros(0, dtype=np.int64)
+    cols = column[ids]
+    matched = cols >= 0
+
+    hits = np.zeros((n, len(jd_ids)), dtype=bool)
+    hits[rows[matched], cols[matched]] = True
+
+    # JD skills count with multiplicity, as in the per-candidate scorer
+    must_score = hits[:, column[must_ids]].mean(axis=1) if len(must_ids) else np.ones(n)
+    nice_score = hits[:, column[nice_ids]].mean(axis=1) if len(nice_ids) else np.ones(n)
+
+    # Weighted combination
+    if len(must_ids) and len(nice_ids):
+        return must_have_weight * must_score + nice_to_have_weight * nice_score
+    elif len(must_ids):
+        return must_score
+    else:
+        return nice_score
+
+
+# Shared instance, compiled once on first use
+_default_ontology = LazySingleton(
+    lambda: SkillOntology.from_file(settings.scoring.skill_aliases_path or DEFAULT_ALIASES_PATH)
+)
+
+
+def get_skill_ontology() -> SkillOntology:
+    """Shared ontology built from the configured alias file."""
+    return _default_ontology.get()
+
+
+# Backward-compatible name; building is deferred until first attribute access
+skill_ontology = LazyProxy(get_skill_ontology)
@@ -0,0 +1,5 @@
+"""Services module exports."""
+from app.services.ranking_pipeline import RankingPipeline, format_timeline
+from app.services.ranking_service import RankingService, ranking_service
+
+__all__ = ["RankingPipeline", "format_timeline", "RankingService", "ranking_service"]
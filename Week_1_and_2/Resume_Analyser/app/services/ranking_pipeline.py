@@ -0,0 +1,414 @@
+"""
+Ranking Pipeline - the ranking steps as an async dataflow instead of nine sequential steps.
+
+    jd_text ─┬─► parse_jd ───────────────────────────────────────┐
+             └─► retrieve ─► [cross_encode] ─► per candidate:      ▼
+                   load_profile ─► parse_resume ─────────────────► score ─► evaluate ─┐
+                                                                                      ▼
+                                                                                   rerank
+
+Each node starts as soon as its inputs are ready: the JD is parsed while the
+vector search runs, and every candidate is loaded or parsed on its own,
+without waiting for the other candidates. Parsed candidates are scored in
+packs with one compute_batch_scores call each (ScoreBatcher), scored
+candidates are evaluated in packs of several per LLM call
+(EvaluationBatcher), and only the reranker waits for the full set, so
+end-to-end latency approaches the critical path (retrieve + slowest
+candidate + rerank).
+
+With the cross-encoder pre-pass on, retrieval fetches a wider vector
+shortlist (CROSS_ENCODER_SHORTLIST) and a local cross-encoder cuts it to
+top_k before any LLM call.
+
+Every node records a StageTiming; format_timeline renders them as a text
+Gantt chart.
+"""
+import abc
+import asyncio
+import time
+import uuid
+from typing import Any, Awaitable, Callable, List, Optional, Tuple, TypeVar
+
+from app.chains import (
+    get_jd_parser_chain, get_llm_evaluator_chain,
+    get_reranker_chain, get_resume_parser_chain
+)
+from app.config import settings
+from app.schemas import CandidateEvaluation, ParsedJD, ParsedResume, RankedCandidate, RankingResponse, StageTiming
+from app.scoring import SIGNAL_NAMES, compute_batch_scores, create_scoring_signals, get_cross_encoder
+from app.vector_store import get_resume_store
+
+
+T = TypeVar("T")
+
+
+class Timeline:
+    """Collects StageTimings relative to the start of a run."""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.stages: List[StageTiming] = []
+
+    def _ms(self) -> float:
+        return (time.perf_counter() - self.start) * 1000
+
+    async def timed(self, stage: str, candidate_id: Optional[str], awaitable: Awaitable[T]) -> T:
+        start = self._ms()
+        try:
+            return await awaitable
+        finally:
+            self.stages.append(StageTiming(
+                stage=stage, candidate_id=candidate_id, start_ms=round(start, 1), end_ms=round(self._ms(), 1)
+            ))
+
+
+class PackBatcher(abc.ABC):
+    """
+    Collects items as they become ready and processes them in packs.
+
+    A pack is sent once max_pack items are waiting, or once every item still
+    expected is waiting, so no one waits on an item that is not coming.
+    Subclasses implement _process, which returns one result per item.
+    """
+
+    def __init__(self, expected: int, max_pack: int):
+        self.remaining = expected
+        self.max_pack = max(1, max_pack)
+        self._waiting: List[Tuple[Any, asyncio.Future]] = []
+        self._packs: List[asyncio.Task] = []
+
+    async def _submit(self, item: Any) -> Any:
+        """Queue an item and wait for its result."""
+        future = asyncio.get_running_loop().create_future()
+        self._waiting.append((item, future))
+        self.remaining -= 1
+        self._maybe_flush()
+        return await future
+
+    def discard(self):
+        """An item dropped out before reaching this stage (e.g. its resume failed to parse)."""
+        self.remaining -= 1
+        self._maybe_flush()
+
+    def _maybe_flush(self):
+        if self._waiting and (len(self._waiting) >= self.max_pack or self.remaining == 0):
+            pack, self._waiting = self._waiting, []
+            self._packs.append(asyncio.create_task(self._run(pack)))
+
+    async def _run(self, pack: list):
+        try:
+            results = await self._process([item for item, _ in pack])
+        except Exception as e:
+            for _, future in pack:
+                future.set_exception(e)
+            return
+
+        for (_, future), result in zip(pack, results):
+            future.set_result(result)
+
+    @abc.abstractmethod
+    async def _process(self, items: list) -> list:
+        """Results for one pack, in item order."""
+
+
+class ScoreBatcher(PackBatcher):
+    """
+    Collects parsed candidates and scores them in packs of SCORE_BATCH_SIZE.
+
+    Each pack is one compute_batch_scores call, so the JD and resume summaries
+    are embedded together instead of one embedding call per candidate. If a
+    pack fails, its candidates are scored one by one, so a bad profile only
+    drops itself.
+    """
+
+    def __init__(
+        self,
+        expected: int,
+        jd_task: "asyncio.Task[ParsedJD]",
+        run_blocking: Callable[..., Awaitable],
+        timeline: Timeline
+    ):
+        super().__init__(expected, settings.scoring.batch_size)
+        self.jd_task = jd_task
+        self.run_blocking = run_blocking
+        self.timeline = timeline
+
+    async def submit(self, profile: ParsedResume) -> Optional[Tuple[dict, float]]:
+        """Queue a candidate and wait for (signals, aggregate) (None if scoring failed)."""
+        return await self._submit(profile)
+
+    async def _score(self, parsed_jd: ParsedJD, profiles: List[ParsedResume]) -> List[Tuple[dict, float]]:
+        signal_matrix, aggregates = await self.timeline.timed(
+            "score",
+            ",".join(p.candidate_id for p in profiles),
+            self.run_blocking(compute_batch_scores, parsed_jd, profiles)
+        )
+        return [
+            ({name: float(v) for name, v in zip(SIGNAL_NAMES, row)}, float(aggregate))
+            for row, aggregate in zip(signal_matrix, aggregates)
+        ]
+
+    async def _process(self, profiles: List[ParsedResume]) -> List[Optional[Tuple[dict, float]]]:
+        parsed_jd = await self.jd_task
+        try:
+            return await self._score(parsed_jd, profiles)
+        except Exception as e:
+            if len(profiles) == 1:
+                print(f"  Scoring failed for {profiles[0].name}: {e}")
+                return [None]
+
+        results = []
+        for profile in profiles:
+            try:
+                results.extend(await self._score(parsed_jd, [profile]))
+            except Exception as e:
+                print(f"  Scoring failed for {profile.name}: {e}")
+                results.append(None)
+        return results
+
+
+class EvaluationBatcher(PackBatcher):
+    """
+    Collects candidates as they finish scoring and evaluates them in packs.
+
+    Packs hold up to LLM_EVALUATION_MAX_PACK candidates. The evaluator splits
+    packs further by token budget and falls back to single calls for anything
+    it cannot match.
+    """
+
+    def __init__(self, expected: int, llm_slots: asyncio.Semaphore, timeline: Timeline):
+        super().__init__(expected, settings.llm.evaluation_max_pack)
+        self.llm_slots = llm_slots
+        self.timeline = timeline
+
+    async def submit(self, jd: ParsedJD, profile: ParsedResume, scores: dict) -> Optional[CandidateEvaluation]:
+        """Queue a candidate and wait for its evaluation (None if it failed)."""
+        return await self._submit((jd, profile, scores))
+
+    async def _process(self, pack: list) -> List[Optional[CandidateEvaluation]]:
+        jd = pack[0][0]
+        profiles = [profile for _, profile, _ in pack]
+        try:
+            async with self.llm_slots:
+                results = await self.timeline.timed(
+                    "evaluate",
+                    ",".join(p.candidate_id for p in profiles),
+                    get_llm_evaluator_chain().aevaluate_many(jd, profiles, [scores for _, _, scores in pack])
+                )
+        except Exception as e:
+            results = [e] * len(pack)
+
+        evaluations = []
+        for profile, result in zip(profiles, results):
+            if isinstance(result, Exception):
+                print(f"  Evaluation failed for {profile.name}: {result}")
+                result = None
+            evaluations.append(result)
+        return evaluations
+
+
+async def _to_thread(fn: Callable[..., T], *args) -> T:
+    return await asyncio.to_thread(fn, *args)
+
+
+class RankingPipeline:
+    """One ranking run over the shared embedder, vector store and LLM chains."""
+
+    def __init__(
+        self,
+        top_k: int = 4,
+        evaluate: bool = True,
+        rerank: bool = True,
+        prefilter: bool = False,
+        cross_encoder: Optional[bool] = None,
+        run_blocking: Optional[Callable[..., Awaitable]] = None
+    ):
+        """
+        Args:
+            top_k: Candidates retrieved and ranked
+            evaluate: Add a qualitative LLM evaluation per candidate
+            rerank: Let the LLM reranker set the final order (otherwise by aggregate score)
+            prefilter: Apply the parsed JD's hard constraints in the vector search.
+                Retrieval then waits for the JD parse instead of running alongside it.
+            cross_encoder: Cut a wider vector shortlist to top_k with the local
+                cross-encoder before LLM calls (default: CROSS_ENCODER_ENABLED)
+            run_blocking: Runs blocking embedding / vector store calls, fn(*args)
+                (default: a worker thread; RankingService passes its locked runner)
+        """
+        self.top_k = top_k
+        self.evaluate = evaluate
+        self.rerank = rerank
+        self.prefilter = prefilter
+        self.cross_encoder = settings.cross_encoder.enabled if cross_encoder is None else cross_encoder
+        self.run_blocking = run_blocking or _to_thread
+
+    async def run(self, jd_text: str) -> RankingResponse:
+        timeline = Timeline()
+        # Shared by every LLM call of this run (resume parses and evaluations)
+        llm_slots = asyncio.Semaphore(settings.llm.max_concurrency)
+
+        jd_task = asyncio.create_task(
+            timeline.timed("parse_jd", None, get_jd_parser_chain().aparse(jd_text))
+        )
+        try:
+            parsed_jd = await jd_task if self.prefilter else None
+            candidates = await timeline.timed("retrieve", None, self._retrieve(jd_text, parsed_jd))
+            if self.cross_encoder and len(candidates) > self.top_k:
+                candidates = await timeline.timed(
+                    "cross_encode", None,
+                    self.run_blocking(get_cross_encoder().select, jd_text, candidates, self.top_k)
+                )
+
+            scorer = ScoreBatcher(len(candidates), jd_task, self.run_blocking, timeline)
+            batcher = EvaluationBatcher(len(candidates), llm_slots, timeline) if self.evaluate else None
+            scored = await asyncio.gather(*[
+                self._candidate(jd_task, filename, text, new_candidate_id(i), llm_slots, scorer, batcher, timeline)
+                for i, (filename, text, _) in enumerate(candidates)
+            ])
+            parsed_jd = await jd_task
+        finally:
+            if not jd_task.done():
+                jd_task.cancel()
+
+        ranked = sorted((c for c in scored if c is not None), key=lambda c: c.final_score, reverse=True)
+        if self.rerank and len(ranked) > 1:
+            ranked = await timeline.timed("rerank", None, self._rerank(parsed_jd, ranked))
+
+        for i, candidate in enumerate(ranked):
+            candidate.rank = i + 1
+
+        return RankingResponse(
+            jd_summary=parsed_jd.summary,
+            total_candidates=len(ranked),
+            rankings=ranked,
+            timeline=sorted(timeline.stages, key=lambda s: s.start_ms)
+        )
+
+    async def _retrieve(self, jd_text: str, parsed_jd: Optional[ParsedJD]) -> List[Tuple[str, str, float]]:
+        store = get_resume_store()
+        top_k = max(self.top_k, settings.cross_encoder.shortlist) if self.cross_encoder else self.top_k
+        results, _ = await self.run_blocking(
+            store.search_resumes_with_plan, jd_text, None, top_k, parsed_jd
+        )
+        return results
+
+    async def _candidate(
+        self,
+        jd_task: "asyncio.Task[ParsedJD]",
+        filename: str,
+        text: str,
+        candidate_id: str,
+        llm_slots: asyncio.Semaphore,
+        scorer: ScoreBatcher,
+        batcher: Optional[EvaluationBatcher],
+        timeline: Timeline
+    ) -> Optional[RankedCandidate]:
+        """parse -> score -> evaluate for one candidate; None if its resume cannot be parsed or scored."""
+        def drop_out():
+            scorer.discard()
+            if batcher is not None:
+                batcher.discard()
+
+        try:
+            profile = await self._profile(filename, text, candidate_id, llm_slots, timeline)
+        except BaseException:
+            drop_out()
+            raise
+
+        if profile is None:
+            drop_out()
+            return None
+
+        scored = await scorer.submit(profile)
+        if scored is None:
+            if batcher is not None:
+                batcher.discard()
+            return None
+
+        signals, aggregate = scored
+        evaluation = None
+        if batcher is not None:
+            evaluation = await batcher.submit(await jd_task, profile, {**signals, "aggregate": aggregate})
+
+        return RankedCandidate(
+            candidate_id=candidate_id,
+            name=profile.name,
+            filename=filename,
+            rank=0,
+            final_score=aggregate,
+            signals=create_scoring_signals(*(signals[name] for name in SIGNAL_NAMES)),
+            evaluation=evaluation
+        )
+
+    async def _profile(
+        self,
+        filename: str,
+        text: str,
+        candidate_id: str,
+        llm_slots: asyncio.Semaphore,
+        timeline: Timeline
+    ) -> Optional[ParsedResume]:
+        """Load a candidate's stored profile, or parse and store it; None if it cannot be parsed."""
+        store = get_resume_store()
+        profile = await timeline.timed(
+            "load_profile", candidate_id, self.run_blocking(store.get_profile, filename, candidate_id)
+        )
+        if profile is not None:
+            return profile
+
+        try:
+            async with llm_slots:
+                profile = await timeline.timed(
+                    "parse_resume", candidate_id, get_resume_parser_chain().aparse(text, candidate_id)
+                )
+        except Exception as e:
+            print(f"  Failed to parse {filename}: {e}")
+            return None
+        await self.run_blocking(store.save_profile, filename, profile)
+        return profile
+
+    async def _rerank(self, parsed_jd: ParsedJD, ranked: List[RankedCandidate]) -> List[RankedCandidate]:
+        """Apply the LLM reranker's order; candidates it omits keep their score order after the rest."""
+        try:
+            results = await get_reranker_chain().arerank(parsed_jd, ranked)
+        except Exception as e:
+            print(f"  Reranking failed, keeping score order: {e}")
+            return ranked
+
+        by_id = {c.candidate_id: c for c in ranked}
+        reordered = []
+        for result in sorted(results, key=lambda r: r.rank):
+            candidate = by_id.pop(result.candidate_id, None)
+            if candidate is not None:
+                candidate.reason = result.reason
+                reordered.append(candidate)
+        return reordered + [c for c in ranked if c.candidate_id in by_id]
+
+
+def new_candidate_id(index: int) -> str:
+    return f"c{index + 1}_{uuid.uuid4().hex[:6]}"
+
+
+def format_timeline(stages: List[StageTiming], width: int = 50) -> str:
+    """
+    Text Gantt chart of a run, one row per node.
+
+    The footer compares wall time with the summed stage time: the closer the
+    wall time is to the longest chain of dependent stages, the better the overlap.
+    """
+    if not stages:
+        return "(empty timeline)"
+
+    total = max(s.end_ms for s in stages) or 1.0
+    lines = []
+    for s in sorted(stages, key=lambda s: s.start_ms):
+        begin = int(s.start_ms / total * width)
+        length = max(1, int((s.end_ms - s.start_ms) / total * width))
+        bar = " " * begin + "#" * min(length, width - begin)
+        label = f"{s.stage}[{s.candidate_id}]" if s.candidate_id else s.stage
+        label = label if len(label) <= 28 else label[:25] + "..."
+        lines.append(f"  {label:<28} |{bar:<{width}}| {s.start_ms:>8.0f} - {s.end_ms:>8.0f} ms")
+
+    busy = sum(s.end_ms - s.start_ms for s in stages)
+    lines.append(f"  wall {total:.0f} ms, summed stage time {busy:.0f} ms ({busy / total:.1f}x overlap)")
+    return "\n".join(lines)
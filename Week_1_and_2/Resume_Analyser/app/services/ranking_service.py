@@ -0,0 +1,132 @@
+"""
+Ranking Service - the resume ranking pipeline behind the HTTP API.
+
+Runs the ranking pipeline against the shared embedder, vector store and LLM
+chains, which stay loaded for the life of the process.
+
+Embedding and vector store work is blocking, so it runs in worker threads,
+serialized by one index lock (the embedded Qdrant client is not built for
+concurrent use). An ingest takes that lock per micro-batch only, so searches
+and rankings interleave with it, and the resume count reported by /health
+never waits for the lock. LLM calls are awaited, so concurrent ranking
+requests overlap while they wait on the model.
+"""
+import asyncio
+import threading
+from typing import Callable, List, Optional, Tuple, TypeVar
+
+from app.chains import get_jd_parser_chain, get_resume_parser_chain
+from app.config import settings
+from app.schemas import CascadePlan, IngestSummary, ParsedJD, ParsedResume, RankingResponse
+from app.services.ranking_pipeline import RankingPipeline, new_candidate_id
+from app.vector_store import get_resume_store
+
+
+T = TypeVar("T")
+
+
+class RankingService:
+    """Ingest, search, parse and rank over the shared, warm pipeline components."""
+
+    def __init__(self):
+        self._index_lock = threading.Lock()
+        # One ingest at a time; held for the whole ingest, unlike the index lock
+        self._ingest_lock = threading.Lock()
+        self._resume_count: Optional[int] = None
+
+    def _locked(self, fn: Callable[..., T], *args, **kwargs) -> T:
+        with self._index_lock:
+            return fn(*args, **kwargs)
+
+    async def _run_blocking(self, fn: Callable[..., T], *args, **kwargs) -> T:
+        """Run embedding / vector store work in a thread, one call at a time."""
+        return await asyncio.to_thread(self._locked, fn, *args, **kwargs)
+
+    @property
+    def ingesting(self) -> bool:
+        return self._ingest_lock.locked()
+
+    def _try_count(self) -> Optional[int]:
+        # Never wait for the index lock: while it is busy, report the last known count
+        if self._index_lock.acquire(blocking=False):
+            try:
+                self._resume_count = get_resume_store().count()
+            finally:
+                self._index_lock.release()
+        return self._resume_count
+
+    async def count(self) -> Optional[int]:
+        """Resumes in the store (the last known count while the index is busy; None before the first count)."""
+        return await asyncio.to_thread(self._try_count)
+
+    def _ingest(self, resume_folder: str, parse_profiles: bool) -> IngestSummary:
+        with self._ingest_lock:
+            summary = get_resume_store().ingest_resumes(
+                resume_folder, parse_profiles=parse_profiles, index_lock=self._index_lock
+            )
+        self._try_count()
+        return summary
+
+    async def ingest(self, resume_folder: Optional[str] = None, parse_profiles: bool = False) -> IngestSummary:
+        """Sync a resume folder into the vector store (reads keep being served between micro-batches)."""
+        return await asyncio.to_thread(
+            self._ingest, resume_folder or settings.service.resume_folder, parse_profiles
+        )
+
+    async def search(
+        self,
+        jd_text: str,
+        top_k_final: int = 4,
+        top_k_stage1: Optional[int] = None,
+        parsed_jd: Optional[ParsedJD] = None
+    ) -> Tuple[List[Tuple[str, str, float]], CascadePlan]:
+        """Cascade vector search; returns (filename, text, score) hits and the plan used."""
+        return await self._run_blocking(
+            lambda: get_resume_store().search_resumes_with_plan(
+                jd_text,
+                top_k_stage1=top_k_stage1,
+                top_k_final=top_k_final,
+                parsed_jd=parsed_jd
+            )
+        )
+
+    async def parse_jd(self, jd_text: str) -> ParsedJD:
+        return await get_jd_parser_chain().aparse(jd_text)
+
+    async def parse_resume(self, resume_text: str, candidate_id: Optional[str] = None) -> ParsedResume:
+        return await get_resume_parser_chain().aparse(resume_text, candidate_id or new_candidate_id(0))
+
+    async def rank(
+        self,
+        jd_text: str,
+        top_k: int = 4,
+        evaluate: bool = True,
+        rerank: bool = True,
+        cross_encoder: Optional[bool] = None
+    ) -> RankingResponse:
+        """
+        Full pipeline: parse JD, search, parse candidates, score, evaluate and rerank.
+
+        Runs as an async dataflow (see RankingPipeline); blocking steps share
+        this service's lock with concurrent requests.
+
+        Args:
+            jd_text: Job description text
+            top_k: Candidates retrieved and ranked
+            evaluate: Add a qualitative LLM evaluation per candidate
+            rerank: Let the LLM reranker set the final order (otherwise by aggregate score)
+            cross_encoder: Cut a wider vector shortlist to top_k with the local
+                cross-encoder first (default: CROSS_ENCODER_ENABLED)
+
+        Returns:
+            RankingResponse with candidates in final rank order and the run's timeline
+        """
+        pipeline = RankingPipeline(
+            top_k=top_k, evaluate=evaluate, rerank=rerank, cross_encoder=cross_encoder,
+            run_blocking=self._run_blocking
+        )
+        return await pipeline.run(jd_text)
+
+
+# Singleton instance (cheap; the components it uses are built on first use)
+ranking_service = RankingService()
@@ -1,4 +1,6 @@
 """Utils module exports."""
-from app.utils.text_cleaner import clean_text, truncate_text
+from app.utils.lazy import LazyProxy, LazySingleton
+from app.utils.text_cleaner import chunk_text, clean_text, truncate_text
+from app.utils.tokens import count_tokens
 
-__all__ = ["clean_text", "truncate_text"]
+__all__ = ["LazyProxy", "LazySingleton", "chunk_text", "clean_text", "truncate_text", "count_tokens"]
@@ -0,0 +1,67 @@
+"""
+Lazy Singleton - a shared instance built on first use instead of at import.
+
+Models, vector store clients and LLM clients are expensive to construct, so
+modules expose them through get_*() accessors backed by a LazySingleton.
+Construction happens once, under a lock, the first time any thread asks.
+"""
+import threading
+from typing import Callable, Generic, Optional, TypeVar
+
+
+T = TypeVar("T")
+
+
+class LazySingleton(Generic[T]):
+    """Thread-safe, construct-once holder for a shared instance."""
+
+    def __init__(self, factory: Callable[[], T]):
+        """
+        Args:
+            factory: Zero-argument callable building the instance
+        """
+        self._factory = factory
+        self._instance: Optional[T] = None
+        self._lock = threading.Lock()
+
+    def get(self) -> T:
+        """Return the instance, building it on the first call."""
+        instance = self._instance
+        if instance is None:
+            with self._lock:
+                # Double-checked: another thread may have built it while we waited
+                instance = self._instance
+                if instance is None:
+                    instance = self._factory()
+                    self._instance = instance
+        return instance
+
+    @property
+    def initialized(self) -> bool:
+        return self._instance is not None
+
+    def reset(self):
+        """Drop the instance so the next get() builds a fresh one."""
+        with self._lock:
+            self._instance = None
+
+
+class LazyProxy:
+    """
+    Stand-in bound to a shared instance's old module-level name.
+
+    Attribute access is forwarded to the instance returned by the getter, so
+    `from module import instance` keeps working without building anything
+    until the instance is actually used.
+    """
+
+    def __init__(self, getter: Callable[[], object]):
+        self._getter = getter
+
+    def __getattr__(self, name: str):
+        if name == "_getter":  # not yet set (e.g. during copy or unpickling)
+            raise AttributeError(name)
+        return getattr(self._getter(), name)
+
+    def __repr__(self) -> str:
+        return f"<LazyProxy for {self._getter.__name__}()>"
@@ -0,0 +1,169 @@
+"""
+Resume Compressor - section-aware shrinking of resume text before LLM parsing.
+
+Resumes extracted from PDF/DOCX carry a lot the parser does not need:
+running headers and footers repeated on every page, page numbers,
+declarations, references, personal details. compress_resume():
+
+1. drops boilerplate lines and repeats of running page headers/footers
+2. segments the rest into sections by their headings (experience, skills,
+   projects, education, ...), dropping sections the parser never uses
+3. fits the result into a token budget: every section gets an equal share,
+   shares a short section does not use go to the longer ones, and each
+   section keeps its first lines (most recent roles, headline skills)
+
+Tokens are counted with app.utils.tokens.count_tokens (tiktoken when installed).
+"""
+import re
+from typing import Dict, List, Optional, Tuple
+
+from app.utils.tokens import count_tokens
+
+
+# Bump when the compression output changes, so cached parses are invalidated
+COMPRESSOR_VERSION = "2"
+
+# Lines before the first heading (name, contact details) are kept whole up to this many tokens
+HEADER_TOKENS = 120
+
+# A repeated line is a running header/footer if it also appears this close to the start or end
+EDGE_LINES = 5
+
+SECTION_HEADINGS = {
+    "summary": r"(professional |career )?(summary|profile|objective)|about me",
+    "experience": r"(work |professional |employment |career )?(experience|history)|employment|work history",
+    "skills": r"(technical |key |core )?(skills|competencies|expertise)|technologies|tools( and technologies)?|tech stack",
+    "projects": r"(key |academic |personal )?projects",
+    "education": r"education|academic (background|qualifications?)|qualifications?",
+    "certifications": r"certifications?|licenses?( (and|&) certifications?)?|courses|training",
+    "achievements": r"achievements|awards|accomplishments",
+    # Sections the parser does not use
+    "declaration": r"declaration",
+    "references": r"references",
+    "personal": r"personal (details|information|profile)|hobbies|interests|languages known|extra[- ]curricular( activities)?"
+}
+
+DROPPED_SECTIONS = {"declaration", "references", "personal"}
+
+_HEADING_RES = {
+    name: re.compile(rf"^[#*\-•\s]*({pattern})\s*:?\s*$", re.IGNORECASE)
+    for name, pattern in SECTION_HEADINGS.items()
+}
+
+_CONTACT_RE = re.compile(r"@|https?://|www\.|linkedin|\+?\d[\d\s().-]{8,}\d", re.IGNORECASE)
+
+_BOILERPLATE_RE = re.compile(
+    r"^(page\s*\d+(\s*(of|/)\s*\d+)?|\d+\s*(of|/)\s*\d+|\d{1,2}|curriculum vitae|resume|cv"
+    r"|references available (up)?on request\.?|i hereby declare.*)$",
+    re.IGNORECASE
+)
+
+
+def _section_of(line: str) -> Optional[str]:
+    # Headings are short; long lines mentioning "experience" are content
+    if len(line) > 50:
+        return None
+    for name, pattern in _HEADING_RES.items():
+        if pattern.match(line):
+            return name
+    return None
+
+
+def segment_resume(text: str) -> List[Tuple[str, List[str]]]:
+    """
+    Split cleaned resume text into sections, dropping boilerplate.
+
+    Args:
+        text: Resume text (clean_text output)
+
+    Returns:
+        (section name, lines) in document order; "header" holds the lines before
+        the first heading. A section's heading is its first line.
+    """
+    lines = [line.strip() for line in text.split("\n")]
+    lines = [line for line in lines if line and not _BOILERPLATE_RE.match(line)]
+    edges = {line.lower() for line in lines[:EDGE_LINES] + lines[-EDGE_LINES:]}
+
+    seen = set()
+    sections: List[Tuple[str, List[str]]] = [("header", [])]
+    for line in lines:
+        # Page headers and footers repeat verbatim; keep their first occurrence.
+        # Other repeats (e.g. "Technologies: ..." under each project) are content.
+        key = line.lower()
+        if key in seen and (key in edges or _CONTACT_RE.search(line)):
+            continue
+        seen.add(key)
+
+        name = _section_of(line)
+        if name is not None:
+            sections.append((name, [line]))
+        else:
+            sections[-1][1].append(line)
+
+    return [(name, lines) for name, lines in sections if lines and name not in DROPPED_SECTIONS]
+
+
+def _allocate(sizes: List[int], budget: int) -> List[int]:
+    """Max-min fair shares of the budget: short sections keep everything, long ones split the rest."""
+    shares = [0] * len(sizes)
+    remaining = sorted(range(len(sizes)), key=lambda i: sizes[i])
+    while remaining:
+        share = budget // len(remaining)
+        i = remaining[0]
+        if sizes[i] <= share:
+            shares[i] = sizes[i]
+            budget -= sizes[i]
+            remaining.pop(0)
+        else:
+            for i in remaining:
+                shares[i] = share
+            break
+    return shares
+
+
+def _fit_lines(lines: List[str], budget: int) -> List[str]:
+    """Leading lines that fit in the budget; the first line is cut to fit if needed."""
+    kept, used = [], 0
+    for line in lines:
+        tokens = count_tokens(line) + 1
+        if used + tokens > budget:
+            if not kept and budget > 0:
+                kept.append(line[:budget * 4])
+            break
+        kept.append(line)
+        used += tokens
+    return kept
+
+
+def compress_resume(text: str, token_budget: int) -> str:
+    """
+    Compress resume text for LLM parsing.
+
+    Args:
+        text: Resume text (clean_text output)
+        token_budget: Max tokens of the result (0 = only drop boilerplate)
+
+    Returns:
+        Sections in document order, separated by blank lines
+    """
+    sections = segment_resume(text)
+    if not sections:
+        return ""
+
+    blocks: Dict[int, List[str]] = {i: lines for i, (_, lines) in enumerate(sections)}
+    sizes = [sum(count_tokens(line) + 1 for line in lines) for _, lines in sections]
+
+    if token_budget and sum(sizes) > token_budget:
+        budget = token_budget
+        fitted = {}
+        if sections[0][0] == "header":
+            # Name and contact details come first and are small; never share them away
+            fitted[0] = _fit_lines(sections[0][1], min(HEADER_TOKENS, budget))
+            budget -= sum(count_tokens(line) + 1 for line in fitted[0])
+
+        others = [i for i in blocks if i not in fitted]
+        for i, share in zip(others, _allocate([sizes[i] for i in others], max(0, budget))):
+            fitted[i] = _fit_lines(sections[i][1], share)
+        blocks = fitted
+
+    return "\n\n".join("\n".join(blocks[i]) for i in sorted(blocks) if blocks[i])
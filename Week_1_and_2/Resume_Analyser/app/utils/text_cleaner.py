@@ -1,4 +1,5 @@
 import re
+from typing import List
 
 
 def clean_text(text: str) -> str:
@@ -22,3 +23,22 @@ def truncate_text(text: str, max_chars: int = 8000) -> str:
     if len(text) <= max_chars:
         return text
     return text[:max_chars] + "..."
+
+
+def chunk_text(text: str, chunk_words: int = 200, overlap_words: int = 40, max_chunks: int = 32) -> List[str]:
+    """Overlapping word windows covering the text (at least one chunk; the last window ends the text)."""
+    words = text.split()
+    if len(words) <= chunk_words:
+        return [" ".join(words)]
+    
+    step = max(1, chunk_words - overlap_words)
+    starts = list(range(0, len(words) - chunk_words, step)) + [len(words) - chunk_words]
+    if len(starts) > max_chunks:
+        if max_chunks <= 1:
+            # A single chunk is the head of the text
+            starts = [0]
+        else:
+            # Spread the allowed windows evenly instead of dropping the end of the resume
+            last = len(starts) - 1
+            starts = [starts[round(i * last / (max_chunks - 1))] for i in range(max_chunks)]
+    return [" ".join(words[start:start + chunk_words]) for start in starts]
@@ -0,0 +1,42 @@
+"""
+Token counting for prompt budgeting.
+
+Uses tiktoken (listed in requirements.txt) when it is installed and its
+encoding can be loaded; otherwise falls back to a ~4 characters per token
+estimate, which is close enough for packing decisions.
+"""
+import threading
+from typing import Optional
+
+
+# Encoding of the GPT-4o family; Azure deployment names do not identify the model
+DEFAULT_ENCODING = "o200k_base"
+
+_encoding = None
+_encoding_loaded = False
+_lock = threading.Lock()
+
+
+def _get_encoding():
+    global _encoding, _encoding_loaded
+    if not _encoding_loaded:
+        with _lock:
+            if not _encoding_loaded:
+                try:
+                    import tiktoken
+                    _encoding = tiktoken.get_encoding(DEFAULT_ENCODING)
+                except Exception:
+                    # Not installed, or the encoding file cannot be downloaded
+                    _encoding = None
+                _encoding_loaded = True
+    return _encoding
+
+
+def count_tokens(text: Optional[str]) -> int:
+    """Approximate prompt tokens in a text."""
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding is None:
+        return len(text) // 4 + 1
+    return len(encoding.encode(text, disallowed_special=()))
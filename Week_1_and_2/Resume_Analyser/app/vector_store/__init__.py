@@ -1,2 +1,3 @@
 """Vector store module exports."""
-from app.vector_store.qdrant_store import QdrantResumeStore, resume_store
+from app.vector_store.qdrant_store import QdrantResumeStore, resume_store, get_resume_store
+from app.vector_store.vector_matrix import ResumeVectorMatrix
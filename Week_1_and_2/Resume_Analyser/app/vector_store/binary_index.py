@@ -0,0 +1,113 @@
+"""
+Binary Index - sign-bit codes and Hamming scans for a stage-0 shortlist.
+
+Each embedding is reduced to one bit per dimension (768 dims -> 96 bytes).
+Hamming distance between codes approximates angular distance, so a popcount
+scan can shortlist candidates for the float prefix/full stages at a fraction
+of the memory bandwidth.
+"""
+from typing import Dict, Sequence
+
+import numpy as np
+
+from app.vector_store.matrix_search import BlockedTopK
+
+
+# Bits set in each byte value (fallback when np.bitwise_count is unavailable)
+_POPCOUNT_TABLE = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+SCAN_BLOCK_SIZE = 16384
+
+
+def code_bytes(dim: int) -> int:
+    """Bytes per packed code for a `dim`-dimensional embedding."""
+    return (dim + 7) // 8
+
+
+def pack_signs(vectors: np.ndarray) -> np.ndarray:
+    """Pack the sign bit of every dimension: N x D floats -> N x ceil(D/8) uint8."""
+    return np.packbits(np.asarray(vectors) > 0, axis=-1)
+
+
+def _words(codes: np.ndarray) -> np.ndarray:
+    """View codes as uint64 words when possible (8x fewer XOR/popcount ops)."""
+    codes = np.ascontiguousarray(codes)
+    if hasattr(np, "bitwise_count") and codes.shape[-1] % 8 == 0:
+        return codes.view(np.uint64)
+    return codes
+
+
+def _popcount(x: np.ndarray) -> np.ndarray:
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(x)
+    return _POPCOUNT_TABLE[x]
+
+
+def hamming_distances(query_codes: np.ndarray, codes: np.ndarray) -> np.ndarray:
+    """
+    Hamming distance between every query code and every stored code.
+
+    Args:
+        query_codes: J x B packed query codes
+        codes: M x B packed stored codes
+
+    Returns:
+        J x M int32 distances
+    """
+    q = _words(query_codes)
+    c = _words(codes)
+    return _popcount(q[:, None, :] ^ c[None, :, :]).sum(axis=2, dtype=np.int32)
+
+
+def hamming_shortlist(
+    query_codes: np.ndarray,
+    codes: np.ndarray,
+    k: int,
+    block_size: int = SCAN_BLOCK_SIZE
+) -> np.ndarray:
+    """
+    Rows of the k nearest codes (by Hamming distance) for each query.
+
+    Scans `codes` in blocks so memory stays at O(J x block x B).
+
+    Returns:
+        J x k row indices into `codes`, nearest first
+    """
+    query_codes = np.atleast_2d(query_codes)
+    top = BlockedTopK(len(query_codes), k)
+    for start in range(0, len(codes), block_size):
+        end = min(len(codes), start + block_size)
+        distances = hamming_distances(query_codes, codes[start:end])
+        top.update(-distances.astype(np.float32), np.arange(start, end))
+    rows, _ = top.result()
+    return rows
+
+
+def recall_at_k(exact: Sequence[Sequence], approx: Sequence[Sequence]) -> float:
+    """Mean fraction of each query's exact top-k that the approximate top-k found."""
+    hits = [
+        len(set(e) & set(a)) / len(e)
+        for e, a in zip(exact, approx) if len(e)
+    ]
+    return float(np.mean(hits)) if hits else 1.0
+
+
+def shortlist_recall(matrix, queries: np.ndarray, k: int, shortlist_sizes: Sequence[int]) -> Dict[int, float]:
+    """
+    Recall@k of the binary-shortlisted cascade against exact full-dim search.
+
+    Args:
+        matrix: ResumeVectorMatrix to evaluate
+        queries: J x D query embeddings
+        k: Final results per query
+        shortlist_sizes: Stage-0 shortlist sizes to try
+
+    Returns:
+        {shortlist_size: recall@k}
+    """
+    exact, _ = matrix.search(queries, top_k_stage1=len(matrix), top_k_final=k)
+    report = {}
+    for size in shortlist_sizes:
+        approx, _ = matrix.search(queries, top_k_stage1=size, top_k_final=k, binary_shortlist=size)
+        report[size] = recall_at_k(exact, approx)
+    return report
@@ -0,0 +1,295 @@
+"""
+Cascade Planner - picks matryoshka prefix stages and widths for a corpus.
+
+A cascade shortlists candidates with cheap comparisons (sign-bit Hamming
+codes, 64/128/256/512-dim prefixes) before rescoring on the full vector. How
+wide each stage must be to reach a recall target depends on the corpus, so
+widths are calibrated: for a sample of real JD embeddings, the rank each
+exact full-dim top-k result gets under every stage's similarity is measured,
+and the width that keeps the target fraction of them is read off directly.
+Candidate plans are then verified end to end and the cheapest one that meets
+the target wins. Plans are cached per corpus version, which changes once
+per ingest.
+"""
+import atexit
+import json
+import math
+import os
+from itertools import combinations
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+from app.schemas import CascadePlan, CascadeStage
+from app.vector_store.binary_index import recall_at_k
+
+
+PREFIX_DIMS = (64, 128, 256, 512)
+MAX_PREFIX_STAGES = 2
+WIDTH_SAFETY_FACTOR = 1.25  # Headroom over the calibrated width for unseen queries
+BINARY_COST_DIVISOR = 32    # A Hamming comparison costs ~dim/32 word ops vs dim MACs
+
+
+def plan_cost(stages: Sequence[CascadeStage], corpus_size: int, full_dim: int) -> int:
+    """Approximate multiply-adds per query for a cascade ending in full-dim rescoring."""
+    rows = corpus_size
+    cost = 0
+    for stage in stages:
+        per_row = stage.dim / BINARY_COST_DIVISOR if stage.kind == "binary" else stage.dim
+        cost += rows * per_row
+        rows = min(rows, stage.width)
+    return int(cost + rows * full_dim)
+
+
+def heuristic_plan(
+    corpus_size: int,
+    top_k: int,
+    prefix_dim: int = 256,
+    full_dim: int = 768,
+    corpus_version: int = -1
+) -> CascadePlan:
+    """Uncalibrated plan: one prefix stage of width ~2*sqrt(N), exact search when that is no cheaper."""
+    width = min(corpus_size, max(4 * top_k, math.ceil(2 * math.sqrt(corpus_size))))
+    stages = [CascadeStage(dim=prefix_dim, width=width)]
+    exact_cost = corpus_size * full_dim
+    if plan_cost(stages, corpus_size, full_dim) >= exact_cost:
+        stages = []
+
+    return CascadePlan(
+        corpus_size=corpus_size,
+        corpus_version=corpus_version,
+        top_k=top_k,
+        stages=stages,
+        estimated_cost=plan_cost(stages, corpus_size, full_dim),
+        exact_cost=exact_cost
+    )
+
+
+def pseudo_queries(matrix, count: int, seed: int = 0) -> np.ndarray:
+    """
+    Perturbed copies of stored vectors, used as queries when no real JDs are recorded.
+
+    Noise of the same magnitude as the vectors keeps each query from being
+    trivially its own nearest neighbour.
+    """
+    rng = np.random.default_rng(seed)
+    rows = np.sort(rng.choice(len(matrix), size=min(count, len(matrix)), replace=False))
+    queries = matrix.vectors(rows)
+    queries += rng.standard_normal(queries.shape).astype(np.float32) * np.abs(queries).mean()
+    return queries
+
+
+class QuerySample:
+    """
+    Ring buffer of recent JD embeddings, persisted as a float16 .npy file.
+
+    The buffer lives in memory; it is written every `save_every` new queries,
+    before plans are recalibrated and at exit, never on every search.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Union[str, Path]] = None,
+        capacity: int = 64,
+        dim: int = 768,
+        save_every: int = 16
+    ):
+        """
+        Args:
+            path: .npy file location. None keeps the sample in memory only.
+            capacity: Embeddings kept (oldest are dropped first)
+            dim: Embedding dimension
+            save_every: Queries recorded between writes to disk
+        """
+        self.path = Path(path) if path else None
+        self.capacity = capacity
+        self.dim = dim
+        self.save_every = max(1, save_every)
+        self._embeddings = np.zeros((0, dim), dtype=np.float16)
+        self._unsaved = 0
+
+        if self.path and self.path.exists():
+            try:
+                loaded = np.load(self.path)
+                if loaded.ndim == 2 and loaded.shape[1] == dim:
+                    self._embeddings = loaded[-capacity:]
+            except (OSError, ValueError):
+                pass
+
+        if self.path is not None:
+            atexit.register(self.save)
+
+    def __len__(self) -> int:
+        return len(self._embeddings)
+
+    def add(self, embeddings: np.ndarray):
+        """Record query embeddings (J x D); written to disk every save_every queries."""
+        embeddings = np.atleast_2d(np.asarray(embeddings, dtype=np.float16))
+        self._embeddings = np.concatenate([self._embeddings, embeddings])[-self.capacity:]
+
+        self._unsaved += len(embeddings)
+        if self._unsaved >= self.save_every:
+            self.save()
+
+    def save(self):
+        """Write unsaved queries to disk (atomic; no-op when nothing changed or in memory only)."""
+        if self.path is None or self._unsaved == 0:
+            return
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp.npy")
+        np.save(tmp_path, self._embeddings)
+        os.replace(tmp_path, self.path)
+        self._unsaved = 0
+
+    def array(self) -> np.ndarray:
+        return self._embeddings.astype(np.float32)
+
+
+class CascadePlanner:
+    """Calibrates and caches cascade plans for a ResumeVectorMatrix."""
+
+    PLANS_FILENAME = "cascade_plans.json"
+
+    def __init__(
+        self,
+        matrix,
+        sample: QuerySample,
+        recall_target: float = 0.95,
+        calibration_queries: int = 64,
+        min_sample_queries: int = 8
+    ):
+        """
+        Args:
+            matrix: ResumeVectorMatrix to plan for
+            sample: Recorded JD embeddings used as calibration queries
+            recall_target: Required recall@k against exact full-dim search
+            calibration_queries: Pseudo-queries generated when the sample is too small
+            min_sample_queries: Recorded JDs needed before the sample is used
+        """
+        self.matrix = matrix
+        self.sample = sample
+        self.recall_target = recall_target
+        self.calibration_queries = calibration_queries
+        self.min_sample_queries = min_sample_queries
+
+        self._plans_path = Path(matrix.path) / self.PLANS_FILENAME
+        self._plans_version = -1
+        self._plans: Dict[str, CascadePlan] = {}
+        self._load_plans()
+
+    def _load_plans(self):
+        if not self._plans_path.exists():
+            return
+        try:
+            with open(self._plans_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self._plans_version = data["version"]
+            self._plans = {k: CascadePlan(**v) for k, v in data["plans"].items()}
+        except (OSError, ValueError, KeyError):
+            self._plans = {}
+
+    def _save_plans(self):
+        tmp_path = self._plans_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "version": self._plans_version,
+                "plans": {k: p.model_dump() for k, p in self._plans.items()}
+            }, f, indent=2)
+        os.replace(tmp_path, self._plans_path)
+
+    def plan(
+        self,
+        top_k: int,
+        prefix_dims: Sequence[int] = PREFIX_DIMS,
+        allow_binary: bool = True
+    ) -> CascadePlan:
+        """
+        Cheapest calibrated plan meeting the recall target for the current corpus.
+
+        Args:
+            top_k: Results per query
+            prefix_dims: Prefix sizes the plan may use
+            allow_binary: Allow a sign-bit Hamming first stage
+        """
+        if self.matrix.version != self._plans_version:
+            self._plans_version = self.matrix.version
+            self._plans = {}
+
+        key = f"{top_k}:{','.join(map(str, sorted(prefix_dims)))}:{int(allow_binary)}:{self.recall_target}"
+        if key not in self._plans:
+            # The queries a plan was calibrated on are kept with it
+            self.sample.save()
+            self._plans[key] = self._calibrate(top_k, sorted(prefix_dims), allow_binary)
+            self._save_plans()
+        return self._plans[key]
+
+    def _queries(self) -> np.ndarray:
+        if len(self.sample) >= self.min_sample_queries:
+            return self.sample.array()
+        return pseudo_queries(self.matrix, self.calibration_queries)
+
+    def _width_for(self, ranks: np.ndarray, recall: float, top_k: int) -> int:
+        """Smallest width keeping `recall` of the exact results (plus safety headroom)."""
+        flat = np.sort(ranks.ravel())
+        needed = flat[max(0, math.ceil(recall * len(flat)) - 1)] + 1
+        width = math.ceil(needed * WIDTH_SAFETY_FACTOR)
+        return int(min(len(self.matrix), max(width, top_k)))
+
+    def _calibrate(self, top_k: int, prefix_dims: List[int], allow_binary: bool) -> CascadePlan:
+        n = len(self.matrix)
+        full_dim = self.matrix.dim
+        exact = CascadePlan(
+            corpus_size=n,
+            corpus_version=self.matrix.version,
+            top_k=top_k,
+            estimated_cost=n * full_dim,
+            exact_cost=n * full_dim,
+            recall_target=self.recall_target,
+            estimated_recall=1.0,
+            calibrated=True
+        )
+        if n <= top_k:
+            return exact
+
+        queries = self._queries()
+        exact_rows, _ = self.matrix.cascade_rows(queries, [], top_k)
+
+        stage_types = [CascadeStage(dim=d, width=0) for d in prefix_dims if d < full_dim]
+        if allow_binary:
+            stage_types.insert(0, CascadeStage(kind="binary", dim=full_dim, width=0))
+        ranks = {
+            (s.kind, s.dim): self.matrix.stage_ranks(queries, exact_rows, s)
+            for s in stage_types
+        }
+
+        # Enumerate chains: optional binary stage, then 1..MAX_PREFIX_STAGES ascending prefixes
+        candidates = []
+        prefixes = [s for s in stage_types if s.kind == "prefix"]
+        for use_binary in ([False, True] if allow_binary else [False]):
+            for size in range(1, MAX_PREFIX_STAGES + 1):
+                for combo in combinations(prefixes, size):
+                    chain = ([stage_types[0]] if use_binary else []) + list(combo)
+                    per_stage_recall = self.recall_target ** (1 / len(chain))
+                    widths = [self._width_for(ranks[(s.kind, s.dim)], per_stage_recall, top_k) for s in chain]
+                    for i in range(len(widths) - 2, -1, -1):
+                        widths[i] = max(widths[i], widths[i + 1])
+
+                    stages = [CascadeStage(kind=s.kind, dim=s.dim, width=w) for s, w in zip(chain, widths)]
+                    cost = plan_cost(stages, n, full_dim)
+                    if widths[0] < n and cost < exact.exact_cost:
+                        candidates.append((cost, stages))
+
+        # Verify cheapest first; the per-stage split is only an estimate
+        for cost, stages in sorted(candidates, key=lambda c: c[0]):
+            rows, _ = self.matrix.cascade_rows(queries, stages, top_k)
+            recall = recall_at_k(exact_rows.tolist(), rows.tolist())
+            if recall >= self.recall_target:
+                return exact.model_copy(update={
+                    "stages": stages,
+                    "estimated_cost": cost,
+                    "estimated_recall": recall
+                })
+
+        return exact
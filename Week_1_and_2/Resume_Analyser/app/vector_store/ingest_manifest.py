@@ -0,0 +1,98 @@
+"""
+Ingest manifest - tracks which resume files are stored in Qdrant.
+
+Maps each resume path to its content hash, mtime, size and point ID so that
+repeat ingests only extract and embed new or modified files.
+"""
+import hashlib
+import json
+import os
+import uuid
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+
+HASH_CHUNK_SIZE = 1 << 20  # 1 MiB
+
+
+def hash_file(file_path: Union[str, Path]) -> str:
+    """SHA-256 of a file's contents, read in chunks."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def point_id_from_hash(content_hash: str) -> str:
+    """Stable Qdrant point ID (UUID) derived from a content hash."""
+    return str(uuid.UUID(hex=content_hash[:32]))
+
+
+class IngestManifest:
+    """JSON-backed record of ingested resume files."""
+
+    def __init__(self, manifest_path: Optional[Union[str, Path]] = None):
+        """
+        Load the manifest if present.
+
+        Args:
+            manifest_path: JSON file location. None keeps the manifest in memory only.
+        """
+        self.path = Path(manifest_path) if manifest_path else None
+        self.entries: Dict[str, dict] = {}
+        self.version = 0  # Bumped once per ingest (or clear) that changes stored vectors
+        # True once the entries describe the stored points (loaded, cleared or rebuilt)
+        self.initialized = bool(self.path and self.path.exists())
+
+        if self.initialized:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.entries = data.get("files", {})
+            self.version = data.get("version", 0)
+
+    def get(self, key: str) -> Optional[dict]:
+        return self.entries.get(key)
+
+    def record(self, key: str, content_hash: str, mtime: Optional[float], size: Optional[int]) -> dict:
+        """Add or replace the entry for a file (mtime/size None: unknown, so the file is re-hashed on the next sync)."""
+        entry = {
+            "content_hash": content_hash,
+            "point_id": point_id_from_hash(content_hash),
+            "mtime": mtime,
+            "size": size
+        }
+        self.entries[key] = entry
+        return entry
+
+    def remove(self, key: str) -> Optional[dict]:
+        return self.entries.pop(key, None)
+
+    def is_referenced(self, point_id: str) -> bool:
+        """True if any tracked file still maps to this point (duplicate content)."""
+        return any(e["point_id"] == point_id for e in self.entries.values())
+
+    def keys_in_folder(self, folder: Union[str, Path]) -> list:
+        """Tracked files that live directly in the given folder."""
+        folder_key = str(Path(folder).resolve())
+        return [k for k in self.entries if os.path.dirname(k) == folder_key]
+
+    def bump_version(self) -> int:
+        """Mark the stored corpus as changed (invalidates derived indexes)."""
+        self.version += 1
+        return self.version
+
+    def clear(self):
+        self.entries = {}
+        self.initialized = True
+
+    def save(self):
+        """Write the manifest atomically (temp file + rename)."""
+        if self.path is None:
+            return
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": self.version, "files": self.entries}, f, indent=2)
+        os.replace(tmp_path, self.path)
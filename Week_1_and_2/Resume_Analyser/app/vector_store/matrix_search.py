@@ -0,0 +1,87 @@
+"""
+Matrix Search - blocked brute-force top-k for many queries at once.
+
+Scores a J x N similarity matrix block by block (BLAS matmul per block) and
+keeps a running per-query top-k with argpartition, so memory stays at
+O(J x block) regardless of corpus size.
+"""
+from typing import Tuple
+import numpy as np
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """L2-normalize each row (zero rows stay zero)."""
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Row-wise top-k column indices of a score matrix, best first.
+
+    Uses argpartition (O(N)) and only sorts the k survivors.
+    """
+    k = min(k, scores.shape[1])
+    if k <= 0:
+        return np.zeros((scores.shape[0], 0), dtype=np.int64)
+
+    if k < scores.shape[1]:
+        part = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    else:
+        part = np.broadcast_to(np.arange(scores.shape[1]), scores.shape).copy()
+
+    part_scores = np.take_along_axis(scores, part, axis=1)
+    order = np.argsort(-part_scores, axis=1, kind="stable")
+    return np.take_along_axis(part, order, axis=1)
+
+
+class BlockedTopK:
+    """Running per-query top-k over column blocks of a score matrix."""
+
+    def __init__(self, n_queries: int, k: int):
+        self.k = k
+        self.scores = np.zeros((n_queries, 0), dtype=np.float32)
+        self.ids = np.zeros((n_queries, 0), dtype=np.int64)
+
+    def update(self, block_scores: np.ndarray, block_ids: np.ndarray):
+        """
+        Merge one block.
+
+        Args:
+            block_scores: J x B scores for this block
+            block_ids: B global row IDs for the block's columns
+        """
+        merged_scores = np.concatenate([self.scores, block_scores], axis=1)
+        merged_ids = np.concatenate(
+            [self.ids, np.broadcast_to(block_ids, block_scores.shape)], axis=1
+        )
+        keep = top_k_indices(merged_scores, self.k)
+        self.scores = np.take_along_axis(merged_scores, keep, axis=1)
+        self.ids = np.take_along_axis(merged_ids, keep, axis=1)
+
+    def result(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(ids, scores), each J x k, best first."""
+        return self.ids, self.scores
+
+
+def rescore_candidates(
+    queries: np.ndarray,
+    candidate_ids: np.ndarray,
+    vectors: np.ndarray,
+    row_of_id: np.ndarray
+) -> np.ndarray:
+    """
+    Full-dim scores for each query's own candidate list.
+
+    Args:
+        queries: J x D normalized query vectors
+        candidate_ids: J x K global row IDs per query
+        vectors: U x D normalized vectors for the union of candidates
+        row_of_id: Maps a global row ID to its row in `vectors`
+
+    Returns:
+        J x K scores aligned with candidate_ids
+    """
+    union_scores = queries @ vectors.T  # J x U
+    return np.take_along_axis(union_scores, row_of_id[candidate_ids], axis=1)
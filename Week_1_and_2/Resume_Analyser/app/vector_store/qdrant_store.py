@@ -1,125 +1,622 @@
 """
-Qdrant Vector Store for Resume Storage with Query-Time Slicing.
+Qdrant Vector Store for Resume Storage with Matryoshka Named Vectors.
 
-Stores full embeddings (768 dims) and performs two-stage search:
-- Stage 1: 256-dim slice for fast candidate retrieval
-- Stage 2: Full-dim rerank for precision
+Each resume is stored with two named vectors:
+- "prefix": first 256 dims of the embedding (HNSW candidate retrieval)
+- "full": full 768-dim embedding (precision rescoring)
+
+Two-stage search runs server-side in a single query_points call:
+- Stage 1: prefetch on the 256-dim prefix vector
+- Stage 2: rescore the prefetched candidates on the full vector
+
+Stage widths come from a cascade planner calibrated against exact search
+unless top_k_stage1 is given explicitly. Calibration runs on the local
+matrix (see plan_search), so for Qdrant search the recall target is an
+estimate rather than a guarantee.
+
+A memory-mapped copy of the full vectors (ResumeVectorMatrix) is kept in sync
+with the collection and serves the same cascade locally by brute force when
+the "local" search backend is selected.
+
+With STORE_CHUNKED, each resume is also split into overlapping word chunks,
+embedded in one batched pass, and stored as a third named vector:
+- "chunks": one 768-dim vector per chunk (multivector, MAX_SIM comparator)
+"prefix"/"full" then hold the normalized mean of the chunk embeddings, and
+stage 2 of the Qdrant search scores each resume by its best-matching chunk.
+Every resume is still one point, so results are unique per resume without
+grouping. The local backend and multi-JD batch search rank by the mean
+vector. Switching the layout rebuilds the collection; the next ingest
+re-embeds every resume.
 """
-from typing import List, Tuple, Optional
+import threading
+from contextlib import nullcontext
+from itertools import islice
+from typing import Iterable, Iterator, List, Tuple, Optional, Dict, Union
 from pathlib import Path
 import numpy as np
 from qdrant_client import QdrantClient
 from qdrant_client.models import (
     VectorParams, Distance, PointStruct, 
-    Filter, FieldCondition, MatchValue
+    Filter, FieldCondition, MatchValue, Prefetch, PointIdsList,
+    MatchAny, Range, IsEmptyCondition, PayloadField, PayloadSchemaType, SearchParams,
+    MultiVectorConfig, MultiVectorComparator, HnswConfigDiff
 )
 
-from app.embeddings.matryoshka_embedder import matryoshka_embedder
-from app.loaders import load_resume_from_pdf
-from app.utils import clean_text
+from app.embeddings.matryoshka_embedder import get_matryoshka_embedder
+from app.config import settings
+from app.loaders import extract_resumes_parallel
+from app.schemas import CascadePlan, CascadeStage, IngestSummary, ParsedJD, ParsedResume
+from app.scoring.skill_ontology import get_skill_ontology
+from app.utils import LazyProxy, LazySingleton, chunk_text, clean_text
+from app.vector_store.cascade_planner import CascadePlanner, QuerySample, heuristic_plan, plan_cost
+from app.vector_store.ingest_manifest import IngestManifest, hash_file, point_id_from_hash
+from app.vector_store.matrix_search import (
+    BlockedTopK, normalize_rows, rescore_candidates, top_k_indices
+)
+from app.vector_store.vector_matrix import ResumeVectorMatrix
+
+
+def _batched(items: Iterable, size: int) -> Iterator[list]:
+    """Yield successive lists of at most `size` items."""
+    iterator = iter(items)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
 
 
 class QdrantResumeStore:
-    """Qdrant-based resume vector store with query-time slicing."""
+    """Qdrant-based resume vector store with server-side matryoshka search."""
     
     COLLECTION_NAME = "resumes"
     VECTOR_DIM = 768  # gte-modernbert-base dimension
+    PREFIX_DIM = 256  # Matryoshka prefix used for stage-1 retrieval
+    
+    PREFIX_VECTOR = "prefix"
+    FULL_VECTOR = "full"
+    CHUNK_VECTOR = "chunks"  # Per-chunk multivector (chunked layout only)
+    
+    MIGRATION_BATCH_SIZE = 256
+    SCAN_BLOCK_SIZE = 4096  # Vectors per block in batch (multi-JD) search
+    MANIFEST_FILENAME = "ingest_manifest.json"
+    MATRIX_DIRNAME = "vector_matrix"
+    QUERY_SAMPLE_FILENAME = "query_sample.npy"
     
     DEFAULT_PERSIST_PATH = "./qdrant_data"
     
-    def __init__(self, persist_path: Optional[str] = "./qdrant_data"):
+    def __init__(self, persist_path: Optional[str] = "./qdrant_data", chunked: Optional[bool] = None):
         """
         Initialize Qdrant client with disk persistence.
         
         Args:
             persist_path: Path for disk persistence. Default = ./qdrant_data
+            chunked: Use the chunked multivector layout (default: STORE_CHUNKED)
         """
         self.persist_path = persist_path
+        self.chunked = settings.store.chunked if chunked is None else chunked
         self.client = QdrantClient(path=persist_path)
+        self.manifest = IngestManifest(
+            Path(persist_path) / self.MANIFEST_FILENAME if persist_path else None
+        )
+        
+        # Local brute-force copy of the vectors (disk-backed stores only)
+        self.matrix = None
+        self.planner = None
+        self.query_sample = QuerySample(capacity=settings.store.calibration_queries, dim=self.VECTOR_DIM)
+        self._corpus_changed = False  # Set by writes; the version is bumped once at the end of an ingest
+        if persist_path and settings.store.matrix_enabled:
+            self.matrix = ResumeVectorMatrix(
+                Path(persist_path) / self.MATRIX_DIRNAME,
+                dim=self.VECTOR_DIM,
+                dtype=settings.store.matrix_dtype
+            )
+            # Recent JD embeddings double as calibration queries for the planner
+            self.query_sample = QuerySample(
+                self.matrix.path / self.QUERY_SAMPLE_FILENAME,
+                capacity=settings.store.calibration_queries,
+                dim=self.VECTOR_DIM
+            )
+            self.planner = CascadePlanner(
+                self.matrix,
+                self.query_sample,
+                recall_target=settings.store.recall_target,
+                calibration_queries=settings.store.calibration_queries
+            )
         
         self._ensure_collection()
+        self._sync_matrix()
+    
+    @property
+    def _migration_collection(self) -> str:
+        return f"{self.COLLECTION_NAME}_migration"
+    
+    def _collection_names(self) -> List[str]:
+        return [c.name for c in self.client.get_collections().collections]
+    
+    def _create_collection(self, collection_name: str):
+        """Create a collection with the named prefix/full (and chunks) vector layout."""
+        vectors_config = {
+            self.PREFIX_VECTOR: VectorParams(
+                size=self.PREFIX_DIM,
+                distance=Distance.COSINE
+            ),
+            self.FULL_VECTOR: VectorParams(
+                size=self.VECTOR_DIM,
+                distance=Distance.COSINE
+            )
+        }
+        if self.chunked:
+            # Only used to rescore prefetched resumes, so no HNSW graph is built for it
+            vectors_config[self.CHUNK_VECTOR] = VectorParams(
+                size=self.VECTOR_DIM,
+                distance=Distance.COSINE,
+                multivector_config=MultiVectorConfig(comparator=MultiVectorComparator.MAX_SIM),
+                hnsw_config=HnswConfigDiff(m=0)
+            )
+        
+        self.client.create_collection(
+            collection_name=collection_name,
+            vectors_config=vectors_config
+        )
+    
+    def _is_legacy_collection(self, collection_name: str) -> bool:
+        """True if the collection still uses a single unnamed vector."""
+        info = self.client.get_collection(collection_name)
+        return not isinstance(info.config.params.vectors, dict)
+    
+    def _has_chunk_vectors(self, collection_name: str) -> bool:
+        """True if the collection uses the chunked multivector layout."""
+        vectors = self.client.get_collection(collection_name).config.params.vectors
+        return isinstance(vectors, dict) and self.CHUNK_VECTOR in vectors
     
     def _ensure_collection(self):
-        """Create collection if not exists."""
-        collections = self.client.get_collections().collections
-        exists = any(c.name == self.COLLECTION_NAME for c in collections)
+        """Create collection if not exists, migrating legacy layouts."""
+        names = self._collection_names()
+        exists = self.COLLECTION_NAME in names
+        
+        if self._migration_collection in names:
+            if exists and self._is_legacy_collection(self.COLLECTION_NAME):
+                # Interrupted while copying out of the legacy collection: start over
+                self.client.delete_collection(self._migration_collection)
+            else:
+                # Interrupted after the legacy collection was dropped: finish copying back
+                if exists:
+                    self.client.delete_collection(self.COLLECTION_NAME)
+                self._create_collection(self.COLLECTION_NAME)
+                self._copy_points(self._migration_collection, self.COLLECTION_NAME)
+                self.client.delete_collection(self._migration_collection)
+                return
         
         if not exists:
-            self.client.create_collection(
-                collection_name=self.COLLECTION_NAME,
-                vectors_config=VectorParams(
-                    size=self.VECTOR_DIM,
-                    distance=Distance.COSINE
+            self._create_collection(self.COLLECTION_NAME)
+        elif self._is_legacy_collection(self.COLLECTION_NAME):
+            self.migrate_legacy_collection()
+        elif self._has_chunk_vectors(self.COLLECTION_NAME) != self.chunked:
+            # Chunk vectors can only come from the resume text, so switching layouts re-embeds
+            layout = "chunked" if self.chunked else "single-vector"
+            print(f"Resume collection layout changed to {layout}. Rebuilding; the next ingest re-embeds every resume...")
+            self.clear()
+        
+        self._ensure_payload_indexes()
+    
+    def _ensure_payload_indexes(self):
+        """Index profile fields used for structured prefiltering."""
+        existing = self.client.get_collection(self.COLLECTION_NAME).payload_schema or {}
+        indexes = {
+            "skills": PayloadSchemaType.KEYWORD,
+            "experience_years": PayloadSchemaType.FLOAT
+        }
+        for field_name, schema in indexes.items():
+            if field_name not in existing:
+                self.client.create_payload_index(
+                    collection_name=self.COLLECTION_NAME,
+                    field_name=field_name,
+                    field_schema=schema
                 )
+    
+    def migrate_legacy_collection(self):
+        """
+        Migrate a single-vector collection (pre named-vector layout) in place.
+        
+        Points are copied into a staging collection with prefix/full vectors,
+        the legacy collection is recreated, and points are copied back. Stored
+        embeddings are reused, so no resume is re-embedded.
+        """
+        print(f"Migrating '{self.COLLECTION_NAME}' to named prefix/full vectors...")
+        
+        self._create_collection(self._migration_collection)
+        copied = self._copy_points(self.COLLECTION_NAME, self._migration_collection)
+        
+        self.client.delete_collection(self.COLLECTION_NAME)
+        self._create_collection(self.COLLECTION_NAME)
+        self._copy_points(self._migration_collection, self.COLLECTION_NAME)
+        self.client.delete_collection(self._migration_collection)
+        
+        print(f"Migrated {copied} resumes")
+    
+    def _copy_points(self, source: str, target: str) -> int:
+        """Copy all points in pages, converting legacy vectors to named vectors."""
+        copied = 0
+        offset = None
+        
+        while True:
+            records, offset = self.client.scroll(
+                collection_name=source,
+                limit=self.MIGRATION_BATCH_SIZE,
+                offset=offset,
+                with_vectors=True,
+                with_payload=True
             )
+            
+            if records:
+                points = []
+                for r in records:
+                    vector, chunks = r.vector, None
+                    if isinstance(vector, dict):
+                        chunks = vector.get(self.CHUNK_VECTOR)
+                        vector = vector[self.FULL_VECTOR]
+                    points.append(PointStruct(
+                        id=r.id,
+                        vector=self._named_vectors(
+                            np.asarray(vector, dtype=np.float32),
+                            np.asarray(chunks, dtype=np.float32) if chunks is not None else None
+                        ),
+                        payload=r.payload
+                    ))
+                
+                self.client.upsert(collection_name=target, points=points)
+                copied += len(points)
+            
+            if offset is None:
+                break
+        
+        return copied
     
-    def ingest_resumes(self, resume_folder: str) -> int:
+    def _sync_matrix(self):
+        """Rebuild the local vector matrix if it was built from another corpus version."""
+        if self.matrix is None or self.matrix.version == self.manifest.version:
+            return
+        
+        print("Local vector matrix is stale. Rebuilding from Qdrant...")
+        self.matrix.reset()
+        for ids, vectors in self._iter_vector_blocks(self.FULL_VECTOR):
+            self.matrix.upsert([str(pid) for pid in ids], vectors)
+        self.matrix.flush(self.manifest.version)
+    
+    def _checkpoint(self):
+        """Persist the manifest, then the matrix tagged with the same corpus version."""
+        self.manifest.save()
+        if self.matrix is not None:
+            self.matrix.flush(self.manifest.version)
+    
+    def _named_vectors(self, embedding: np.ndarray, chunks: Optional[np.ndarray] = None) -> Dict[str, list]:
         """
-        Load all resumes from folder and store in Qdrant.
+        Split one full embedding into the stored named vectors.
+        
+        In the chunked layout, a point without chunk embeddings (e.g. migrated
+        from a single-vector collection) gets its full embedding as its only chunk.
+        """
+        vectors = {
+            self.PREFIX_VECTOR: embedding[:self.PREFIX_DIM].tolist(),
+            self.FULL_VECTOR: embedding.tolist()
+        }
+        if self.chunked:
+            vectors[self.CHUNK_VECTOR] = (chunks if chunks is not None else embedding[None, :]).tolist()
+        return vectors
+    
+    def _embed_batch(self, texts: List[str]) -> Tuple[np.ndarray, List[Optional[np.ndarray]]]:
+        """
+        Document embeddings for a batch of resumes, plus their chunk embeddings when chunked.
+        
+        All chunks of the batch go through the encoder in one call; a resume's
+        document embedding is then the normalized mean of its chunk embeddings.
+        """
+        embedder = get_matryoshka_embedder()
+        if not self.chunked:
+            return embedder.embed_texts(texts), [None] * len(texts)
+        
+        chunk_lists = [
+            chunk_text(t, settings.store.chunk_words, settings.store.chunk_overlap, settings.store.max_chunks)
+            for t in texts
+        ]
+        flat = np.asarray(embedder.embed_texts([c for chunks in chunk_lists for c in chunks]), dtype=np.float32)
+        bounds = np.cumsum([0] + [len(chunks) for chunks in chunk_lists])
+        chunk_vectors = [flat[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+        embeddings = normalize_rows(np.stack([v.mean(axis=0) for v in chunk_vectors]))
+        return embeddings, chunk_vectors
+    
+    def ingest_resumes(
+        self,
+        resume_folder: str,
+        parse_profiles: bool = False,
+        index_lock: Optional[threading.Lock] = None
+    ) -> IngestSummary:
+        """
+        Sync resumes from a folder into Qdrant.
+        
+        Point IDs are derived from file content hashes. Files whose size and
+        mtime (or content hash) match the manifest are skipped, files no longer
+        in the folder are deleted, and only new or modified resumes are
+        extracted and embedded.
         
         Args:
             resume_folder: Path to folder containing PDF/DOCX resumes
+            parse_profiles: Also LLM-parse each new resume and store its profile
+                (otherwise profiles are stored lazily via save_profile)
+            index_lock: Held only while the index or embedder is in use (per
+                micro-batch), not while files are hashed, extracted or LLM
+                parsed, so readers sharing the lock interleave with a long ingest
             
         Returns:
-            Number of resumes ingested
+            IngestSummary with added/updated/removed/skipped counts
         """
-        from app.loaders.resume_loader import load_resume_from_pdf, load_resume_from_docx_bytes
-        
         folder = Path(resume_folder)
         if not folder.exists():
             raise ValueError(f"Resume folder not found: {resume_folder}")
         
+        guard = index_lock if index_lock is not None else nullcontext()
+        summary = IngestSummary()
+        self._corpus_changed = False
+        
+        try:
+            if not self.manifest.initialized:
+                self._rebuild_manifest(guard)
+            pending = self._sync_folder(folder, summary, guard)
+            if pending is not None:
+                self._ingest_pending(pending, summary, parse_profiles, guard)
+        finally:
+            # One corpus version per ingest, so cascade plans are recalibrated once, not per micro-batch
+            with guard:
+                if self._corpus_changed:
+                    self.manifest.bump_version()
+                self._checkpoint()
+        
+        if pending is not None:
+            print(
+                f"Ingest complete: {summary.added} added, {summary.updated} updated, "
+                f"{summary.removed} removed, {summary.skipped} unchanged"
+            )
+        return summary
+    
+    def _ingest_pending(self, pending: list, summary: IngestSummary, parse_profiles: bool, guard):
+        """Extract, embed and upsert the files _sync_folder found new or modified."""
+        # Extract in parallel; results arrive in completion order
+        by_path = {p[1]: p for p in pending}
+        extracted = extract_resumes_parallel(
+            [p[1] for p in pending],
+            max_workers=settings.ingest.extract_workers,
+            timeout=settings.ingest.extract_timeout
+        )
+        
+        # Embed and upsert in micro-batches; the manifest is saved after each
+        # batch so an interrupted ingest resumes from the last checkpoint
+        cleaned = self._iter_cleaned(extracted, by_path, summary)
+        for batch in _batched(cleaned, settings.ingest.batch_size):
+            try:
+                profiles = self._parse_profiles(batch) if parse_profiles else None
+                with guard:
+                    self._upsert_batch(batch, summary, profiles)
+            except Exception as e:
+                print(f"Error ingesting batch of {len(batch)} resumes: {e}")
+                summary.failed += len(batch)
+    
+    def _sync_folder(self, folder: Path, summary: IngestSummary, guard) -> Optional[list]:
+        """
+        Drop resumes no longer in the folder; return the files that need (re-)embedding (None if none exist).
+        
+        Files are listed, hashed and diffed against the manifest outside the
+        guard; it is held only to apply the deletions and checkpoint.
+        """
         # Find all resume files
         resume_files = list(folder.glob("*.pdf")) + list(folder.glob("*.docx"))
+        current = {str(f.resolve()): f for f in resume_files}
+        removed = [key for key in self.manifest.keys_in_folder(folder) if key not in current]
+        
+        # Decide which files need (re-)embedding
+        pending, touched = [], []
+        for key, filepath in current.items():
+            stat = filepath.stat()
+            entry = self.manifest.get(key)
+            
+            if entry and entry["mtime"] == stat.st_mtime and entry["size"] == stat.st_size:
+                summary.skipped += 1
+                continue
+            
+            content_hash = hash_file(filepath)
+            if entry and entry["content_hash"] == content_hash:
+                # Touched but unchanged: refresh mtime only
+                touched.append((key, content_hash, stat))
+                summary.skipped += 1
+                continue
+            
+            pending.append((key, filepath, content_hash, stat, entry))
+        
+        with guard:
+            for key, content_hash, stat in touched:
+                self.manifest.record(key, content_hash, stat.st_mtime, stat.st_size)
+            
+            # Delete resumes that are no longer in the folder
+            removed_ids = set()
+            for key in removed:
+                entry = self.manifest.remove(key)
+                removed_ids.add(entry["point_id"])
+                summary.removed += 1
+            
+            self._delete_unreferenced(removed_ids)
+            self._checkpoint()
         
         if not resume_files:
-            print(f"No resume files found in {resume_folder}")
-            return 0
+            print(f"No resume files found in {folder}")
+            return None
+        return pending
+    
+    def _rebuild_manifest(self, guard):
+        """
+        Recreate a missing manifest from the stored points' filepath/content_hash payload.
         
-        points = []
-        texts = []
+        Points whose file is gone are deleted. Points written before content-hash
+        IDs (positional IDs, no content_hash, e.g. a migrated legacy collection)
+        are moved to the ID of their file's current content with their stored
+        vectors, so no resume is re-embedded. Files are hashed outside the guard.
+        """
+        with guard:
+            records = list(self._iter_payloads(["filepath", "content_hash"]))
+        if not records:
+            self.manifest.initialized = True
+            return
         
-        for idx, filepath in enumerate(resume_files):
-            try:
-                # Load and clean text
-                if filepath.suffix.lower() == ".pdf":
-                    raw_text = load_resume_from_pdf(filepath)
+        print(f"No ingest manifest found. Rebuilding it from {len(records)} stored resumes...")
+        stale, legacy = [], []
+        for point_id, payload in records:
+            filepath = payload.get("filepath")
+            if not filepath or not Path(filepath).is_file():
+                stale.append(point_id)
+                continue
+            
+            key = str(Path(filepath).resolve())
+            content_hash = payload.get("content_hash")
+            if content_hash and str(point_id) == point_id_from_hash(content_hash):
+                if self.manifest.get(key) is None:
+                    # mtime/size unknown: the next sync re-hashes the file instead of re-embedding it
+                    self.manifest.record(key, content_hash, None, None)
                 else:
-                    with open(filepath, "rb") as f:
-                        raw_text = load_resume_from_docx_bytes(f.read())
-                
-                cleaned_text = clean_text(raw_text)
-                texts.append(cleaned_text)
-                
-                # Store metadata
-                points.append({
-                    "id": idx,
-                    "filename": filepath.name,
-                    "filepath": str(filepath),
-                    "text": cleaned_text[:5000]  # Store truncated for retrieval
-                })
-            except Exception as e:
-                print(f"Error loading {filepath.name}: {e}")
+                    stale.append(point_id)
+            else:
+                legacy.append((point_id, key, Path(filepath)))
+        
+        # Hash legacy files outside the guard
+        rekeyed = []
+        for point_id, key, filepath in legacy:
+            stat = filepath.stat()
+            rekeyed.append((point_id, key, hash_file(filepath), stat))
+        
+        with guard:
+            moves = {}
+            for point_id, key, content_hash, stat in rekeyed:
+                if self.manifest.get(key) is None:
+                    self.manifest.record(key, content_hash, stat.st_mtime, stat.st_size)
+                    moves[point_id] = content_hash
+                else:
+                    stale.append(point_id)
+            
+            self._move_points(moves)
+            if stale:
+                self.client.delete(
+                    collection_name=self.COLLECTION_NAME,
+                    points_selector=PointIdsList(points=stale)
+                )
+                if self.matrix is not None:
+                    self.matrix.delete([str(pid) for pid in stale])
+            
+            if moves or stale:
+                self._corpus_changed = True
+            self.manifest.initialized = True
+            self._checkpoint()
+        
+        print(f"Rebuilt ingest manifest: {len(self.manifest.entries)} files, {len(moves)} re-keyed, {len(stale)} stale points dropped")
+    
+    def _move_points(self, moves: Dict[Union[int, str], str]):
+        """Re-key points to the IDs of the given content hashes, keeping their vectors and payload."""
+        old_ids = list(moves)
+        for start in range(0, len(old_ids), self.MIGRATION_BATCH_SIZE):
+            records = self.client.retrieve(
+                collection_name=self.COLLECTION_NAME,
+                ids=old_ids[start:start + self.MIGRATION_BATCH_SIZE],
+                with_vectors=True,
+                with_payload=True
+            )
+            
+            points, embeddings = [], []
+            for r in records:
+                content_hash = moves[r.id]
+                embedding = np.asarray(r.vector[self.FULL_VECTOR], dtype=np.float32)
+                chunks = r.vector.get(self.CHUNK_VECTOR)
+                points.append(PointStruct(
+                    id=point_id_from_hash(content_hash),
+                    vector=self._named_vectors(
+                        embedding, np.asarray(chunks, dtype=np.float32) if chunks is not None else None
+                    ),
+                    payload={**r.payload, "content_hash": content_hash}
+                ))
+                embeddings.append(embedding)
+            
+            if not points:
+                continue
+            self.client.upsert(collection_name=self.COLLECTION_NAME, points=points)
+            self.client.delete(
+                collection_name=self.COLLECTION_NAME,
+                points_selector=PointIdsList(points=[r.id for r in records])
+            )
+            if self.matrix is not None:
+                self.matrix.delete([str(r.id) for r in records])
+                self.matrix.upsert([p.id for p in points], np.stack(embeddings))
+    
+    def _iter_cleaned(self, extracted, by_path: dict, summary: IngestSummary) -> Iterator[dict]:
+        """Clean extracted texts and attach manifest metadata, one file at a time."""
+        for filepath, raw_text, error in extracted:
+            if error is not None:
+                print(f"Error loading {filepath.name}: {error}")
+                summary.failed += 1
                 continue
+            
+            key, _, content_hash, stat, entry = by_path[filepath]
+            cleaned_text = clean_text(raw_text)
+            
+            yield {
+                "key": key,
+                "content_hash": content_hash,
+                "stat": stat,
+                "previous": entry,
+                "filename": filepath.name,
+                "filepath": str(filepath),
+                "text": cleaned_text
+            }
+    
+    @staticmethod
+    def _parse_profiles(batch: List[dict]) -> List[Union[ParsedResume, Exception]]:
+        """LLM-parse one micro-batch (no index access, so it runs outside the index lock)."""
+        from app.chains.resume_parser_chain import get_resume_parser_chain
         
-        if not texts:
-            return 0
+        # Sync batch: a new event loop per batch would break the shared async HTTP client
+        return get_resume_parser_chain().parse_many([
+            (p["text"], point_id_from_hash(p["content_hash"])) for p in batch
+        ])
+    
+    def _upsert_batch(
+        self,
+        batch: List[dict],
+        summary: IngestSummary,
+        profiles: Optional[List[Union[ParsedResume, Exception]]] = None
+    ):
+        """Embed one micro-batch, upsert it (with parsed profiles, if any) and checkpoint the manifest."""
+        embeddings, chunk_vectors = self._embed_batch([p["text"] for p in batch])
         
-        # Batch embed all texts
-        embeddings = matryoshka_embedder.embed_texts(texts)
+        payloads = [
+            {
+                "filename": p["filename"],
+                "filepath": p["filepath"],
+                "content_hash": p["content_hash"],
+                "text": p["text"]
+            }
+            for p in batch
+        ]
+        
+        if profiles is not None:
+            for payload, result in zip(payloads, profiles):
+                if isinstance(result, Exception):
+                    print(f"Error parsing {payload['filename']}: {result}")
+                else:
+                    payload.update(self._profile_payload(result))
         
         # Create Qdrant points
         qdrant_points = [
             PointStruct(
-                id=p["id"],
-                vector=embeddings[i].tolist(),
-                payload={
-                    "filename": p["filename"],
-                    "filepath": p["filepath"],
-                    "text": p["text"]
-                }
-            )
-            for i, p in enumerate(points)
+                id=point_id_from_hash(p["content_hash"]),
+                vector=self._named_vectors(embeddings[i], chunk_vectors[i]),
+                payload=payloads[i]
+            )
+            for i, p in enumerate(batch)
         ]
         
         # Upsert to Qdrant
@@ -128,91 +625,409 @@ class QdrantResumeStore:
             points=qdrant_points
         )
         
-        print(f"Ingested {len(qdrant_points)} resumes into Qdrant")
-        return len(qdrant_points)
+        if self.matrix is not None:
+            self.matrix.upsert([p.id for p in qdrant_points], embeddings)
+        self._corpus_changed = True
+        
+        stale_ids = set()
+        for p in batch:
+            self.manifest.record(p["key"], p["content_hash"], p["stat"].st_mtime, p["stat"].st_size)
+            if p["previous"]:
+                stale_ids.add(p["previous"]["point_id"])
+                summary.updated += 1
+            else:
+                summary.added += 1
+        
+        self._delete_unreferenced(stale_ids)
+        self._checkpoint()
+    
+    def _delete_unreferenced(self, point_ids: set):
+        """Delete points that no tracked file maps to anymore."""
+        orphaned = [pid for pid in point_ids if not self.manifest.is_referenced(pid)]
+        if orphaned:
+            self.client.delete(
+                collection_name=self.COLLECTION_NAME,
+                points_selector=PointIdsList(points=orphaned)
+            )
+            if self.matrix is not None:
+                self.matrix.delete(orphaned)
+            self._corpus_changed = True
+    
+    def count(self) -> int:
+        """Number of resumes stored in the collection."""
+        return self.client.get_collection(self.COLLECTION_NAME).points_count
+    
+    def _use_local(self, backend: Optional[str]) -> bool:
+        """Resolve the search backend ("qdrant" or "local")."""
+        backend = backend or settings.store.search_backend
+        if backend not in ("qdrant", "local"):
+            raise ValueError(f"Unknown search backend: {backend}")
+        return backend == "local" and self.matrix is not None
+    
+    def plan_search(
+        self,
+        top_k_final: int = 4,
+        top_k_stage1: Optional[int] = None,
+        backend: Optional[str] = None
+    ) -> CascadePlan:
+        """
+        Cascade plan a search would use.
+        
+        An explicit top_k_stage1 gives the fixed 256-dim two-stage cascade.
+        Otherwise the planner picks prefix sizes and widths from the corpus
+        size and STORE_RECALL_TARGET. Qdrant only stores the 256-dim prefix,
+        so plans for the qdrant backend use that prefix alone.
+        
+        Widths are calibrated by brute force on the local matrix, so the
+        recall target holds for the local backend. For the qdrant backend it
+        is an estimate: a Qdrant server prefetches with approximate HNSW
+        search, and in the chunked layout stage 2 ranks by MAX_SIM over
+        chunks while the matrix holds mean vectors.
+        """
+        use_local = self._use_local(backend)
+        corpus_size = len(self.matrix) if use_local else self.count()
+        
+        if top_k_stage1 is not None:
+            stages = [CascadeStage(dim=self.PREFIX_DIM, width=max(top_k_stage1, top_k_final))]
+            if use_local and settings.store.binary_shortlist > 0:
+                stages.insert(0, CascadeStage(kind="binary", dim=self.VECTOR_DIM, width=settings.store.binary_shortlist))
+            return CascadePlan(
+                corpus_size=corpus_size,
+                corpus_version=self.manifest.version,
+                top_k=top_k_final,
+                stages=stages,
+                estimated_cost=plan_cost(stages, corpus_size, self.VECTOR_DIM),
+                exact_cost=corpus_size * self.VECTOR_DIM
+            )
+        
+        if self.planner is None or len(self.matrix) == 0:
+            return heuristic_plan(
+                corpus_size, top_k_final, self.PREFIX_DIM, self.VECTOR_DIM, self.manifest.version
+            )
+        
+        if use_local:
+            return self.planner.plan(top_k_final)
+        return self.planner.plan(top_k_final, prefix_dims=(self.PREFIX_DIM,), allow_binary=False)
     
     def search_resumes(
         self, 
         jd_text: str, 
-        top_k_stage1: int = 7,
-        top_k_final: int = 4
+        top_k_stage1: Optional[int] = None,
+        top_k_final: int = 4,
+        parsed_jd: Optional[ParsedJD] = None,
+        experience_tolerance: float = 2.0,
+        backend: Optional[str] = None
     ) -> List[Tuple[str, str, float]]:
         """
-        Two-stage matryoshka search:
-        Stage 1: 256-dim slice search (fast) -> top_k_stage1
-        Stage 2: Full 768-dim search on stage1 results -> top_k_final
+        Two-stage matryoshka search, executed inside Qdrant:
+        Stage 1: HNSW prefetch on the 256-dim prefix vector -> top_k_stage1
+        Stage 2: Rescore prefetched points on the full 768-dim vector -> top_k_final
+                 (chunked layout: on each resume's best-matching chunk, MAX_SIM)
+        
+        Only the final top_k_final payloads are returned to the client.
+        
+        If parsed_jd is given, resumes with a stored profile are prefiltered on
+        its hard constraints before vector search (see profile_filter).
+        
+        With backend="local" (default: STORE_SEARCH_BACKEND) the same cascade
+        runs by brute force over the memory-mapped vector matrix. Profile
+        prefilters need payloads, so filtered searches always use Qdrant.
+        
+        top_k_stage1=None lets the cascade planner choose the stages (see
+        plan_search); use search_resumes_with_plan to see the chosen plan.
         """
-        collection_info = self.client.get_collection(self.COLLECTION_NAME)
-        total_points = collection_info.points_count
+        results, _ = self.search_resumes_with_plan(
+            jd_text, top_k_stage1, top_k_final, parsed_jd, experience_tolerance, backend
+        )
+        return results
+    
+    def search_resumes_with_plan(
+        self, 
+        jd_text: str, 
+        top_k_stage1: Optional[int] = None,
+        top_k_final: int = 4,
+        parsed_jd: Optional[ParsedJD] = None,
+        experience_tolerance: float = 2.0,
+        backend: Optional[str] = None
+    ) -> Tuple[List[Tuple[str, str, float]], CascadePlan]:
+        """search_resumes, also returning the cascade plan that was executed."""
+        query_filter = self.profile_filter(parsed_jd, experience_tolerance) if parsed_jd else None
         
-        if total_points == 0:
-            return []
+        if query_filter is None and self._use_local(backend):
+            results, plan = self.search_resumes_batch_with_plan(
+                [jd_text], top_k_stage1, top_k_final, backend="local"
+            )
+            return results[0], plan
+        
+        plan = self.plan_search(top_k_final, top_k_stage1, backend="qdrant")
+        if plan.corpus_size == 0:
+            return [], plan
         
         # Embed JD once
-        jd_embedding = matryoshka_embedder.embed_text(jd_text)
+        jd_embedding = get_matryoshka_embedder().embed_text(jd_text)
+        self.query_sample.add(jd_embedding)
+        
+        # Exact plans (small corpora) skip the prefix stage. Embedded Qdrant always
+        # scans exactly and warns that search params have no effect, so only a
+        # server is asked for an exact (non-HNSW) search.
+        prefetch = None
+        search_params = SearchParams(exact=True) if self.persist_path is None else None
+        if not plan.is_exact:
+            prefetch = Prefetch(
+                query=jd_embedding[:self.PREFIX_DIM].tolist(),
+                using=self.PREFIX_VECTOR,
+                filter=query_filter,
+                limit=plan.stages[0].width
+            )
+            search_params = None
+        
+        # Chunked layout: a resume scores as its best-matching chunk (MAX_SIM)
+        query, using = jd_embedding.tolist(), self.FULL_VECTOR
+        if self.chunked:
+            query, using = [query], self.CHUNK_VECTOR
         
-        # Fetch ALL vectors from Qdrant (batch retrieve for speed)
-        all_records = self.client.scroll(
+        response = self.client.query_points(
             collection_name=self.COLLECTION_NAME,
-            limit=total_points,
-            with_vectors=True,
-            with_payload=True
-        )[0]
-        
-        if not all_records:
-            return []
-        
-        # Extract vectors and payloads
-        ids = [r.id for r in all_records]
-        vectors = np.array([r.vector for r in all_records])
-        payloads = [r.payload for r in all_records]
-        
-        # If few resumes, skip two-stage
-        if total_points <= top_k_final:
-            similarities = np.dot(vectors, jd_embedding)
-            top_indices = np.argsort(similarities)[::-1]
-            return [
-                (payloads[i]["filename"], payloads[i]["text"], float(similarities[i]))
-                for i in top_indices
-            ]
+            prefetch=prefetch,
+            query=query,
+            using=using,
+            query_filter=query_filter,
+            search_params=search_params,
+            limit=top_k_final,
+            with_payload=["filename", "text"],
+            with_vectors=False
+        )
+        
+        results = [
+            (p.payload["filename"], p.payload["text"], float(p.score))
+            for p in response.points
+        ]
+        return results, plan
+    
+    def search_resumes_batch(
+        self,
+        jd_texts: List[str],
+        top_k_stage1: Optional[int] = None,
+        top_k_final: int = 4,
+        backend: Optional[str] = None
+    ) -> List[List[Tuple[str, str, float]]]:
+        """
+        Two-stage matryoshka search for many JDs in one matrix pass.
+        
+        All JDs are embedded in one batch. Stage 1 streams the stored 256-dim
+        prefix vectors in blocks and keeps a running per-JD top_k_stage1 via
+        argpartition; stage 2 fetches full vectors only for the union of
+        stage-1 candidates and rescores every JD at once.
+        
+        With backend="local" the blocks are zero-copy views of the
+        memory-mapped vector matrix instead of Qdrant scroll pages, and the
+        planned cascade may add a Hamming stage and other prefix sizes.
+        
+        Returns:
+            One (filename, text, score) shortlist per JD, in input order
+        """
+        results, _ = self.search_resumes_batch_with_plan(jd_texts, top_k_stage1, top_k_final, backend)
+        return results
+    
+    def search_resumes_batch_with_plan(
+        self,
+        jd_texts: List[str],
+        top_k_stage1: Optional[int] = None,
+        top_k_final: int = 4,
+        backend: Optional[str] = None
+    ) -> Tuple[List[List[Tuple[str, str, float]]], CascadePlan]:
+        """search_resumes_batch, also returning the cascade plan that was executed."""
+        use_local = self._use_local(backend)
+        plan = self.plan_search(top_k_final, top_k_stage1, backend="local" if use_local else "qdrant")
         
-        # ==========================================
-        # STAGE 1: 256-dim slice search (FAST)
-        # ==========================================
-        jd_256 = jd_embedding[:256]
-        jd_256 = jd_256 / np.linalg.norm(jd_256)
+        if not jd_texts or plan.corpus_size == 0:
+            return [[] for _ in jd_texts], plan
         
-        vectors_256 = vectors[:, :256]
-        vectors_256 = vectors_256 / np.linalg.norm(vectors_256, axis=1, keepdims=True)
+        jd_embeddings = get_matryoshka_embedder().embed_texts(jd_texts)
+        self.query_sample.add(jd_embeddings)
         
-        similarities_256 = np.dot(vectors_256, jd_256)
-        top_7_indices = np.argsort(similarities_256)[::-1][:top_k_stage1]
+        if use_local:
+            final_ids, final_scores = self.matrix.cascade(jd_embeddings, plan.stages, top_k_final)
+        else:
+            width = plan.stages[0].width if plan.stages else plan.corpus_size
+            final_ids, final_scores = self._search_scroll(jd_embeddings, width, top_k_final)
         
-        # ==========================================
-        # STAGE 2: Full 768-dim search on top 7
-        # ==========================================
-        jd_full = jd_embedding / np.linalg.norm(jd_embedding)
+        return self._load_shortlists(final_ids, final_scores), plan
+    
+    def _search_scroll(
+        self,
+        jd_embeddings: np.ndarray,
+        top_k_stage1: int,
+        top_k_final: int
+    ) -> Tuple[List[List[str]], np.ndarray]:
+        """Blocked cascade over vectors streamed from Qdrant; returns (point IDs, scores) per JD."""
+        all_ids = []
+        
+        jd_prefix = normalize_rows(jd_embeddings[:, :self.PREFIX_DIM])
+        jd_full = normalize_rows(jd_embeddings)
+        
+        # Stage 1: blocked J x N pass over the prefix vectors
+        stage1 = BlockedTopK(len(jd_embeddings), max(top_k_stage1, top_k_final))
+        for ids, prefix_vectors in self._iter_vector_blocks(self.PREFIX_VECTOR):
+            positions = np.arange(len(all_ids), len(all_ids) + len(ids))
+            all_ids.extend(ids)
+            stage1.update(jd_prefix @ normalize_rows(prefix_vectors).T, positions)
+        
+        candidate_pos, _ = stage1.result()
+        
+        # Stage 2: full-dim rescoring on the union of candidates
+        union = np.unique(candidate_pos)
+        records = self.client.retrieve(
+            collection_name=self.COLLECTION_NAME,
+            ids=[all_ids[i] for i in union],
+            with_vectors=[self.FULL_VECTOR],
+            with_payload=False
+        )
+        vector_by_id = {r.id: r.vector[self.FULL_VECTOR] for r in records}
+        full_vectors = normalize_rows(np.array([vector_by_id[all_ids[i]] for i in union]))
+        
+        row_of_id = np.full(len(all_ids), -1, dtype=np.int64)
+        row_of_id[union] = np.arange(len(union))
+        
+        full_scores = rescore_candidates(jd_full, candidate_pos, full_vectors, row_of_id)
+        best = top_k_indices(full_scores, top_k_final)
+        final_pos = np.take_along_axis(candidate_pos, best, axis=1)
+        final_scores = np.take_along_axis(full_scores, best, axis=1)
+        
+        return [[all_ids[i] for i in row] for row in final_pos], final_scores
+    
+    def _load_shortlists(
+        self,
+        final_ids: List[List[str]],
+        final_scores: np.ndarray
+    ) -> List[List[Tuple[str, str, float]]]:
+        """Load payloads only for the final shortlists."""
+        unique_ids = list({pid for row in final_ids for pid in row})
+        payloads = {
+            str(r.id): r.payload
+            for r in self.client.retrieve(
+                collection_name=self.COLLECTION_NAME,
+                ids=unique_ids,
+                with_payload=["filename", "text"],
+                with_vectors=False
+            )
+        }
         
-        stage2_candidates = []
-        for idx in top_7_indices:
-            full_vec = vectors[idx]
-            full_vec_norm = full_vec / np.linalg.norm(full_vec)
+        return [
+            [
+                (payloads[str(pid)]["filename"], payloads[str(pid)]["text"], float(score))
+                for pid, score in zip(row_ids, row_scores)
+            ]
+            for row_ids, row_scores in zip(final_ids, final_scores)
+        ]
+    
+    def _iter_vector_blocks(self, vector_name: str) -> Iterator[Tuple[list, np.ndarray]]:
+        """Stream (point IDs, vectors) blocks of one named vector."""
+        offset = None
+        while True:
+            records, offset = self.client.scroll(
+                collection_name=self.COLLECTION_NAME,
+                limit=self.SCAN_BLOCK_SIZE,
+                offset=offset,
+                with_vectors=[vector_name],
+                with_payload=False
+            )
             
-            similarity_full = float(np.dot(full_vec_norm, jd_full))
+            if records:
+                yield (
+                    [r.id for r in records],
+                    np.array([r.vector[vector_name] for r in records], dtype=np.float32)
+                )
             
-            stage2_candidates.append({
-                "idx": idx,
-                "filename": payloads[idx]["filename"],
-                "text": payloads[idx]["text"],
-                "score_256": float(similarities_256[idx]),
-                "score_full": similarity_full
-            })
+            if offset is None:
+                break
+    
+    def _iter_payloads(self, fields: List[str]) -> Iterator[Tuple[Union[int, str], dict]]:
+        """Stream (point ID, payload) pairs with only the given payload fields."""
+        offset = None
+        while True:
+            records, offset = self.client.scroll(
+                collection_name=self.COLLECTION_NAME,
+                limit=self.SCAN_BLOCK_SIZE,
+                offset=offset,
+                with_vectors=False,
+                with_payload=fields
+            )
+            
+            for r in records:
+                yield r.id, r.payload or {}
+            
+            if offset is None:
+                break
+    
+    @staticmethod
+    def profile_filter(parsed_jd: ParsedJD, experience_tolerance: float = 2.0) -> Optional[Filter]:
+        """
+        Hard-constraint filter derived from a parsed JD.
         
-        # Sort by full-dim score and take top_k_final
-        stage2_candidates.sort(key=lambda x: x["score_full"], reverse=True)
-        top_4 = stage2_candidates[:top_k_final]
+        Resumes with a stored profile must have at least
+        min_experience_years - experience_tolerance years and share at least one
+        must-have skill. Resumes without a profile yet always pass.
+        """
+        conditions = []
+        
+        min_years = parsed_jd.min_experience_years - experience_tolerance
+        if min_years > 0:
+            conditions.append(FieldCondition(key="experience_years", range=Range(gte=min_years)))
+        
+        ontology = get_skill_ontology()
+        must_have = sorted({ontology.canonical(s) for s in parsed_jd.must_have_skills})
+        if must_have:
+            conditions.append(FieldCondition(key="skills", match=MatchAny(any=must_have)))
+        
+        if not conditions:
+            return None
         
-        return [(c["filename"], c["text"], c["score_full"]) for c in top_4]
+        return Filter(should=[
+            Filter(must=conditions),
+            IsEmptyCondition(is_empty=PayloadField(key="experience_years"))
+        ])
+    
+    @staticmethod
+    def _profile_payload(parsed: ParsedResume) -> dict:
+        """Payload fields for a parsed profile (indexed fields + full profile)."""
+        ontology = get_skill_ontology()
+        return {
+            "skills": sorted({ontology.canonical(s) for s in parsed.skills}),
+            "experience_years": float(parsed.experience_years),
+            "profile": parsed.model_dump(exclude={"candidate_id", "raw_text"})
+        }
+    
+    def save_profile(self, filename: str, parsed: ParsedResume):
+        """Store a parsed profile on the resume's point."""
+        self.client.set_payload(
+            collection_name=self.COLLECTION_NAME,
+            payload=self._profile_payload(parsed),
+            points=Filter(
+                must=[FieldCondition(key="filename", match=MatchValue(value=filename))]
+            )
+        )
+    
+    def get_profile(self, filename: str, candidate_id: str) -> Optional[ParsedResume]:
+        """Stored parsed profile for a resume, or None if it was never parsed."""
+        results = self.client.scroll(
+            collection_name=self.COLLECTION_NAME,
+            scroll_filter=Filter(
+                must=[FieldCondition(key="filename", match=MatchValue(value=filename))]
+            ),
+            limit=1,
+            with_payload=["profile", "text"]
+        )
+        
+        if not results[0] or "profile" not in results[0][0].payload:
+            return None
+        
+        payload = results[0][0].payload
+        return ParsedResume(
+            candidate_id=candidate_id,
+            raw_text=payload.get("text", ""),
+            **payload["profile"]
+        )
     
     def get_resume_text(self, filename: str) -> Optional[str]:
         """Get full resume text by filename."""
@@ -233,8 +1048,22 @@ class QdrantResumeStore:
         """Clear all resumes from the store."""
         self.client.delete_collection(self.COLLECTION_NAME)
         self._ensure_collection()
+        self.manifest.clear()
+        self.manifest.bump_version()
+        if self.matrix is not None:
+            self.matrix.reset()
+        self._checkpoint()
         print("Cleared all resumes from Qdrant")
 
 
-# Default store instance (disk persistent)
-resume_store = QdrantResumeStore(persist_path="./qdrant_data")
+# Default store instance (disk persistent), opened on first use
+_default_store = LazySingleton(lambda: QdrantResumeStore(persist_path="./qdrant_data"))
+
+
+def get_resume_store() -> QdrantResumeStore:
+    """Shared disk-persistent store (the Qdrant client is opened on the first call)."""
+    return _default_store.get()
+
+
+# Backward-compatible name; building is deferred until first attribute access
+resume_store = LazyProxy(get_resume_store)
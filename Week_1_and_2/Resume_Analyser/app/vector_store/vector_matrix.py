@@ -0,0 +1,372 @@
+"""
+Resume Vector Matrix - memory-mapped copy of stored embeddings for local search.
+
+Keeps every resume's full embedding in one contiguous memory-mapped file
+(float16, or int8 with per-vector scales) next to the Qdrant data. Stage-1
+scans read zero-copy views of the first prefix columns block by block, so a
+query never converts Qdrant records to Python objects or touches payloads.
+
+A packed sign-bit code per row (see binary_index) is kept alongside the
+vectors for an optional Hamming stage-0 shortlist on very large corpora.
+
+The matrix records the corpus version it was built from; the store rebuilds
+it whenever that version disagrees with the ingest manifest.
+"""
+import json
+import os
+import threading
+from pathlib import Path
+from typing import List, Tuple, Union
+
+import numpy as np
+
+from app.schemas.search_schema import CascadeStage
+from app.vector_store.binary_index import code_bytes, hamming_distances, hamming_shortlist, pack_signs
+from app.vector_store.matrix_search import (
+    BlockedTopK, normalize_rows, rescore_candidates, top_k_indices
+)
+
+
+class ResumeVectorMatrix:
+    """Memory-mapped N x D embedding matrix keyed by Qdrant point ID."""
+
+    DTYPES = {"float16": np.float16, "int8": np.int8}
+    MIN_CAPACITY = 1024
+    GROWTH_FACTOR = 1.5
+    SCAN_BLOCK_SIZE = 8192
+    RANK_TOLERANCE = 1e-6  # Float noise allowed when ranking a row against itself
+
+    LAYOUT = 2  # Bump when the on-disk file set changes (forces a rebuild)
+    META_FILENAME = "meta.json"
+    SCALES_FILENAME = "scales.f32"
+    CODES_FILENAME = "codes.u8"
+
+    def __init__(self, path: Union[str, Path], dim: int = 768, dtype: str = "float16"):
+        """
+        Open (or create) the matrix files.
+
+        Args:
+            path: Directory holding the matrix files
+            dim: Embedding dimension
+            dtype: "float16" or "int8" (int8 stores a float32 scale per vector)
+        """
+        if dtype not in self.DTYPES:
+            raise ValueError(f"Unsupported matrix dtype: {dtype}")
+
+        self.path = Path(path)
+        self.dim = dim
+        self.dtype = dtype
+        self._lock = threading.RLock()
+
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._load()
+
+    @property
+    def _vectors_file(self) -> Path:
+        return self.path / f"vectors.{self.dtype}"
+
+    @property
+    def quantized(self) -> bool:
+        return self.dtype == "int8"
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _load(self):
+        meta = None
+        meta_path = self.path / self.META_FILENAME
+        if meta_path.exists():
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            if (meta.get("layout") != self.LAYOUT or meta.get("dtype") != self.dtype
+                    or meta.get("dim") != self.dim):
+                meta = None
+
+        self.version: int = meta["version"] if meta else -1
+        self.ids: List[str] = meta["ids"] if meta else []
+        self._row_of = {pid: i for i, pid in enumerate(self.ids)}
+        self._open(max(len(self.ids), self.MIN_CAPACITY))
+
+    def _map(self, file_path: Path, dtype, shape: tuple) -> np.memmap:
+        """Memory-map a file, growing it to fit `shape` if needed."""
+        size = int(np.prod(shape)) * np.dtype(dtype).itemsize
+        if not file_path.exists() or file_path.stat().st_size < size:
+            with open(file_path, "ab") as f:
+                f.truncate(size)
+        return np.memmap(file_path, dtype=dtype, mode="r+", shape=shape)
+
+    def _open(self, capacity: int):
+        self.capacity = capacity
+        self._vectors = self._map(self._vectors_file, self.DTYPES[self.dtype], (capacity, self.dim))
+        self._scales = (
+            self._map(self.path / self.SCALES_FILENAME, np.float32, (capacity,))
+            if self.quantized else None
+        )
+        self._codes = self._map(self.path / self.CODES_FILENAME, np.uint8, (capacity, code_bytes(self.dim)))
+
+    def _flush_maps(self):
+        self._vectors.flush()
+        self._codes.flush()
+        if self._scales is not None:
+            self._scales.flush()
+
+    def _reserve(self, rows: int):
+        if rows <= self.capacity:
+            return
+        self._flush_maps()
+        capacity = max(rows, int(self.capacity * self.GROWTH_FACTOR))
+        self._open(capacity)
+
+    def _write_rows(self, rows: np.ndarray, vectors: np.ndarray):
+        self._codes[rows] = pack_signs(vectors)
+        if self.quantized:
+            scales = np.abs(vectors).max(axis=1) / 127.0
+            scales[scales == 0] = 1.0
+            self._vectors[rows] = np.clip(np.round(vectors / scales[:, None]), -127, 127).astype(np.int8)
+            self._scales[rows] = scales
+        else:
+            self._vectors[rows] = vectors.astype(np.float16)
+
+    def vectors(self, rows: np.ndarray) -> np.ndarray:
+        """Dequantized float32 vectors for the given rows."""
+        out = np.asarray(self._vectors[rows], dtype=np.float32)
+        if self.quantized:
+            out *= self._scales[rows][:, None]
+        return out
+
+    def upsert(self, ids: List[str], vectors: np.ndarray):
+        """Insert or overwrite vectors by point ID."""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        with self._lock:
+            rows = []
+            for pid in ids:
+                row = self._row_of.get(pid)
+                if row is None:
+                    row = len(self.ids)
+                    self.ids.append(pid)
+                    self._row_of[pid] = row
+                rows.append(row)
+
+            self._reserve(len(self.ids))
+            self._write_rows(np.array(rows, dtype=np.int64), vectors)
+
+    def delete(self, ids: List[str]):
+        """Remove vectors by point ID (the last row is moved into the hole)."""
+        with self._lock:
+            for pid in ids:
+                row = self._row_of.pop(pid, None)
+                if row is None:
+                    continue
+
+                last = len(self.ids) - 1
+                if row != last:
+                    moved = self.ids[last]
+                    self._vectors[row] = self._vectors[last]
+                    self._codes[row] = self._codes[last]
+                    if self.quantized:
+                        self._scales[row] = self._scales[last]
+                    self.ids[row] = moved
+                    self._row_of[moved] = row
+                self.ids.pop()
+
+    def reset(self):
+        """Drop all vectors (files are kept and overwritten)."""
+        with self._lock:
+            self.ids = []
+            self._row_of = {}
+
+    def flush(self, version: int):
+        """Persist vectors and metadata, tagging them with the corpus version."""
+        with self._lock:
+            self._flush_maps()
+
+            self.version = version
+            meta_path = self.path / self.META_FILENAME
+            tmp_path = meta_path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({
+                    "layout": self.LAYOUT,
+                    "version": version,
+                    "dtype": self.dtype,
+                    "dim": self.dim,
+                    "ids": self.ids
+                }, f)
+            os.replace(tmp_path, meta_path)
+
+    def search(
+        self,
+        queries: np.ndarray,
+        top_k_stage1: int = 7,
+        top_k_final: int = 4,
+        prefix_dim: int = 256,
+        binary_shortlist: int = 0
+    ) -> Tuple[List[List[str]], np.ndarray]:
+        """
+        Two-stage matryoshka cascade over the matrix for J queries.
+
+        Stage 1 scans zero-copy views of the first `prefix_dim` columns in
+        blocks; stage 2 rescores the union of stage-1 candidates on all
+        columns. Per-vector int8 scales cancel out under cosine similarity,
+        so both stages work on the raw stored values.
+
+        Args:
+            queries: J x D query embeddings
+            top_k_stage1: Candidates kept per query after stage 1
+            top_k_final: Results kept per query after stage 2
+            prefix_dim: Matryoshka prefix used in stage 1
+            binary_shortlist: If > 0 and smaller than the corpus, first
+                shortlist this many rows per query by Hamming distance of the
+                sign-bit codes and run stage 1 on that shortlist only
+
+        Returns:
+            (ids, scores): per-query point IDs and J x k full-dim scores
+        """
+        stages = [CascadeStage(dim=prefix_dim, width=max(top_k_stage1, top_k_final))]
+        if binary_shortlist > 0:
+            stages.insert(0, CascadeStage(kind="binary", dim=self.dim, width=binary_shortlist))
+        return self.cascade(queries, stages, top_k_final)
+
+    def cascade(
+        self,
+        queries: np.ndarray,
+        stages: List[CascadeStage],
+        top_k_final: int
+    ) -> Tuple[List[List[str]], np.ndarray]:
+        """
+        Run a multi-stage cascade (see CascadePlan) and rescore on all columns.
+
+        The first stage scans every row (Hamming scan for a binary stage,
+        blocked prefix matmul otherwise); each later stage rescores only the
+        previous stage's candidates. Stages that would keep the whole corpus
+        are skipped; no stages means exact full-dim search.
+
+        Returns:
+            (ids, scores): per-query point IDs and J x k full-dim scores
+        """
+        with self._lock:
+            rows, scores = self.cascade_rows(queries, stages, top_k_final)
+            return [[self.ids[r] for r in row] for row in rows], scores
+
+    def cascade_rows(
+        self,
+        queries: np.ndarray,
+        stages: List[CascadeStage],
+        top_k_final: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Like cascade, but returns matrix rows instead of point IDs."""
+        queries = np.atleast_2d(queries)
+        with self._lock:
+            return self._cascade_rows(queries, stages, top_k_final)
+
+    def _cascade_rows(
+        self,
+        queries: np.ndarray,
+        stages: List[CascadeStage],
+        top_k_final: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        n = len(self.ids)
+        if n == 0:
+            empty = np.zeros((len(queries), 0))
+            return empty.astype(np.int64), empty.astype(np.float32)
+
+        candidates = None
+        for stage in stages:
+            width = max(stage.width, top_k_final)
+            if width >= (n if candidates is None else candidates.shape[1]):
+                continue
+
+            if stage.kind == "binary":
+                if candidates is None:
+                    candidates = hamming_shortlist(pack_signs(queries), self._codes[:n], width)
+                continue
+
+            q = normalize_rows(queries[:, :stage.dim])
+            if candidates is None:
+                candidates, _ = self._scan(q, stage.dim, width)
+            else:
+                candidates, _ = self.rescore(q, candidates, width, stage.dim)
+
+        q_full = normalize_rows(queries)
+        if candidates is None:
+            return self._scan(q_full, self.dim, top_k_final)
+        return self.rescore(q_full, candidates, top_k_final, self.dim)
+
+    def _scan(self, queries: np.ndarray, dim: int, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Blocked top-k over every row, comparing the first `dim` columns."""
+        n = len(self.ids)
+        top = BlockedTopK(len(queries), k)
+        for start in range(0, n, self.SCAN_BLOCK_SIZE):
+            end = min(n, start + self.SCAN_BLOCK_SIZE)
+            block = self._vectors[start:end, :dim]
+            top.update(queries @ normalize_rows(block).T, np.arange(start, end))
+        return top.result()
+
+    def stage_ranks(self, queries: np.ndarray, target_rows: np.ndarray, stage: CascadeStage) -> np.ndarray:
+        """
+        Rank of each target row among all rows under one stage's similarity.
+
+        Used for calibration: a stage of width w keeps a target iff its rank
+        is below w. Ties count against the target (pessimistic).
+
+        Args:
+            queries: J x D query embeddings
+            target_rows: J x k rows per query (e.g. exact top-k)
+            stage: Stage whose similarity is measured
+
+        Returns:
+            J x k zero-based ranks
+        """
+        queries = np.atleast_2d(queries)
+        with self._lock:
+            n = len(self.ids)
+            ranks = np.zeros(target_rows.shape, dtype=np.int64)
+
+            if stage.kind == "binary":
+                q_codes = pack_signs(queries)
+                target = np.stack([
+                    hamming_distances(q_codes[j:j + 1], self._codes[target_rows[j]])[0]
+                    for j in range(len(queries))
+                ])
+                for start in range(0, n, self.SCAN_BLOCK_SIZE):
+                    end = min(n, start + self.SCAN_BLOCK_SIZE)
+                    block = hamming_distances(q_codes, self._codes[start:end])
+                    ranks += (block[:, :, None] <= target[:, None, :]).sum(axis=1)
+                return ranks - 1  # the target itself always ties
+
+            q = normalize_rows(queries[:, :stage.dim])
+            target = np.einsum(
+                "jd,jkd->jk", q, normalize_rows(
+                    self._vectors[target_rows.ravel(), :stage.dim]
+                ).reshape(*target_rows.shape, stage.dim)
+            )
+            for start in range(0, n, self.SCAN_BLOCK_SIZE):
+                end = min(n, start + self.SCAN_BLOCK_SIZE)
+                block = q @ normalize_rows(self._vectors[start:end, :stage.dim]).T
+                ranks += (block[:, :, None] > target[:, None, :] + self.RANK_TOLERANCE).sum(axis=1)
+            return ranks
+
+    def rescore(
+        self,
+        queries: np.ndarray,
+        candidates: np.ndarray,
+        k: int,
+        dim: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Keep each query's best k candidate rows, scored on the first `dim` columns.
+
+        Args:
+            queries: J x dim normalized query vectors
+            candidates: J x C matrix rows per query
+
+        Returns:
+            (rows, scores), each J x k, best first
+        """
+        with self._lock:
+            union = np.unique(candidates)
+            row_of = np.full(len(self.ids), -1, dtype=np.int64)
+            row_of[union] = np.arange(len(union))
+            vectors = normalize_rows(self._vectors[union, :dim])
+            scores = rescore_candidates(queries, candidates, vectors, row_of)
+            best = top_k_indices(scores, k)
+            return np.take_along_axis(candidates, best, axis=1), np.take_along_axis(scores, best, axis=1)
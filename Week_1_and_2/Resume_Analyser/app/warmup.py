@@ -0,0 +1,60 @@
+"""
+Warmup - build the shared model, store and LLM clients ahead of the first request.
+
+Everything expensive is constructed lazily on first use, so a short-lived
+script only pays for what it touches. A long-running service should call
+warmup() once at startup instead, so the first request does not absorb the
+model load.
+"""
+import time
+from typing import Dict
+
+
+def warmup(embedder: bool = True, store: bool = True, chains: bool = True) -> Dict[str, float]:
+    """
+    Construct the shared instances now.
+
+    Args:
+        embedder: Load the embedding model (and the cross-encoder, if enabled) and run one forward pass
+        store: Open the default Qdrant store (and sync its vector matrix)
+        chains: Build the LLM chains and their clients
+
+    Returns:
+        Seconds spent per component
+    """
+    timings = {}
+
+    def timed(name: str, build):
+        start = time.perf_counter()
+        build()
+        timings[name] = time.perf_counter() - start
+        print(f"  warmed up {name} in {timings[name]:.2f}s")
+
+    if embedder:
+        from app.embeddings import get_matryoshka_embedder
+        from app.scoring import get_skill_ontology
+
+        # The first forward pass allocates, so run one outside the request path
+        timed("embedder", lambda: get_matryoshka_embedder().engine.encode(["warmup"]))
+        timed("skill_ontology", get_skill_ontology)
+
+        from app.config import settings
+        if settings.cross_encoder.enabled:
+            from app.scoring import get_cross_encoder
+            timed("cross_encoder", lambda: get_cross_encoder().score("warmup", ["warmup"]))
+
+    if store:
+        from app.vector_store import get_resume_store
+        timed("resume_store", get_resume_store)
+
+    if chains:
+        from app.chains import (
+            get_jd_parser_chain, get_llm_evaluator_chain,
+            get_reranker_chain, get_resume_parser_chain
+        )
+        timed("jd_parser_chain", get_jd_parser_chain)
+        timed("resume_parser_chain", get_resume_parser_chain)
+        timed("llm_evaluator_chain", get_llm_evaluator_chain)
+        timed("reranker_chain", get_reranker_chain)
+
+    return timings
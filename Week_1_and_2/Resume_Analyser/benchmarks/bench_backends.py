@@ -0,0 +1,74 @@
+"""
+Embedding backends: parity and latency/throughput of torch vs ONNX vs int8 ONNX.
+
+Loads each backend (exporting ONNX on first use), checks cosine agreement
+with the fp32 PyTorch model on the benchmark texts, then reports single-text
+latency and batch throughput.
+
+Usage:
+    python benchmarks/bench_backends.py --synthetic 256
+    python benchmarks/bench_backends.py --resume-folder ./resumes --backends torch onnx-int8
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from dotenv import load_dotenv
+load_dotenv()
+
+from bench_encoding import load_resumes, synthetic_resumes
+
+
+LATENCY_RUNS = 20
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Embedding backend comparison.")
+    parser.add_argument("--resume-folder", help="Folder of PDF/DOCX resumes to encode")
+    parser.add_argument("--synthetic", type=int, default=128, help="Synthetic resumes when no folder is given")
+    parser.add_argument("--backends", nargs="+", default=["torch", "onnx", "onnx-int8"])
+    parser.add_argument("--batch-size", type=int, default=32)
+    args = parser.parse_args()
+
+    from app.config import settings
+    from app.embeddings.model_backends import load_embedding_model, parity_check
+
+    texts = load_resumes(args.resume_folder) if args.resume_folder else synthetic_resumes(args.synthetic)
+    if not texts:
+        print("No resumes to encode")
+        return
+
+    model_name = settings.embedding.model_name
+    reference = load_embedding_model(model_name, "torch")
+
+    print(f"\n{model_name}, {len(texts)} texts")
+    print(f"{'backend':<12} {'min cos':>9} {'mean cos':>9} {'p50 ms':>9} {'docs/sec':>10}")
+
+    for backend in args.backends:
+        model = reference if backend == "torch" else load_embedding_model(model_name, backend)
+        parity = parity_check(reference, model, texts[:64])
+
+        model.encode(texts[:2])  # warm up
+        latencies = []
+        for text in texts[:LATENCY_RUNS]:
+            start = time.perf_counter()
+            model.encode([text])
+            latencies.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        model.encode(texts, batch_size=args.batch_size, normalize_embeddings=True)
+        throughput = len(texts) / (time.perf_counter() - start)
+
+        print(
+            f"{backend:<12} {parity['min_cosine']:>9.4f} {parity['mean_cosine']:>9.4f} "
+            f"{np.median(latencies):>9.1f} {throughput:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
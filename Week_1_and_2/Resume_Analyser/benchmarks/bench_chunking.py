@@ -0,0 +1,146 @@
+"""
+Chunked multivector vs single-vector resume layout: index size, query latency and recall.
+
+Ingests the same resumes into two temporary stores (STORE_CHUNKED off and on)
+and queries both with sentences taken from each resume:
+
+- head queries: from the first 30% of the text
+- tail queries: from the last 30%, which a single truncated embedding of the
+  whole resume represents worst
+
+recall@k is the share of queries whose source resume is in the top k.
+
+Usage:
+    python benchmarks/bench_chunking.py --synthetic 200
+    python benchmarks/bench_chunking.py --resume-folder ./resumes --k 5
+"""
+import argparse
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from dotenv import load_dotenv
+load_dotenv()
+
+import numpy as np
+
+
+ROLES = ["ABAP Developer", "Data Engineer", "Backend Engineer", "Frontend Developer", "DevOps Engineer", "QA Analyst"]
+DOMAINS = ["banking", "retail", "logistics", "healthcare", "telecom", "insurance", "energy", "media"]
+TECH = ["ABAP", "OData", "CDS Views", "Python", "Spark", "Airflow", "Java", "Kafka", "React", "TypeScript",
+        "Kubernetes", "Terraform", "Selenium", "PostgreSQL", "Snowflake", "Fiori"]
+
+
+def write_synthetic_resumes(folder: Path, count: int, seed: int = 0):
+    """Long DOCX resumes: many roles, each with its own domain and stack, oldest last."""
+    from docx import Document
+
+    rng = np.random.default_rng(seed)
+    for n in range(count):
+        doc = Document()
+        doc.add_paragraph(f"Candidate {n}")
+        doc.add_paragraph(f"Summary: {rng.choice(ROLES)} with broad project experience.")
+        doc.add_paragraph("Work Experience")
+        for year in range(2024, 2024 - int(rng.integers(8, 20)), -1):
+            tech = ", ".join(rng.choice(TECH, size=3, replace=False))
+            domain = rng.choice(DOMAINS)
+            doc.add_paragraph(
+                f"{year}: {rng.choice(ROLES)} at a {domain} company (client {n}-{year}). Built {domain} "
+                f"platforms with {tech}; owned design, delivery and production support for {domain} teams."
+            )
+        doc.save(folder / f"candidate_{n:04d}.docx")
+
+
+def sample_queries(store, fraction: float, from_end: bool, limit: int, seed: int = 0) -> list:
+    """(query sentence, source filename) pairs from the head or tail of each stored resume."""
+    rng = np.random.default_rng(seed)
+    queries = []
+    records, _ = store.client.scroll(store.COLLECTION_NAME, limit=limit, with_payload=["filename", "text"])
+    for r in records:
+        sentences = [s.strip() for s in r.payload["text"].replace("\n", " ").split(".") if len(s.split()) >= 6]
+        if not sentences:
+            continue
+        cut = max(1, int(len(sentences) * fraction))
+        pool = sentences[-cut:] if from_end else sentences[:cut]
+        queries.append((str(rng.choice(pool)), r.payload["filename"]))
+    return queries
+
+
+def disk_mb(path: Path) -> float:
+    return sum(f.stat().st_size for f in path.rglob("*") if f.is_file()) / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Chunked vs single-vector layout benchmark.")
+    parser.add_argument("--resume-folder", help="Folder of PDF/DOCX resumes (default: generated)")
+    parser.add_argument("--synthetic", type=int, default=100, help="Generated resumes when no folder is given")
+    parser.add_argument("--queries", type=int, default=100, help="Resumes sampled for queries")
+    parser.add_argument("--k", type=int, default=5)
+    args = parser.parse_args()
+
+    from app.config import settings
+    from app.vector_store.qdrant_store import QdrantResumeStore
+
+    workdir = Path(tempfile.mkdtemp(prefix="bench_chunking_"))
+    try:
+        folder = Path(args.resume_folder) if args.resume_folder else workdir / "resumes"
+        if not args.resume_folder:
+            folder.mkdir()
+            write_synthetic_resumes(folder, args.synthetic)
+
+        print(
+            f"\nchunks of {settings.store.chunk_words} words, overlap {settings.store.chunk_overlap}, "
+            f"max {settings.store.max_chunks} per resume"
+        )
+        print(
+            f"{'layout':<10} {'ingest s':>9} {'disk MB':>8} {'vectors':>8} {'p50 ms':>7} "
+            f"{'head R@' + str(args.k):>9} {'tail R@' + str(args.k):>9}"
+        )
+
+        queries = None
+        for chunked in (False, True):
+            path = workdir / ("chunked" if chunked else "single")
+            store = QdrantResumeStore(str(path), chunked=chunked)
+
+            start = time.perf_counter()
+            store.ingest_resumes(str(folder))
+            ingest_seconds = time.perf_counter() - start
+
+            vectors = store.count()
+            if chunked:
+                records, _ = store.client.scroll(
+                    store.COLLECTION_NAME, limit=max(1, store.count()), with_vectors=[store.CHUNK_VECTOR]
+                )
+                vectors = sum(len(r.vector[store.CHUNK_VECTOR]) for r in records)
+
+            if queries is None:
+                queries = {
+                    "head": sample_queries(store, 0.3, False, args.queries),
+                    "tail": sample_queries(store, 0.3, True, args.queries)
+                }
+
+            latencies, recall = [], {}
+            for kind, pairs in queries.items():
+                hits = 0
+                for text, source in pairs:
+                    begin = time.perf_counter()
+                    results = store.search_resumes(text, top_k_final=args.k, backend="qdrant")
+                    latencies.append(time.perf_counter() - begin)
+                    hits += source in [filename for filename, _, _ in results]
+                recall[kind] = hits / len(pairs) if pairs else 0.0
+
+            store.client.close()
+            print(
+                f"{'chunked' if chunked else 'single':<10} {ingest_seconds:>9.1f} {disk_mb(path):>8.1f} {vectors:>8} "
+                f"{np.median(latencies) * 1000:>7.1f} {recall['head']:>9.2f} {recall['tail']:>9.2f}"
+            )
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+Resume compression: prompt tokens saved, and parse latency / quality parity with --live.
+
+Offline, reports resume tokens before and after compress_resume() at each
+budget. With --live, every fixture is parsed by the LLM twice (full text and
+compressed, parse cache off) and the compressed parse is compared with the
+full-text one: name and email match, skill overlap (Jaccard), experience
+years difference and project / education recall.
+
+Usage:
+    python benchmarks/bench_compression.py                       # generated fixtures
+    python benchmarks/bench_compression.py --resume-folder ./resumes --budgets 0 1200 800
+    python benchmarks/bench_compression.py --resume-folder ./resumes --live
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from dotenv import load_dotenv
+load_dotenv()
+
+import numpy as np
+
+
+SKILLS = ["ABAP", "SAP S/4HANA", "OData", "CDS Views", "Fiori", "BAPI", "Python", "SQL", "Azure", "Docker", "React", "Java"]
+
+
+def synthetic_fixtures(count: int, seed: int = 0) -> list:
+    """Sectioned resumes with running page headers, page numbers and boilerplate sections."""
+    rng = np.random.default_rng(seed)
+    fixtures = []
+    for n in range(count):
+        name = f"Candidate {n + 1}"
+        running_header = f"{name} | candidate{n + 1}@mail.com | +91 98765 {10000 + n}"
+        skills = ", ".join(rng.choice(SKILLS, size=6, replace=False))
+        bullets = [
+            f"- Delivered {rng.choice(SKILLS)} work item {i} for module {rng.integers(1, 20)} with reviews and tests"
+            for i in range(int(rng.integers(10, 60)))
+        ]
+        pages = [bullets[i:i + 20] for i in range(0, len(bullets), 20)]
+        body = []
+        for p, page in enumerate(pages):
+            body += page + [f"Page {p + 1} of {len(pages)}", running_header]
+        fixtures.append("\n".join(
+            ["CURRICULUM VITAE", name, running_header, "Professional Summary",
+             f"Developer with {rng.integers(1, 12)} years of experience.", "Work Experience",
+             f"Developer, Company {n} ({2024 - int(rng.integers(1, 10))} - present)"]
+            + body
+            + ["Technical Skills", skills, "Projects", "Vendor portal", f"Technologies: {skills}",
+               "Education", "B.Tech Computer Science, 2016", "Hobbies", "Cricket, reading",
+               "Declaration", "I hereby declare that the above information is true."]
+        ))
+    return fixtures
+
+
+def load_fixtures(folder: str) -> list:
+    from app.loaders import load_resume_from_path
+    from app.utils import clean_text
+
+    files = sorted(Path(folder).glob("*.pdf")) + sorted(Path(folder).glob("*.docx"))
+    return [clean_text(load_resume_from_path(f)) for f in files]
+
+
+def _set(values) -> set:
+    return {str(v).strip().lower() for v in values if str(v).strip()}
+
+
+def _recall(reference: set, found: set) -> float:
+    return len(reference & found) / len(reference) if reference else 1.0
+
+
+def parity(full, compressed) -> dict:
+    full_skills, skills = _set(full.skills), _set(compressed.skills)
+    return {
+        "name": float(_set([full.name]) == _set([compressed.name])),
+        "email": float((full.email or "").lower() == (compressed.email or "").lower()),
+        "skills_jaccard": len(full_skills & skills) / len(full_skills | skills) if full_skills | skills else 1.0,
+        "experience_diff": abs((full.experience_years or 0) - (compressed.experience_years or 0)),
+        "project_recall": _recall(_set(p.name for p in full.projects), _set(p.name for p in compressed.projects)),
+        "education_recall": _recall(_set(full.education), _set(compressed.education))
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resume compression benchmark.")
+    parser.add_argument("--resume-folder", help="Folder of PDF/DOCX resumes (default: generated fixtures)")
+    parser.add_argument("--synthetic", type=int, default=12, help="Generated fixtures when no folder is given")
+    parser.add_argument("--budgets", type=int, nargs="+", default=[0, 1200, 800])
+    parser.add_argument("--live", action="store_true", help="Parse with the LLM and compare quality and latency")
+    args = parser.parse_args()
+
+    from app.config import settings
+    from app.utils import count_tokens
+    from app.utils.resume_compressor import compress_resume
+
+    texts = load_fixtures(args.resume_folder) if args.resume_folder else synthetic_fixtures(args.synthetic)
+    if not texts:
+        print("No resumes found")
+        return
+
+    full_tokens = np.array([count_tokens(t) for t in texts])
+    print(f"\n{len(texts)} resumes, {full_tokens.mean():.0f} tokens on average (max {full_tokens.max()})")
+    print(f"{'budget':>8} {'mean tok':>9} {'max tok':>8} {'saved':>7} {'ms/resume':>10}")
+    for budget in args.budgets:
+        start = time.perf_counter()
+        compressed = [compress_resume(t, budget) for t in texts]
+        elapsed_ms = (time.perf_counter() - start) * 1000 / len(texts)
+        tokens = np.array([count_tokens(c) for c in compressed])
+        saved = 1 - tokens.sum() / full_tokens.sum()
+        print(f"{budget:>8} {tokens.mean():>9.0f} {tokens.max():>8} {saved:>7.0%} {elapsed_ms:>10.2f}")
+
+    if not args.live:
+        return
+
+    from app.chains.resume_parser_chain import ResumeParserChain
+
+    chain = ResumeParserChain()
+    chain.cache = None
+
+    async def parse_all(compression: bool):
+        settings.llm.resume_compression = compression
+        start = time.perf_counter()
+        results = await chain.aparse_many([(t, f"c{i}") for i, t in enumerate(texts)])
+        return results, time.perf_counter() - start
+
+    async def parse_both():
+        # One event loop for both runs: the shared async HTTP client is bound to the loop that first used it
+        return await parse_all(False), await parse_all(True)
+
+    (full, full_seconds), (compressed, compressed_seconds) = asyncio.run(parse_both())
+
+    pairs = [(f, c) for f, c in zip(full, compressed) if not isinstance(f, Exception) and not isinstance(c, Exception)]
+    print(f"\nLLM parse at LLM_RESUME_TOKEN_BUDGET={settings.llm.resume_token_budget} ({len(pairs)} of {len(texts)} parsed both ways)")
+    print(f"  full text:  {full_seconds:.1f}s")
+    print(f"  compressed: {compressed_seconds:.1f}s")
+    if pairs:
+        scores = [parity(f, c) for f, c in pairs]
+        for key in scores[0]:
+            print(f"  {key:<17} {np.mean([s[key] for s in scores]):.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Cross-encoder pre-pass: latency and agreement with the vector and LLM rankings.
+
+Syncs a resume folder into the store, takes a wide vector shortlist for a JD
+and scores it with the cross-encoder. With --llm the same shortlist is also
+ranked by the full LLM pipeline (parse, score, rerank; no cross-encoder) and
+the cross-encoder order is compared with it: Kendall tau over the shortlist
+and recall of the LLM's top-k in the cross-encoder's top-k.
+
+Usage:
+    python benchmarks/bench_cross_encoder.py --resume-folder ./resumes
+    python benchmarks/bench_cross_encoder.py --resume-folder ./resumes --shortlist 20 --keep 4 --llm
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from dotenv import load_dotenv
+load_dotenv()
+
+import numpy as np
+
+
+LATENCY_RUNS = 5
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cross-encoder pre-pass benchmark.")
+    parser.add_argument("--resume-folder", default="./resumes")
+    parser.add_argument("--jd-file", help="Job description text file (default: run.py's JD)")
+    parser.add_argument("--model", help="CrossEncoder model name (default: CROSS_ENCODER_MODEL_NAME)")
+    parser.add_argument("--shortlist", type=int, default=None, help="Vector candidates scored (default: settings)")
+    parser.add_argument("--keep", type=int, default=4, help="Candidates kept for the LLM stages")
+    parser.add_argument("--llm", action="store_true", help="Compare with the LLM pipeline's ranking")
+    args = parser.parse_args()
+
+    from app.config import settings
+    from app.scoring import CrossEncoderReranker, ranking_agreement
+    from app.scoring.cross_encoder import load_cross_encoder
+    from app.services import RankingPipeline, format_timeline
+    from app.vector_store import get_resume_store
+
+    if args.jd_file:
+        jd_text = Path(args.jd_file).read_text(encoding="utf-8")
+    else:
+        from run import JD_TEXT as jd_text
+
+    shortlist = args.shortlist or settings.cross_encoder.shortlist
+    store = get_resume_store()
+    store.ingest_resumes(args.resume_folder)
+    hits, _ = store.search_resumes_with_plan(jd_text, None, shortlist)
+    if not hits:
+        print("No resumes in the store")
+        return
+    vector_order = [filename for filename, _, _ in hits]
+
+    reranker = CrossEncoderReranker(model=load_cross_encoder(args.model) if args.model else None)
+    reranker.score("warmup", ["warmup"])
+    latencies = []
+    for _ in range(LATENCY_RUNS):
+        start = time.perf_counter()
+        selected = reranker.select(jd_text, hits, len(hits))
+        latencies.append(time.perf_counter() - start)
+    cross_order = [filename for filename, _, _ in selected]
+
+    total_ms = np.median(latencies) * 1000
+    print(f"\n{args.model or settings.cross_encoder.model_name}, {len(hits)} candidates")
+    print(f"  cross-encoder: {total_ms:.0f} ms per shortlist, {total_ms / len(hits):.1f} ms per pair")
+
+    def report(label: str, reference: list):
+        agreement = ranking_agreement(reference, cross_order, args.keep)
+        print(
+            f"  vs {label:<8} kendall tau {agreement['kendall_tau']:+.2f}, "
+            f"top-{args.keep} recall {agreement['top_k_recall']:.2f}"
+        )
+
+    report("vector", vector_order)
+
+    if args.llm:
+        pipeline = RankingPipeline(top_k=len(hits), evaluate=False, rerank=True, cross_encoder=False)
+        start = time.perf_counter()
+        response = asyncio.run(pipeline.run(jd_text))
+        llm_ms = (time.perf_counter() - start) * 1000
+        llm_order = [c.filename for c in response.rankings]
+        print(f"  LLM pipeline:  {llm_ms:.0f} ms for {len(llm_order)} candidates")
+        report("LLM", llm_order)
+        print(format_timeline(response.timeline))
+
+    print(f"\n  cross-encoder top {args.keep}:")
+    for filename, _, score in selected[:args.keep]:
+        print(f"    {score:>8.3f}  {filename}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Encoding throughput: plain model.encode vs the length-bucketed EncodingEngine.
+
+Encodes the resumes in --resume-folder (or synthetic resumes of realistic,
+highly variable length) three ways and reports docs/sec plus the largest
+cosine deviation from the plain call. Run on a CPU-only box with the
+embedding cache out of the picture (the model is called directly).
+
+Usage:
+    python benchmarks/bench_encoding.py --synthetic 512 --workers 4
+    python benchmarks/bench_encoding.py --resume-folder ./resumes --token-budget 8192
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from dotenv import load_dotenv
+load_dotenv()
+
+
+VOCABULARY = (
+    "python java sql docker kubernetes aws azure react node spark airflow pandas "
+    "led designed built migrated optimized deployed managed team platform service "
+    "pipeline data api backend frontend cloud microservices reduced latency cost "
+    "improved reliability years experience engineer senior developer analyst"
+).split()
+
+
+def synthetic_resumes(count: int, seed: int = 0) -> list:
+    """Resumes with log-normally distributed lengths (~50 to ~2000 words)."""
+    rng = np.random.default_rng(seed)
+    lengths = np.clip(rng.lognormal(mean=5.5, sigma=0.8, size=count), 50, 2000).astype(int)
+    return [" ".join(rng.choice(VOCABULARY, size=n)) for n in lengths]
+
+
+def load_resumes(folder: str) -> list:
+    from app.loaders import load_resume_from_path
+
+    files = sorted(Path(folder).glob("*.pdf")) + sorted(Path(folder).glob("*.docx"))
+    return [load_resume_from_path(f) for f in files]
+
+
+def _timed(label: str, fn, texts: list, reference=None):
+    start = time.perf_counter()
+    embeddings = np.asarray(fn(texts), dtype=np.float32)
+    elapsed = time.perf_counter() - start
+
+    deviation = ""
+    if reference is not None:
+        cosine = np.sum(embeddings * reference, axis=1) / (
+            np.linalg.norm(embeddings, axis=1) * np.linalg.norm(reference, axis=1)
+        )
+        deviation = f"{1 - cosine.min():.2e}"
+
+    print(f"{label:<28} {len(texts) / elapsed:>10.1f} {elapsed:>10.2f} {deviation:>14}")
+    return embeddings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Embedding throughput benchmark.")
+    parser.add_argument("--resume-folder", help="Folder of PDF/DOCX resumes to encode")
+    parser.add_argument("--synthetic", type=int, default=256, help="Synthetic resumes when no folder is given")
+    parser.add_argument("--token-budget", type=int, default=16384)
+    parser.add_argument("--max-batch-size", type=int, default=64)
+    parser.add_argument("--workers", type=int, default=0, help="Encode processes for the pooled run (0 = per physical core)")
+    parser.add_argument("--torch-threads", type=int, default=0)
+    args = parser.parse_args()
+
+    from app.embeddings.encoding_engine import EncodingEngine, physical_cores
+    from app.embeddings.matryoshka_embedder import get_matryoshka_embedder
+
+    texts = load_resumes(args.resume_folder) if args.resume_folder else synthetic_resumes(args.synthetic)
+    if not texts:
+        print("No resumes to encode")
+        return
+
+    matryoshka_embedder = get_matryoshka_embedder()
+    model = matryoshka_embedder.model
+    name = matryoshka_embedder.model_name
+
+    def engine(workers: int) -> EncodingEngine:
+        return EncodingEngine(
+            model, name,
+            backend=matryoshka_embedder.backend,
+            token_budget=args.token_budget,
+            max_batch_size=args.max_batch_size,
+            workers=workers,
+            torch_threads=args.torch_threads,
+            parallel_min_texts=1
+        )
+
+    in_process = engine(1)
+    pooled = engine(args.workers)
+    lengths = in_process.token_lengths(texts)
+
+    print(f"\n{len(texts)} texts, tokens/text min {lengths.min()} median {int(np.median(lengths))} max {lengths.max()}")
+    print(f"{len(physical_cores())} physical cores, {pooled.workers} pool workers, "
+          f"{len(in_process.plan_batches(lengths))} bucketed batches")
+    print(f"\n{'method':<28} {'docs/sec':>10} {'seconds':>10} {'max 1-cos':>14}")
+
+    # Warm up (first forward pass allocates)
+    model.encode(texts[:2], normalize_embeddings=True)
+
+    reference = _timed("model.encode (current)", lambda t: model.encode(t, normalize_embeddings=True), texts)
+    _timed("engine, in-process", in_process.encode, texts, reference)
+
+    if pooled.workers > 1:
+        pooled.encode(texts[:pooled.workers])  # start workers and load models outside the timing
+        _timed(f"engine, {pooled.workers} processes", pooled.encode, texts, reference)
+        pooled.close()
+
+
+if __name__ == "__main__":
+    main()
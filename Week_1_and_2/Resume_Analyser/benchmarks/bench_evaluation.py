@@ -0,0 +1,130 @@
+"""
+LLM evaluation: prompt tokens and wall time of one call per candidate vs packed calls.
+
+Token counts are computed offline from the prompts that would be sent. With
+--live the evaluator is actually called (Azure OpenAI credentials needed) and
+wall time, LLM calls and single-call fallbacks are reported for each mode.
+
+Usage:
+    python benchmarks/bench_evaluation.py --candidates 16
+    python benchmarks/bench_evaluation.py --candidates 16 --pack-sizes 1 4 8 --live
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from dotenv import load_dotenv
+load_dotenv()
+
+import numpy as np
+
+
+SKILLS = (
+    "ABAP", "SAP S/4HANA", "OData", "Fiori", "CDS Views", "BAPI", "SmartForms", "Python",
+    "SQL", "Java", "Azure", "Docker", "Kubernetes", "React", "REST APIs", "Git"
+)
+
+
+def synthetic_candidates(count: int, seed: int = 0):
+    from app.schemas import ParsedResume, Project
+
+    rng = np.random.default_rng(seed)
+    candidates, scores = [], []
+    for i in range(count):
+        skills = list(rng.choice(SKILLS, size=int(rng.integers(4, len(SKILLS))), replace=False))
+        candidates.append(ParsedResume(
+            candidate_id=f"c{i + 1}",
+            name=f"Candidate {i + 1}",
+            skills=skills,
+            experience_years=float(rng.integers(1, 12)),
+            projects=[
+                Project(name=f"Project {j + 1}", description="Migration and enhancement work", technologies=skills[:3])
+                for j in range(int(rng.integers(1, 4)))
+            ],
+            education=["B.Tech Computer Science"]
+        ))
+        signals = rng.uniform(0.3, 0.9, size=4)
+        scores.append({
+            "semantic": signals[0], "skill": signals[1], "experience": signals[2], "project": signals[3],
+            "aggregate": float(signals.mean() * 100)
+        })
+    return candidates, scores
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Packed LLM evaluation benchmark.")
+    parser.add_argument("--candidates", type=int, default=16)
+    parser.add_argument("--pack-sizes", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--token-budget", type=int, default=None, help="Prompt tokens per packed call (default: settings)")
+    parser.add_argument("--live", action="store_true", help="Call the LLM and time each mode")
+    args = parser.parse_args()
+
+    from app.chains.llm_evaluator_chain import (
+        BATCH_EVALUATOR_PROMPT, EVALUATOR_PROMPT, LLMEvaluatorChain, get_llm_evaluator_chain
+    )
+    from app.schemas import ParsedJD
+    from app.utils import count_tokens
+
+    jd = ParsedJD(
+        role="SAP ABAP Developer",
+        must_have_skills=["ABAP", "SAP S/4HANA", "OData", "CDS Views"],
+        nice_to_have_skills=["Fiori", "BAPI", "SmartForms"],
+        min_experience_years=2,
+        max_experience_years=6,
+        domain="SAP / ERP",
+        summary="ABAP developer for S/4HANA custom development and OData services."
+    )
+    candidates, scores = synthetic_candidates(args.candidates)
+    chain = get_llm_evaluator_chain() if args.live else object.__new__(LLMEvaluatorChain)
+
+    print(f"\n{len(candidates)} candidates")
+    print(f"{'pack size':>10} {'calls':>7} {'prompt tok/cand':>16}" + (f" {'seconds':>9} {'fallbacks':>10}" if args.live else ""))
+
+    # One event loop for every live run: the shared async HTTP client is bound to the loop that first used it
+    loop = asyncio.new_event_loop() if args.live else None
+    for max_pack in args.pack_sizes:
+        if max_pack == 1:
+            packs = [[i] for i in range(len(candidates))]
+            tokens = sum(
+                count_tokens(EVALUATOR_PROMPT.format(**chain._inputs(jd, c, s)))
+                for c, s in zip(candidates, scores)
+            )
+        else:
+            packs = chain.plan_packs(jd, candidates, scores, args.token_budget, max_pack)
+            tokens = sum(
+                count_tokens(BATCH_EVALUATOR_PROMPT.format(**chain._batch_inputs(
+                    jd, [candidates[i] for i in p], [scores[i] for i in p]
+                )))
+                for p in packs
+            )
+        line = f"{max_pack:>10} {len(packs):>7} {tokens / len(candidates):>16.0f}"
+
+        if args.live:
+            fallbacks = [0]
+            single = chain.aevaluate
+
+            async def counted(*a, **kw):
+                fallbacks[0] += 1
+                return await single(*a, **kw)
+
+            chain.aevaluate = counted
+            start = time.perf_counter()
+            loop.run_until_complete(chain.aevaluate_many(jd, candidates, scores, args.token_budget, max_pack))
+            elapsed = time.perf_counter() - start
+            chain.aevaluate = single
+            # Packs of one are single calls by design, not fallbacks
+            singles = sum(1 for p in packs if len(p) == 1)
+            line += f" {elapsed:>9.2f} {fallbacks[0] - singles:>10}"
+
+        print(line)
+
+    if loop is not None:
+        loop.close()
+
+
+if __name__ == "__main__":
+    main()
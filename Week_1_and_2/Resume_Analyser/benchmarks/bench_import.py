@@ -0,0 +1,107 @@
+"""
+Import time: cost of importing app modules, and what each import drags in.
+
+Each module is imported in a fresh interpreter so earlier imports do not hide
+later costs. The report shows wall time and whether the import loaded heavy
+dependencies (torch, sentence-transformers) or built any shared instance.
+Optionally times warmup() for comparison.
+
+Usage:
+    python benchmarks/bench_import.py
+    python benchmarks/bench_import.py --runs 5 --warmup
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+
+
+ROOT = Path(__file__).resolve().parent.parent
+
+MODULES = [
+    "app.scoring.experience_score",
+    "app.scoring",
+    "app.embeddings",
+    "app.vector_store",
+    "app.chains",
+]
+
+HEAVY_MODULES = ["torch", "sentence_transformers", "langchain_openai", "qdrant_client"]
+
+# The probe must not trigger the lazy accessors itself, so it checks the
+# private holders instead of importing the instance names
+PROBE = """
+import json, sys, time
+from dotenv import load_dotenv
+load_dotenv()
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+
+holders = {{
+    "matryoshka_embedder": ("app.embeddings.matryoshka_embedder", "_default_embedder"),
+    "skill_ontology": ("app.scoring.skill_ontology", "_default_ontology"),
+    "cross_encoder": ("app.scoring.cross_encoder", "_default_reranker"),
+    "resume_store": ("app.vector_store.qdrant_store", "_default_store"),
+    "jd_parser_chain": ("app.chains.jd_parser_chain", "_default_chain"),
+    "resume_parser_chain": ("app.chains.resume_parser_chain", "_default_chain"),
+    "llm_evaluator_chain": ("app.chains.llm_evaluator_chain", "_default_chain"),
+    "reranker_chain": ("app.chains.reranker_chain", "_default_chain"),
+}}
+built = [
+    name for name, (module_name, attr) in holders.items()
+    if module_name in sys.modules and getattr(sys.modules[module_name], attr).initialized
+]
+
+print(json.dumps({{
+    "seconds": elapsed,
+    "heavy": [m for m in {heavy!r} if m in sys.modules],
+    "built": built
+}}))
+"""
+
+
+def _probe(module: str) -> dict:
+    code = PROBE.format(module=module, heavy=HEAVY_MODULES)
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=ROOT,
+        env={**os.environ, "PYTHONPATH": str(ROOT)},
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"importing {module} failed:\n{result.stderr}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import-time benchmark.")
+    parser.add_argument("--runs", type=int, default=3, help="Fresh interpreters per module")
+    parser.add_argument("--warmup", action="store_true", help="Also time warmup() in-process")
+    args = parser.parse_args()
+
+    print(f"\n{'module':<34} {'median ms':>10}  heavy deps loaded / instances built")
+    for module in MODULES:
+        probes = [_probe(module) for _ in range(args.runs)]
+        median_ms = np.median([p["seconds"] for p in probes]) * 1000
+        loaded = ", ".join(probes[-1]["heavy"] + probes[-1]["built"]) or "-"
+        print(f"{module:<34} {median_ms:>10.1f}  {loaded}")
+
+    if args.warmup:
+        sys.path.insert(0, str(ROOT))
+        from dotenv import load_dotenv
+        load_dotenv()
+        from app.warmup import warmup
+
+        print("\nwarmup():")
+        timings = warmup()
+        print(f"  total {sum(timings.values()):.2f}s")
+
+
+if __name__ == "__main__":
+    main()
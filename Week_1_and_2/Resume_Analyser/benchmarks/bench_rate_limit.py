@@ -0,0 +1,148 @@
+"""
+Shared LLM rate limiter vs independent clients against a simulated deployment quota.
+
+The simulated deployment enforces an RPM / TPM quota over 10-second windows
+(as Azure OpenAI does) and answers 429 with a retry-after-ms hint. Many
+concurrent callers push a fixed workload through it:
+
+- independent: every caller retries on its own after the hinted delay, like
+  separate SDK clients with built-in retries
+- shared: every call goes through one LLMRateLimiter (AIMD concurrency,
+  RPM/TPM buckets, a shared pause on 429)
+
+Reports completed calls per minute against the quota, and the 429s and
+give-ups it took to get there. No credentials or network needed.
+
+Usage:
+    python benchmarks/bench_rate_limit.py
+    python benchmarks/bench_rate_limit.py --rpm 120 --tpm 60000 --calls 150 --callers 32
+"""
+import argparse
+import asyncio
+import random
+import sys
+import time
+from collections import deque
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from dotenv import load_dotenv
+load_dotenv()
+
+
+WINDOW_SECONDS = 10.0
+
+
+class RateLimited(Exception):
+    status_code = 429
+
+    def __init__(self, retry_after_s: float):
+        super().__init__("429 Too Many Requests")
+        self.response = type("Response", (), {"headers": {"retry-after-ms": str(int(retry_after_s * 1000))}})()
+
+
+class SimulatedDeployment:
+    """Accepts at most rpm/6 requests and tpm/6 tokens per sliding 10-second window."""
+
+    def __init__(self, rpm: int, tpm: int, latency: float):
+        self.max_requests = rpm * WINDOW_SECONDS / 60
+        self.max_tokens = tpm * WINDOW_SECONDS / 60
+        self.latency = latency
+        self.accepted = deque()
+        self.rejected = 0
+
+    async def complete(self, tokens: int) -> int:
+        now = time.monotonic()
+        while self.accepted and now - self.accepted[0][0] > WINDOW_SECONDS:
+            self.accepted.popleft()
+        used = sum(t for _, t in self.accepted)
+        if len(self.accepted) + 1 > self.max_requests or used + tokens > self.max_tokens:
+            self.rejected += 1
+            raise RateLimited(WINDOW_SECONDS - (now - self.accepted[0][0]) if self.accepted else 1.0)
+        self.accepted.append((now, tokens))
+        await asyncio.sleep(self.latency * random.uniform(0.5, 1.5))
+        return tokens
+
+
+async def run_independent(deployment: SimulatedDeployment, jobs: list, callers: int, max_retries: int) -> int:
+    queue = asyncio.Queue()
+    for tokens in jobs:
+        queue.put_nowait(tokens)
+    failed = 0
+
+    async def caller():
+        nonlocal failed
+        while not queue.empty():
+            tokens = queue.get_nowait()
+            for attempt in range(max_retries + 1):
+                try:
+                    await deployment.complete(tokens)
+                    break
+                except RateLimited as e:
+                    if attempt == max_retries:
+                        failed += 1
+                        break
+                    await asyncio.sleep(float(e.response.headers["retry-after-ms"]) / 1000)
+
+    await asyncio.gather(*[caller() for _ in range(callers)])
+    return failed
+
+
+async def run_shared(deployment: SimulatedDeployment, jobs: list, callers: int, limiter) -> int:
+    queue = asyncio.Queue()
+    for tokens in jobs:
+        queue.put_nowait(tokens)
+    failed = 0
+
+    async def caller():
+        nonlocal failed
+        while not queue.empty():
+            tokens = queue.get_nowait()
+            try:
+                await limiter.acall(lambda: deployment.complete(tokens), tokens, lambda used: used)
+            except RateLimited:
+                failed += 1
+
+    await asyncio.gather(*[caller() for _ in range(callers)])
+    return failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LLM rate limiter benchmark.")
+    parser.add_argument("--rpm", type=int, default=120, help="Simulated deployment requests/min")
+    parser.add_argument("--tpm", type=int, default=120_000, help="Simulated deployment tokens/min")
+    parser.add_argument("--calls", type=int, default=120)
+    parser.add_argument("--callers", type=int, default=32, help="Concurrent callers")
+    parser.add_argument("--tokens", type=int, default=800, help="Mean tokens per call")
+    parser.add_argument("--latency", type=float, default=1.0, help="Mean seconds per call")
+    parser.add_argument("--max-retries", type=int, default=6)
+    args = parser.parse_args()
+
+    from app.llm import LLMRateLimiter
+
+    random.seed(0)
+    jobs = [int(args.tokens * random.uniform(0.5, 1.5)) for _ in range(args.calls)]
+    quota = min(args.rpm, args.tpm / args.tokens)
+
+    print(f"\n{args.calls} calls, {args.callers} callers, quota {args.rpm} RPM / {args.tpm} TPM (~{quota:.0f} calls/min)")
+    print(f"{'mode':<12} {'seconds':>8} {'calls/min':>10} {'of quota':>9} {'429s':>6} {'failed':>7}")
+
+    for mode in ("independent", "shared"):
+        deployment = SimulatedDeployment(args.rpm, args.tpm, args.latency)
+        start = time.perf_counter()
+        if mode == "independent":
+            failed = asyncio.run(run_independent(deployment, jobs, args.callers, args.max_retries))
+        else:
+            limiter = LLMRateLimiter(args.callers, args.rpm, args.tpm, args.max_retries)
+            failed = asyncio.run(run_shared(deployment, jobs, args.callers, limiter))
+        elapsed = time.perf_counter() - start
+        per_minute = (len(jobs) - failed) / elapsed * 60
+        print(
+            f"{mode:<12} {elapsed:>8.1f} {per_minute:>10.1f} {per_minute / quota:>9.0%} "
+            f"{deployment.rejected:>6} {failed:>7}"
+        )
+
+
+if __name__ == "__main__":
+    main()
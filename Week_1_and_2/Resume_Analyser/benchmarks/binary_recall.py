@@ -0,0 +1,94 @@
+"""
+Recall@k of the Hamming stage-0 shortlist against exact full-dim search.
+
+Evaluates the local vector matrix of ./qdrant_data (ingest first), or a
+synthetic matrix of random vectors with --synthetic. Queries are the JDs in
+--jd-folder, or a sample of stored vectors when no folder is given.
+
+Usage:
+    python benchmarks/binary_recall.py --jd-folder ./jds --k 4 --sizes 100 500 2000
+    python benchmarks/binary_recall.py --synthetic 200000 --queries 50
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from dotenv import load_dotenv
+load_dotenv()
+
+
+def _synthetic_matrix(n: int, dim: int, path: str):
+    from app.vector_store.vector_matrix import ResumeVectorMatrix
+
+    rng = np.random.default_rng(0)
+    matrix = ResumeVectorMatrix(path, dim=dim)
+    for start in range(0, n, 10_000):
+        size = min(10_000, n - start)
+        matrix.upsert([str(i) for i in range(start, start + size)], rng.standard_normal((size, dim)))
+    return matrix
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Binary shortlist recall@k report.")
+    parser.add_argument("--jd-folder", help="Folder of .txt job descriptions used as queries")
+    parser.add_argument("--synthetic", type=int, default=0, help="Evaluate N random vectors instead of the store")
+    parser.add_argument("--queries", type=int, default=20, help="Stored vectors sampled as queries")
+    parser.add_argument("--k", type=int, default=4, help="Final results per query")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 100, 250, 500, 1000, 2500])
+    args = parser.parse_args()
+
+    from app.vector_store.binary_index import recall_at_k
+    from app.vector_store.cascade_planner import pseudo_queries
+
+    tmp_dir = None
+    if args.synthetic:
+        tmp_dir = tempfile.TemporaryDirectory()
+        matrix = _synthetic_matrix(args.synthetic, 768, tmp_dir.name)
+    else:
+        from app.vector_store import get_resume_store
+        matrix = get_resume_store().matrix
+        if matrix is None:
+            print("Local vector matrix is disabled (STORE_MATRIX_ENABLED=false)")
+            return
+
+    if len(matrix) == 0:
+        print("No vectors to evaluate. Run ingestion first.")
+        return
+
+    if args.jd_folder:
+        from app.embeddings.matryoshka_embedder import get_matryoshka_embedder
+        from app.loaders import load_jd_from_file
+
+        jd_texts = [load_jd_from_file(f) for f in sorted(Path(args.jd_folder).glob("*.txt"))]
+        queries = get_matryoshka_embedder().embed_texts(jd_texts)
+    else:
+        queries = pseudo_queries(matrix, args.queries, seed=1)
+
+    print(f"\nCorpus: {len(matrix)} vectors, {len(queries)} queries, k={args.k}")
+    print(f"{'shortlist':>10} {'recall@k':>10} {'ms/query':>10}")
+
+    start = time.perf_counter()
+    exact, _ = matrix.search(queries, top_k_stage1=len(matrix), top_k_final=args.k)
+    exact_ms = (time.perf_counter() - start) * 1000 / len(queries)
+    print(f"{'exact':>10} {1.0:>10.3f} {exact_ms:>10.2f}")
+
+    for size in args.sizes:
+        if size >= len(matrix):
+            continue
+        start = time.perf_counter()
+        approx, _ = matrix.search(queries, top_k_stage1=size, top_k_final=args.k, binary_shortlist=size)
+        ms = (time.perf_counter() - start) * 1000 / len(queries)
+        print(f"{size:>10} {recall_at_k(exact, approx):>10.3f} {ms:>10.2f}")
+
+    if tmp_dir is not None:
+        tmp_dir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
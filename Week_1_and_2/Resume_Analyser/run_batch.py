@@ -0,0 +1,61 @@
+"""
+Batch screening - shortlist resumes for many job descriptions in one pass.
+
+Usage:
+    python run_batch.py ./jds --top-k-final 5
+"""
+import argparse
+from pathlib import Path
+
+from dotenv import load_dotenv
+load_dotenv()
+
+from app.vector_store import get_resume_store
+from app.loaders import load_jd_from_file
+
+
+RESUME_FOLDER = "./resumes"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Shortlist resumes for every JD in a folder.")
+    parser.add_argument("jd_folder", help="Folder of .txt job descriptions")
+    parser.add_argument("--top-k-stage1", type=int, default=None, help="Candidates kept after the 256-dim stage (default: planned)")
+    parser.add_argument("--top-k-final", type=int, default=4, help="Candidates kept after full-dim rescoring")
+    args = parser.parse_args()
+
+    jd_files = sorted(Path(args.jd_folder).glob("*.txt"))
+    if not jd_files:
+        print(f"No .txt job descriptions found in {args.jd_folder}")
+        return
+
+    print("\n" + "=" * 60)
+    print("BATCH RESUME SCREENING")
+    print("=" * 60)
+
+    print("\n[STEP 1] Syncing resume vector store...")
+    resume_store = get_resume_store()
+    summary = resume_store.ingest_resumes(RESUME_FOLDER)
+    print(f"  {summary.added} added, {summary.updated} updated, {summary.removed} removed")
+
+    print(f"\n[STEP 2] Matching {len(jd_files)} job descriptions...")
+    jd_texts = [load_jd_from_file(f) for f in jd_files]
+    shortlists, plan = resume_store.search_resumes_batch_with_plan(
+        jd_texts,
+        top_k_stage1=args.top_k_stage1,
+        top_k_final=args.top_k_final
+    )
+    print(f"  Cascade plan: {plan.describe()}")
+
+    for jd_file, shortlist in zip(jd_files, shortlists):
+        print(f"\n{jd_file.name}")
+        for i, (filename, _, score) in enumerate(shortlist):
+            print(f"    {i+1}. {filename} (similarity: {score:.3f})")
+
+    print("\n" + "=" * 60)
+    print("BATCH COMPLETE")
+    print("=" * 60 + "\n")
+
+
+if __name__ == "__main__":
+    main()
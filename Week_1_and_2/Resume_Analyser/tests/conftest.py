@@ -0,0 +1,15 @@
+"""
+Shared test setup.
+
+Settings are built when app.config is imported, so the required Azure
+variables get placeholder values here; no test talks to Azure.
+"""
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+os.environ.setdefault("AZURE_OPENAI_ENDPOINT", "https://example.openai.azure.com")
+os.environ.setdefault("AZURE_OPENAI_API_KEY", "test-key")
+os.environ.setdefault("AZURE_OPENAI_DEPLOYMENT", "test-deployment")
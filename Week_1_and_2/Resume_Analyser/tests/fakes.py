@@ -0,0 +1,104 @@
+"""Offline stand-ins for the LLM, embedder and file extraction used by the tests."""
+import asyncio
+import hashlib
+from pathlib import Path
+from typing import Any, Callable, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+
+class ScriptedChatModel(BaseChatModel):
+    """
+    Fake chat model for structured-output chains.
+
+    `reply` gets the last prompt message and returns (tool name, arguments).
+    A dict of arguments becomes a tool call; a string becomes an invalid tool
+    call, as when the model emits malformed JSON. Async calls take `delay`
+    seconds, and the most calls seen in flight at once is kept in `peak`.
+    """
+
+    reply: Callable[[str], Tuple[str, Union[dict, str]]]
+    delay: float = 0.0
+    prompts: List[str] = []
+    in_flight: int = 0
+    peak: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted"
+
+    def bind_tools(self, tools: Any, **kwargs: Any) -> "ScriptedChatModel":
+        return self
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any
+    ) -> ChatResult:
+        prompt = messages[-1].content
+        self.prompts.append(prompt)
+        name, args = self.reply(prompt)
+        if isinstance(args, str):
+            message = AIMessage(content="", invalid_tool_calls=[
+                {"name": name, "args": args, "id": "call_0", "error": "Malformed JSON"}
+            ])
+        else:
+            message = AIMessage(content="", tool_calls=[{"name": name, "args": args, "id": "call_0"}])
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any
+    ) -> ChatResult:
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            return self._generate(messages, stop=stop, **kwargs)
+        finally:
+            self.in_flight -= 1
+
+
+class HashEmbedder:
+    """
+    Fake embedder: each text maps to a fixed random unit vector.
+
+    Texts passed to embed_texts are recorded in `calls`, one list per call.
+    """
+
+    def __init__(self, dim: int = 768):
+        self.dim = dim
+        self.calls: List[List[str]] = []
+
+    def vector(self, text: str) -> np.ndarray:
+        seed = int(hashlib.sha256(text.encode("utf-8")).hexdigest()[:16], 16)
+        vector = np.random.default_rng(seed).standard_normal(self.dim).astype(np.float32)
+        return vector / np.linalg.norm(vector)
+
+    def embed_texts(self, texts: List[str]) -> np.ndarray:
+        self.calls.append(list(texts))
+        return np.stack([self.vector(t) for t in texts]) if texts else np.zeros((0, self.dim), np.float32)
+
+    def embed_text(self, text: str) -> np.ndarray:
+        return self.embed_texts([text])[0]
+
+    @property
+    def embedded(self) -> List[str]:
+        """Every text embedded so far."""
+        return [t for call in self.calls for t in call]
+
+
+def read_text_files(file_paths: Iterable[Union[str, Path]], max_workers: int = 0, timeout: float = 60.0):
+    """Stand-in for extract_resumes_parallel: resume fixtures are plain text files."""
+    for file_path in file_paths:
+        file_path = Path(file_path)
+        yield file_path, file_path.read_text(encoding="utf-8"), None
@@ -0,0 +1,113 @@
+"""Parity of the vectorized scoring engine with the per-candidate scorers it replaces."""
+import importlib
+
+import numpy as np
+import pytest
+
+from app.schemas import ParsedJD, ParsedResume
+from app.schemas.resume_schema import Project
+from app.scoring import batch_scoring
+from app.scoring.aggregate_score import compute_aggregate_score
+from app.scoring.batch_scoring import compute_batch_scores
+from app.scoring.experience_score import compute_experience_score, compute_experience_scores
+from app.scoring.semantic_match import compute_semantic_score
+from app.scoring.skill_match import get_skill_variants
+from tests.fakes import HashEmbedder
+
+
+# The package re-exports a lazy `embedder` instance under the module's name
+embedder_module = importlib.import_module("app.embeddings.embedder")
+
+
+CANDIDATES = [
+    ParsedResume(
+        candidate_id="full", name="Full", skills=["Python", "k8s", "Airflow"], experience_years=4,
+        projects=[Project(name="Lakehouse", description="Batch pipelines on Spark")],
+        summary="Data engineer building pipelines"
+    ),
+    ParsedResume(candidate_id="no-experience", name="Junior", skills=["py"], summary="Graduate"),
+    ParsedResume(candidate_id="no-skills", name="Blank", skills=[], experience_years=12, summary="Manager"),
+    ParsedResume(
+        candidate_id="aliases", name="Alias", skills=["JS", "Postgres", "ABAP"], experience_years=6.5,
+        projects=[Project(name="Portal", description="")], summary="Full-stack developer"
+    ),
+]
+
+
+def reference_skill_score(must_have, nice_to_have, candidate_skills, must_weight=0.7, nice_weight=0.3):
+    """The per-candidate alias-set scan the ontology replaced."""
+    if not must_have and not nice_to_have:
+        return 1.0
+    candidate = set()
+    for skill in candidate_skills:
+        candidate |= get_skill_variants(skill)
+
+    def share(skills):
+        hits = sum(1 for s in skills if get_skill_variants(s) & candidate)
+        return hits / len(skills) if skills else 1.0
+
+    if must_have and nice_to_have:
+        return must_weight * share(must_have) + nice_weight * share(nice_to_have)
+    return share(must_have) if must_have else share(nice_to_have)
+
+
+def reference_scores(jd, resume):
+    """Signals and aggregate as the scoring loop computed them one candidate at a time."""
+    semantic = compute_semantic_score(jd.summary, resume.summary)
+    skill = reference_skill_score(jd.must_have_skills, jd.nice_to_have_skills, resume.skills)
+    experience = compute_experience_score(resume.experience_years, jd.min_experience_years, jd.max_experience_years)
+    project_text = " ".join([p.name + " " + p.description for p in resume.projects])
+    project = compute_semantic_score(jd.summary, project_text) if project_text.strip() else 0.5
+    return [semantic, skill, experience, project], compute_aggregate_score(semantic, skill, experience, project)
+
+
+@pytest.fixture(autouse=True)
+def embedder(monkeypatch):
+    embedder = HashEmbedder(dim=64)
+    monkeypatch.setattr(batch_scoring, "get_matryoshka_embedder", lambda: embedder)
+    monkeypatch.setattr(embedder_module, "get_matryoshka_embedder", lambda: embedder)
+    return embedder
+
+
+@pytest.mark.parametrize("jd", [
+    ParsedJD(
+        role="Data Engineer", must_have_skills=["Python", "Kubernetes", "ABAP"], nice_to_have_skills=["Airflow", "js"],
+        min_experience_years=3, max_experience_years=6, summary="Senior data engineer for pipelines"
+    ),
+    ParsedJD(
+        role="Backend Engineer", must_have_skills=["Python", "PostgreSQL"],
+        min_experience_years=5, summary="Backend engineer"
+    ),
+    ParsedJD(role="Anyone", summary="Generalist"),
+], ids=["must-and-nice", "no-nice-to-have", "no-skills"])
+def test_batch_scores_match_per_candidate_scores(jd, embedder):
+    signals, aggregates = compute_batch_scores(jd, CANDIDATES)
+
+    expected = [reference_scores(jd, r) for r in CANDIDATES]
+    assert np.allclose(signals, [s for s, _ in expected], atol=1e-6)
+    assert np.allclose(aggregates, [a for _, a in expected], atol=0.011)
+
+
+def test_batch_scores_embed_once(embedder):
+    jd = ParsedJD(role="Data Engineer", must_have_skills=["Python"], summary="Data engineer")
+
+    compute_batch_scores(jd, CANDIDATES)
+
+    # JD summary, every resume summary and the two non-empty project texts
+    assert [len(call) for call in embedder.calls] == [1 + len(CANDIDATES) + 2]
+
+
+def test_no_candidates():
+    signals, aggregates = compute_batch_scores(ParsedJD(role="Any"), [])
+
+    assert signals.shape == (0, 4)
+    assert aggregates.shape == (0,)
+
+
+@pytest.mark.parametrize("max_required", [None, 4.0])
+def test_experience_curve_matches_the_scalar_curve(max_required):
+    years = np.array([0, 0.5, 1.9, 2, 3, 4, 6.9, 7, 7.1, 12, 40])
+
+    vectorized = compute_experience_scores(years, 2, max_required)
+
+    assert np.allclose(vectorized, [compute_experience_score(y, 2, max_required) for y in years])
@@ -0,0 +1,60 @@
+"""Tests for sign-bit codes and the Hamming shortlist."""
+import numpy as np
+
+from app.vector_store.binary_index import (
+    code_bytes, hamming_distances, hamming_shortlist, pack_signs, recall_at_k, shortlist_recall
+)
+from app.vector_store.matrix_search import normalize_rows
+from app.vector_store.vector_matrix import ResumeVectorMatrix
+
+
+def test_pack_signs_packs_one_bit_per_dimension():
+    vectors = np.array([[1.0, -1.0, 0.5, 0.0, -2.0, 3.0, 1.0, -1.0, 1.0]])
+
+    codes = pack_signs(vectors)
+
+    assert code_bytes(9) == 2
+    assert codes.shape == (1, 2)
+    assert codes[0].tolist() == [0b10100110, 0b10000000]
+
+
+def test_hamming_distances_count_differing_signs():
+    rng = np.random.default_rng(0)
+    a = rng.standard_normal((3, 768))
+    b = rng.standard_normal((5, 768))
+
+    distances = hamming_distances(pack_signs(a), pack_signs(b))
+
+    expected = ((a[:, None, :] > 0) != (b[None, :, :] > 0)).sum(axis=2)
+    assert np.array_equal(distances, expected)
+
+
+def test_shortlist_is_nearest_first_across_blocks():
+    rng = np.random.default_rng(1)
+    codes = pack_signs(rng.standard_normal((100, 64)))
+    queries = codes[[7, 42]]
+
+    rows = hamming_shortlist(queries, codes, k=5, block_size=16)
+
+    distances = hamming_distances(queries, codes)
+    assert rows[:, 0].tolist() == [7, 42]
+    assert np.all(np.diff(np.take_along_axis(distances, rows, axis=1), axis=1) >= 0)
+    assert np.all(np.take_along_axis(distances, rows, axis=1)[:, -1] <= np.sort(distances, axis=1)[:, 4])
+
+
+def test_recall_at_k():
+    assert recall_at_k([["a", "b"], ["c", "d"]], [["a", "x"], ["d", "c"]]) == 0.75
+    assert recall_at_k([], []) == 1.0
+
+
+def test_shortlist_recall_reaches_one_at_corpus_size(tmp_path):
+    rng = np.random.default_rng(2)
+    matrix = ResumeVectorMatrix(tmp_path, dim=64)
+    matrix.upsert([str(i) for i in range(300)], normalize_rows(rng.standard_normal((300, 64))))
+    queries = rng.standard_normal((8, 64))
+
+    report = shortlist_recall(matrix, queries, k=5, shortlist_sizes=[10, 100, 300])
+
+    assert list(report) == [10, 100, 300]
+    assert report[10] <= report[100] + 1e-9
+    assert report[300] == 1.0
@@ -0,0 +1,73 @@
+"""Tests for the cascade planner and its query sample."""
+import numpy as np
+
+from app.vector_store.binary_index import recall_at_k
+from app.vector_store.cascade_planner import CascadePlanner, QuerySample
+from app.vector_store.matrix_search import normalize_rows
+from app.vector_store.vector_matrix import ResumeVectorMatrix
+
+
+def test_sample_is_written_every_save_every_queries(tmp_path):
+    path = tmp_path / "query_sample.npy"
+    sample = QuerySample(path, capacity=8, dim=4, save_every=3)
+
+    sample.add(np.ones(4))
+    sample.add(np.ones(4))
+    assert not path.exists()
+
+    sample.add(np.ones(4))
+    assert np.load(path).shape == (3, 4)
+
+
+def test_save_writes_pending_queries_and_reloads(tmp_path):
+    path = tmp_path / "query_sample.npy"
+    sample = QuerySample(path, capacity=2, dim=4, save_every=100)
+    for i in range(3):
+        sample.add(np.full(4, i))
+    sample.save()
+
+    reloaded = QuerySample(path, capacity=2, dim=4)
+
+    assert len(reloaded) == 2
+    assert reloaded.array()[:, 0].tolist() == [1.0, 2.0]
+
+
+def test_in_memory_sample_never_writes(tmp_path):
+    sample = QuerySample(None, capacity=4, dim=4, save_every=1)
+    sample.add(np.ones((2, 4)))
+    sample.save()
+
+    assert len(sample) == 2
+    assert list(tmp_path.iterdir()) == []
+
+
+def matryoshka_vectors(centers: np.ndarray, n: int, rng: np.random.Generator) -> np.ndarray:
+    """Clustered vectors whose energy decays with the dimension, like matryoshka embeddings."""
+    dim = centers.shape[1]
+    scale = 1.0 / np.sqrt(1.0 + np.arange(dim) / 32.0)
+    vectors = centers[rng.integers(len(centers), size=n)] + 0.8 * rng.standard_normal((n, dim))
+    return normalize_rows(vectors * scale)
+
+
+def test_planned_cascade_meets_recall_target(tmp_path):
+    dim, top_k, target = 256, 5, 0.9
+    rng = np.random.default_rng(0)
+    centers = rng.standard_normal((40, dim))
+    matrix = ResumeVectorMatrix(tmp_path, dim=dim)
+    matrix.upsert([f"r{i}" for i in range(3000)], matryoshka_vectors(centers, 3000, rng))
+    matrix.flush(version=1)
+
+    sample = QuerySample(None, dim=dim)
+    sample.add(matryoshka_vectors(centers, 64, rng))
+    planner = CascadePlanner(matrix, sample, recall_target=target)
+
+    plan = planner.plan(top_k, prefix_dims=(32, 64, 128))
+
+    # Unseen queries from the same distribution
+    queries = matryoshka_vectors(centers, 64, rng)
+    exact, _ = matrix.cascade(queries, [], top_k)
+    found, _ = matrix.cascade(queries, plan.stages, top_k)
+
+    assert not plan.is_exact
+    assert plan.estimated_cost < plan.exact_cost
+    assert recall_at_k(exact, found) >= target
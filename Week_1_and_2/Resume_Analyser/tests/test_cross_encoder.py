@@ -0,0 +1,68 @@
+"""Tests for the cross-encoder pre-pass with a tiny stub model."""
+import numpy as np
+
+from app.scoring.cross_encoder import CrossEncoderReranker, ranking_agreement
+
+
+class OverlapModel:
+    """Tiny cross-encoder stand-in: scores a pair by shared words, records its batches."""
+
+    def __init__(self):
+        self.calls = []
+
+    def predict(self, pairs, batch_size=32):
+        self.calls.append((list(pairs), batch_size))
+        return np.array([len(set(q.lower().split()) & set(d.lower().split())) for q, d in pairs], dtype=np.float32)
+
+
+JD = "abap odata cds fiori developer"
+CANDIDATES = [
+    ("a.pdf", "java spring developer", 0.9),
+    ("b.pdf", "abap odata cds fiori developer", 0.8),
+    ("c.pdf", "python developer", 0.7),
+    ("d.pdf", "abap odata developer with a much longer resume text", 0.6),
+    ("e.pdf", "abap developer", 0.5),
+    ("f.pdf", "react developer", 0.4),
+]
+
+
+def test_select_trims_to_keep_in_score_order():
+    reranker = CrossEncoderReranker(model=OverlapModel(), batch_size=4, max_length=64)
+
+    selected = reranker.select(JD, CANDIDATES, keep=3)
+
+    assert [f for f, _, _ in selected] == ["b.pdf", "d.pdf", "e.pdf"]
+    assert [s for _, _, s in selected] == [5.0, 3.0, 2.0]
+
+
+def test_equal_scores_keep_vector_search_order():
+    reranker = CrossEncoderReranker(model=OverlapModel(), batch_size=4, max_length=64)
+
+    selected = reranker.select(JD, [c for c in CANDIDATES if c[0] in ("a.pdf", "c.pdf", "f.pdf")], keep=3)
+
+    assert [f for f, _, _ in selected] == ["a.pdf", "c.pdf", "f.pdf"]
+
+
+def test_pairs_are_sent_by_length_with_batch_size():
+    model = OverlapModel()
+    reranker = CrossEncoderReranker(model=model, batch_size=4, max_length=64)
+
+    scores = reranker.score(JD, [text for _, text, _ in CANDIDATES])
+
+    pairs, batch_size = model.calls[0]
+    assert batch_size == 4
+    assert [len(d) for _, d in pairs] == sorted(len(text) for _, text, _ in CANDIDATES)
+    assert scores.tolist() == [1.0, 5.0, 1.0, 3.0, 2.0, 1.0]
+
+
+def test_empty_shortlist_does_not_call_the_model():
+    model = OverlapModel()
+
+    assert CrossEncoderReranker(model=model).select(JD, [], keep=3) == []
+    assert model.calls == []
+
+
+def test_ranking_agreement():
+    assert ranking_agreement(["a", "b", "c"], ["a", "b", "c"]) == {"kendall_tau": 1.0, "top_k_recall": 1.0}
+    assert ranking_agreement(["a", "b", "c"], ["c", "b", "a"])["kendall_tau"] == -1.0
+    assert ranking_agreement(["a", "b", "c", "d"], ["a", "c", "x", "y"], k=2)["top_k_recall"] == 0.5
@@ -0,0 +1,67 @@
+"""Tests for the two-tier embedding cache."""
+import numpy as np
+
+from app.embeddings import embedding_cache
+from app.embeddings.embedding_cache import EmbeddingCache
+
+
+def vector(value: float) -> np.ndarray:
+    return np.full(4, value, dtype=np.float32)
+
+
+def last_used(cache: EmbeddingCache, key: str) -> float:
+    return cache._conn.execute("SELECT last_used FROM embeddings WHERE key = ?", (key,)).fetchone()[0]
+
+
+def test_round_trip_through_memory_and_disk(tmp_path):
+    cache = EmbeddingCache(tmp_path / "cache.sqlite", memory_entries=1)
+    cache.put_many({"a": vector(1), "b": vector(2)})
+
+    found = cache.get_many(["a", "b", "missing"])
+
+    assert sorted(found) == ["a", "b"]
+    assert np.allclose(found["a"], vector(1))
+    assert len(cache) == 2
+
+
+def test_memory_hits_protect_entries_from_disk_eviction(tmp_path, monkeypatch):
+    clock = iter(range(1000))
+    monkeypatch.setattr(embedding_cache.time, "time", lambda: float(next(clock)))
+    cache = EmbeddingCache(tmp_path / "cache.sqlite", max_entries=2, memory_entries=8)
+
+    cache.put_many({"hot": vector(1)})
+    cache.put_many({"cold": vector(2)})
+    for _ in range(3):
+        assert "hot" in cache.get_many(["hot"])  # served from memory
+    cache.put_many({"new": vector(3)})
+
+    remaining = {k for (k,) in cache._conn.execute("SELECT key FROM embeddings")}
+    assert remaining == {"hot", "new"}
+
+
+def test_memory_hits_are_written_in_batches(tmp_path, monkeypatch):
+    clock = iter(range(1000))
+    monkeypatch.setattr(embedding_cache.time, "time", lambda: float(next(clock)))
+    monkeypatch.setattr(embedding_cache, "TOUCH_BATCH_SIZE", 3)
+    cache = EmbeddingCache(tmp_path / "cache.sqlite", memory_entries=8)
+    cache.put_many({"a": vector(1), "b": vector(2), "c": vector(3)})
+    before = last_used(cache, "a")
+
+    cache.get_many(["a", "b"])
+    assert last_used(cache, "a") == before
+
+    cache.get_many(["c"])
+    assert last_used(cache, "a") > before
+
+
+def test_flush_writes_pending_hits(tmp_path, monkeypatch):
+    clock = iter(range(1000))
+    monkeypatch.setattr(embedding_cache.time, "time", lambda: float(next(clock)))
+    cache = EmbeddingCache(tmp_path / "cache.sqlite", memory_entries=8)
+    cache.put_many({"a": vector(1)})
+    before = last_used(cache, "a")
+
+    cache.get_many(["a"])
+    cache.flush()
+
+    assert last_used(cache, "a") > before
@@ -0,0 +1,124 @@
+"""Tests for packed and single candidate evaluation against a scripted chat model."""
+import asyncio
+import re
+
+import pytest
+
+from app.chains.llm_evaluator_chain import LLMEvaluatorChain
+from app.schemas import ParsedJD, ParsedResume
+from tests.fakes import ScriptedChatModel
+
+
+JD = ParsedJD(role="ABAP Developer", must_have_skills=["ABAP", "OData"], min_experience_years=3, domain="SAP")
+CANDIDATES = [
+    ParsedResume(candidate_id=f"c{i}", name=f"Candidate {i}", skills=["ABAP"], experience_years=i + 2)
+    for i in range(4)
+]
+SCORES = [{"semantic": 0.8, "skill": 0.5, "experience": 0.9, "project": 0.5, "aggregate": 70.0}] * len(CANDIDATES)
+
+
+def single_reply(prompt: str):
+    name = re.search(r"^Name: (.+)$", prompt, re.MULTILINE).group(1)
+    return "CandidateEvaluation", {"strengths": ["ABAP"], "fit_summary": f"single: {name}"}
+
+
+def packed_reply(ids):
+    return "BatchEvaluationOutput", {"evaluations": [
+        {"candidate_id": cid, "strengths": ["ABAP"], "fit_summary": f"packed: {cid}"} for cid in ids
+    ]}
+
+
+def scripted(batch_reply) -> ScriptedChatModel:
+    """Packed prompts get batch_reply(candidate ids in the prompt); single prompts a per-name evaluation."""
+    def reply(prompt: str):
+        if "## Candidates:" in prompt:
+            return batch_reply(re.findall(r"^### Candidate (\S+)$", prompt, re.MULTILINE))
+        return single_reply(prompt)
+    return ScriptedChatModel(reply=reply)
+
+
+def summaries(results):
+    return [r.fit_summary for r in results]
+
+
+@pytest.fixture(params=["sync", "async"])
+def evaluate_many(request):
+    def run(chain, **kwargs):
+        if request.param == "sync":
+            return chain.evaluate_many(JD, CANDIDATES, SCORES, **kwargs)
+        return asyncio.run(chain.aevaluate_many(JD, CANDIDATES, SCORES, **kwargs))
+    return run
+
+
+def test_single_evaluation():
+    chain = LLMEvaluatorChain(llm=scripted(packed_reply))
+
+    result = chain.evaluate(JD, CANDIDATES[0], SCORES[0])
+
+    assert result.fit_summary == "single: Candidate 0"
+    assert result.strengths == ["ABAP"]
+
+
+def test_packed_evaluation_uses_one_call(evaluate_many):
+    llm = scripted(packed_reply)
+
+    results = evaluate_many(LLMEvaluatorChain(llm=llm), max_pack=4)
+
+    assert summaries(results) == [f"packed: c{i}" for i in range(4)]
+    assert len(llm.prompts) == 1
+
+
+def test_unpacked_evaluation_with_max_pack_one(evaluate_many):
+    llm = scripted(packed_reply)
+
+    results = evaluate_many(LLMEvaluatorChain(llm=llm), max_pack=1)
+
+    assert summaries(results) == [f"single: Candidate {i}" for i in range(4)]
+    assert len(llm.prompts) == 4
+
+
+def test_short_reply_falls_back_for_missing_candidates(evaluate_many):
+    llm = scripted(lambda ids: packed_reply(ids[:2]))
+
+    results = evaluate_many(LLMEvaluatorChain(llm=llm), max_pack=4)
+
+    assert summaries(results) == ["packed: c0", "packed: c1", "single: Candidate 2", "single: Candidate 3"]
+    assert len(llm.prompts) == 3
+
+
+def test_duplicated_and_unknown_ids_fall_back(evaluate_many):
+    llm = scripted(lambda ids: packed_reply([ids[0], ids[0], ids[1], "c99", ids[3]]))
+
+    results = evaluate_many(LLMEvaluatorChain(llm=llm), max_pack=4)
+
+    assert summaries(results) == ["single: Candidate 0", "packed: c1", "single: Candidate 2", "packed: c3"]
+
+
+def test_malformed_json_reply_falls_back_to_single_calls(evaluate_many):
+    llm = scripted(lambda ids: ("BatchEvaluationOutput", '{"evaluations": [{"candidate_id": "c0", '))
+
+    results = evaluate_many(LLMEvaluatorChain(llm=llm), max_pack=4)
+
+    assert summaries(results) == [f"single: Candidate {i}" for i in range(4)]
+
+
+def test_reply_not_matching_schema_falls_back_to_single_calls(evaluate_many):
+    llm = scripted(lambda ids: ("BatchEvaluationOutput", {"evaluations": "none"}))
+
+    results = evaluate_many(LLMEvaluatorChain(llm=llm), max_pack=4)
+
+    assert summaries(results) == [f"single: Candidate {i}" for i in range(4)]
+
+
+def test_failed_single_fallback_is_returned_as_exception(evaluate_many):
+    def reply(prompt: str):
+        if "## Candidates:" in prompt:
+            return packed_reply([])
+        if "Candidate 1" in prompt:
+            return "CandidateEvaluation", {"strengths": "not a list"}
+        return single_reply(prompt)
+
+    results = evaluate_many(LLMEvaluatorChain(llm=ScriptedChatModel(reply=reply)), max_pack=4)
+
+    assert isinstance(results[1], Exception)
+    assert summaries([results[0], results[2], results[3]]) == [f"single: Candidate {i}" for i in (0, 2, 3)]
@@ -0,0 +1,48 @@
+"""Tests for blocked brute-force top-k."""
+import numpy as np
+
+from app.vector_store.matrix_search import BlockedTopK, normalize_rows, rescore_candidates, top_k_indices
+
+
+def test_top_k_indices_are_sorted_best_first():
+    scores = np.array([[0.1, 0.9, 0.5, 0.7], [0.3, 0.2, 0.8, 0.1]])
+
+    assert top_k_indices(scores, 2).tolist() == [[1, 3], [2, 0]]
+    assert top_k_indices(scores, 10).shape == (2, 4)
+    assert top_k_indices(scores, 0).shape == (2, 0)
+
+
+def test_blocked_top_k_matches_a_single_pass():
+    rng = np.random.default_rng(0)
+    scores = rng.standard_normal((5, 1000)).astype(np.float32)
+
+    top = BlockedTopK(5, 7)
+    for start in range(0, 1000, 128):
+        top.update(scores[:, start:start + 128], np.arange(start, min(1000, start + 128)))
+    ids, block_scores = top.result()
+
+    expected = np.argsort(-scores, axis=1)[:, :7]
+    assert np.array_equal(ids, expected)
+    assert np.allclose(block_scores, np.take_along_axis(scores, expected, axis=1))
+
+
+def test_blocked_top_k_with_fewer_rows_than_k():
+    top = BlockedTopK(1, 5)
+    top.update(np.array([[0.2, 0.8]]), np.array([10, 11]))
+
+    ids, scores = top.result()
+
+    assert ids.tolist() == [[11, 10]]
+    assert scores.shape == (1, 2)
+
+
+def test_rescore_candidates_uses_each_query_s_own_list():
+    vectors = normalize_rows(np.eye(4)[[0, 1, 2]])
+    queries = normalize_rows(np.array([[1.0, 0, 0, 0], [0, 0, 1.0, 0]]))
+    candidates = np.array([[5, 7], [7, 6]])  # global row IDs
+    row_of_id = np.full(8, -1)
+    row_of_id[[5, 6, 7]] = [0, 1, 2]
+
+    scores = rescore_candidates(queries, candidates, vectors, row_of_id)
+
+    assert np.allclose(scores, [[1.0, 0.0], [1.0, 0.0]])
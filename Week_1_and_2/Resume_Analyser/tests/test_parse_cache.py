@@ -0,0 +1,69 @@
+"""Tests for the on-disk parse cache."""
+import os
+import time
+
+from app.chains.parse_cache import ParseCache, schema_fingerprint
+from app.schemas import ParsedResume
+
+
+def make_cache(tmp_path) -> ParseCache:
+    return ParseCache(tmp_path, "resumes", ParsedResume, schema_fingerprint(["prompt"], ParsedResume))
+
+
+def test_resume_round_trip_restores_excluded_fields(tmp_path):
+    cache = make_cache(tmp_path)
+    parsed = ParsedResume(candidate_id="a.pdf", name="Asha", skills=["ABAP", "OData"], raw_text="resume text")
+
+    cache.put("resume text", parsed, exclude={"candidate_id", "raw_text"})
+    cached = cache.get("resume text", update={"candidate_id": "b.pdf", "raw_text": "resume text"})
+
+    assert cached is not None
+    assert cached.candidate_id == "b.pdf"
+    assert cached.name == "Asha"
+    assert cached.skills == ["ABAP", "OData"]
+    assert cached.raw_text == "resume text"
+
+
+def test_entry_missing_required_field_is_a_miss(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.put("resume text", ParsedResume(candidate_id="a.pdf", name="Asha"), exclude={"candidate_id"})
+
+    assert cache.get("resume text") is None
+
+
+def test_unknown_text_is_a_miss(tmp_path):
+    assert make_cache(tmp_path).get("never stored") is None
+
+
+def test_other_fingerprints_survive_construction(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.put("resume text", ParsedResume(candidate_id="a.pdf", name="Asha"))
+
+    other = ParseCache(tmp_path, "resumes", ParsedResume, schema_fingerprint(["new prompt"], ParsedResume))
+    other.put("resume text", ParsedResume(candidate_id="a.pdf", name="Ravi"))
+
+    assert make_cache(tmp_path).get("resume text").name == "Asha"
+    assert other.get("resume text").name == "Ravi"
+
+
+def test_prune_removes_other_fingerprints(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.put("resume text", ParsedResume(candidate_id="a.pdf", name="Asha"))
+    other = ParseCache(tmp_path, "resumes", ParsedResume, schema_fingerprint(["new prompt"], ParsedResume))
+
+    assert other.prune() == 1
+    assert not cache.dir.exists()
+    assert other.dir.exists()
+
+
+def test_prune_by_age_keeps_recently_opened_fingerprints(tmp_path):
+    stale = make_cache(tmp_path)
+    recent = ParseCache(tmp_path, "resumes", ParsedResume, schema_fingerprint(["other prompt"], ParsedResume))
+    day = 86400
+    os.utime(stale.dir, (time.time() - 40 * day, time.time() - 40 * day))
+
+    current = ParseCache(tmp_path, "resumes", ParsedResume, schema_fingerprint(["new prompt"], ParsedResume))
+
+    assert current.prune(max_age_days=30) == 1
+    assert not stale.dir.exists()
+    assert recent.dir.exists()
@@ -0,0 +1,350 @@
+"""Tests for the Qdrant resume store, run against embedded Qdrant with a fake embedder."""
+import os
+from typing import Dict, List
+
+import numpy as np
+import pytest
+from qdrant_client import QdrantClient
+from qdrant_client.models import Distance, PointStruct, VectorParams
+
+from app.schemas import ParsedJD, ParsedResume
+from app.vector_store import qdrant_store
+from app.vector_store.ingest_manifest import hash_file, point_id_from_hash
+from app.vector_store.qdrant_store import QdrantResumeStore
+from tests.fakes import HashEmbedder, read_text_files
+
+
+RESUMES = {f"resume_{i:02d}.docx": f"Candidate {i} builds data pipelines in Python and SQL" for i in range(12)}
+
+
+@pytest.fixture
+def embedder(monkeypatch):
+    embedder = HashEmbedder(dim=QdrantResumeStore.VECTOR_DIM)
+    monkeypatch.setattr(qdrant_store, "get_matryoshka_embedder", lambda: embedder)
+    monkeypatch.setattr(qdrant_store, "extract_resumes_parallel", read_text_files)
+    return embedder
+
+
+@pytest.fixture
+def open_store(tmp_path, embedder):
+    """Opens stores on one data directory; each is closed after the test."""
+    stores = []
+
+    def open_(**kwargs) -> QdrantResumeStore:
+        store = QdrantResumeStore(persist_path=str(tmp_path / "qdrant_data"), **kwargs)
+        stores.append(store)
+        return store
+
+    yield open_
+    for store in stores:
+        store.client.close()
+
+
+@pytest.fixture
+def folder(tmp_path):
+    folder = tmp_path / "resumes"
+    folder.mkdir()
+    write_resumes(folder, RESUMES)
+    return folder
+
+
+def legacy_collection(path, embedder: HashEmbedder, points: Dict[int, dict]):
+    """Single unnamed-vector collection as written before named vectors (positional IDs)."""
+    client = QdrantClient(path=str(path))
+    client.create_collection(
+        QdrantResumeStore.COLLECTION_NAME,
+        vectors_config=VectorParams(size=QdrantResumeStore.VECTOR_DIM, distance=Distance.COSINE)
+    )
+    client.upsert(QdrantResumeStore.COLLECTION_NAME, points=[
+        PointStruct(id=i, vector=embedder.vector(payload["text"]).tolist(), payload=payload)
+        for i, payload in points.items()
+    ])
+    client.close()
+
+
+def write_resumes(folder, resumes: Dict[str, str]):
+    for filename, text in resumes.items():
+        (folder / filename).write_text(text, encoding="utf-8")
+
+
+def exact_top_k(embedder: HashEmbedder, resumes: Dict[str, str], query: str, k: int) -> List[str]:
+    """Filenames of the k resumes closest to the query by full-dim cosine."""
+    names = list(resumes)
+    scores = np.stack([embedder.vector(resumes[n]) for n in names]) @ embedder.vector(query)
+    return [names[i] for i in np.argsort(-scores)[:k]]
+
+
+def test_legacy_collection_is_migrated_without_re_embedding(tmp_path, open_store, embedder):
+    legacy_collection(tmp_path / "qdrant_data", embedder, {
+        i: {"filename": name, "text": text} for i, (name, text) in enumerate(RESUMES.items())
+    })
+
+    store = open_store()
+
+    assert not store._is_legacy_collection(store.COLLECTION_NAME)
+    assert store.count() == len(RESUMES)
+    record = store.client.retrieve(store.COLLECTION_NAME, ids=[3], with_vectors=True)[0]
+    stored = embedder.vector(RESUMES["resume_03.docx"])
+    assert np.allclose(record.vector[store.FULL_VECTOR], stored, atol=1e-6)
+    assert np.allclose(record.vector[store.PREFIX_VECTOR], stored[:store.PREFIX_DIM] / np.linalg.norm(stored[:store.PREFIX_DIM]), atol=1e-6)
+    assert embedder.calls == []
+
+
+def test_qdrant_search_matches_exact_search(open_store, folder, embedder):
+    store = open_store()
+    store.ingest_resumes(str(folder))
+    query = "Python data engineer"
+
+    hits = store.search_resumes(query, top_k_stage1=len(RESUMES), top_k_final=4, backend="qdrant")
+
+    assert [name for name, _, _ in hits] == exact_top_k(embedder, RESUMES, query, 4)
+    assert hits[0][1] == RESUMES[hits[0][0]]
+
+
+def test_exact_plan_on_embedded_qdrant_sends_no_search_params(open_store, folder, embedder, recwarn):
+    store = open_store()
+    store.ingest_resumes(str(folder))
+    query = "Python data engineer"
+
+    hits, plan = store.search_resumes_with_plan(query, top_k_final=4, backend="qdrant")
+
+    assert plan.is_exact
+    assert [name for name, _, _ in hits] == exact_top_k(embedder, RESUMES, query, 4)
+    assert not [w for w in recwarn if "search_params" in str(w.message)]
+
+
+def test_ingest_embeds_only_added_and_changed_files(open_store, folder, embedder):
+    store = open_store()
+    first = store.ingest_resumes(str(folder))
+    assert (first.added, first.skipped) == (len(RESUMES), 0)
+
+    (folder / "resume_00.docx").write_text("Candidate 0 now writes Rust", encoding="utf-8")
+    (folder / "resume_01.docx").unlink()
+    (folder / "resume_99.docx").write_text("Candidate 99 is new", encoding="utf-8")
+    stat = (folder / "resume_02.docx").stat()
+    os.utime(folder / "resume_02.docx", (stat.st_atime, stat.st_mtime + 10))  # touched, same content
+    embedder.calls.clear()
+
+    summary = store.ingest_resumes(str(folder))
+
+    assert (summary.added, summary.updated, summary.removed, summary.skipped) == (1, 1, 1, len(RESUMES) - 2)
+    assert sorted(embedder.embedded) == ["Candidate 0 now writes Rust", "Candidate 99 is new"]
+    assert store.count() == len(RESUMES)
+    assert store.get_resume_text("resume_00.docx") == "Candidate 0 now writes Rust"
+    assert store.get_resume_text("resume_01.docx") is None
+
+
+def test_reopened_store_skips_unchanged_files(open_store, folder, embedder):
+    store = open_store()
+    store.ingest_resumes(str(folder))
+    store.client.close()
+    embedder.calls.clear()
+
+    summary = open_store().ingest_resumes(str(folder))
+
+    assert summary.skipped == len(RESUMES)
+    assert embedder.calls == []
+
+
+def test_missing_manifest_is_rebuilt_from_stored_points(tmp_path, open_store, folder, embedder):
+    store = open_store()
+    store.ingest_resumes(str(folder))
+    store.client.close()
+    (tmp_path / "qdrant_data" / QdrantResumeStore.MANIFEST_FILENAME).unlink()
+    embedder.calls.clear()
+
+    summary = open_store().ingest_resumes(str(folder))
+
+    assert summary.skipped == len(RESUMES)
+    assert embedder.calls == []
+
+
+def test_legacy_points_move_to_content_hash_ids(tmp_path, open_store, folder, embedder):
+    points = {
+        i: {"filename": name, "filepath": str(folder / name), "text": text}
+        for i, (name, text) in enumerate(RESUMES.items())
+    }
+    points[99] = {"filename": "gone.docx", "filepath": str(folder / "gone.docx"), "text": "Deleted resume"}
+    legacy_collection(tmp_path / "qdrant_data", embedder, points)
+
+    store = open_store()
+    summary = store.ingest_resumes(str(folder))
+
+    assert summary.skipped == len(RESUMES)
+    assert embedder.calls == []
+    records, _ = store.client.scroll(store.COLLECTION_NAME, limit=100, with_payload=True)
+    assert sorted(str(r.id) for r in records) == sorted(
+        point_id_from_hash(hash_file(folder / name)) for name in RESUMES
+    )
+    assert all(r.payload["content_hash"] == hash_file(r.payload["filepath"]) for r in records)
+    hits = store.search_resumes("Python data engineer", top_k_stage1=len(RESUMES), backend="local")
+    assert [name for name, _, _ in hits] == exact_top_k(embedder, RESUMES, "Python data engineer", 4)
+
+
+def test_store_without_persist_path_keeps_resumes_between_ingests(monkeypatch, folder, embedder):
+    # No server in tests: stand in an in-memory client for the remote one
+    monkeypatch.setattr(qdrant_store, "QdrantClient", lambda path=None: QdrantClient(location=":memory:"))
+    store = QdrantResumeStore(persist_path=None)
+    store.ingest_resumes(str(folder))
+    embedder.calls.clear()
+
+    summary = store.ingest_resumes(str(folder))
+
+    assert summary.skipped == len(RESUMES)
+    assert embedder.calls == []
+    assert store.count() == len(RESUMES)
+
+
+def test_ingest_embeds_in_micro_batches(monkeypatch, open_store, folder, embedder):
+    monkeypatch.setattr(qdrant_store.settings.ingest, "batch_size", 5)
+
+    open_store().ingest_resumes(str(folder))
+
+    assert [len(call) for call in embedder.calls] == [5, 5, 2]
+
+
+def test_failed_batch_is_retried_by_the_next_ingest(monkeypatch, open_store, folder, embedder):
+    monkeypatch.setattr(qdrant_store.settings.ingest, "batch_size", 4)
+    embed_texts = embedder.embed_texts
+
+    def fail_second_batch(texts):
+        if len(embedder.calls) == 1:
+            embedder.calls.append([])
+            raise RuntimeError("embedding backend went away")
+        return embed_texts(texts)
+
+    monkeypatch.setattr(embedder, "embed_texts", fail_second_batch)
+    store = open_store()
+    summary = store.ingest_resumes(str(folder))
+    store.client.close()
+
+    assert (summary.added, summary.failed) == (8, 4)
+
+    monkeypatch.setattr(embedder, "embed_texts", embed_texts)
+    embedder.calls.clear()
+    summary = open_store().ingest_resumes(str(folder))
+
+    assert (summary.added, summary.skipped) == (4, 8)
+    assert len(embedder.embedded) == 4
+
+
+def test_profile_filter_keeps_matching_and_unprofiled_resumes(open_store, folder):
+    store = open_store()
+    store.ingest_resumes(str(folder))
+    profiles = {
+        "resume_00.docx": (["Python", "SQL"], 5),    # matches
+        "resume_01.docx": (["py"], 2.5),             # alias, within the tolerance
+        "resume_02.docx": (["Python"], 1),           # too junior
+        "resume_03.docx": (["Java", "Spring"], 8),   # no must-have skill
+    }
+    for filename, (skills, years) in profiles.items():
+        store.save_profile(filename, ParsedResume(
+            candidate_id=filename, name=filename, skills=skills, experience_years=years
+        ))
+    jd = ParsedJD(role="Data Engineer", must_have_skills=["Python", "Airflow"], min_experience_years=4)
+
+    hits = store.search_resumes("Python data engineer", top_k_final=len(RESUMES), parsed_jd=jd)
+
+    found = {name for name, _, _ in hits}
+    assert found == set(RESUMES) - {"resume_02.docx", "resume_03.docx"}
+
+
+def test_profile_filter_without_hard_constraints_is_none():
+    jd = ParsedJD(role="Generalist", min_experience_years=1)
+
+    assert QdrantResumeStore.profile_filter(jd, experience_tolerance=2.0) is None
+
+
+def test_profiles_are_stored_with_canonical_skills(open_store, folder):
+    store = open_store()
+    store.ingest_resumes(str(folder))
+    store.save_profile("resume_05.docx", ParsedResume(
+        candidate_id="ignored", name="Asha", skills=["py", "JS", "ABAP"], experience_years=3
+    ))
+
+    profile = store.get_profile("resume_05.docx", candidate_id="c5")
+    records, _ = store.client.scroll(store.COLLECTION_NAME, limit=100, with_payload=["filename", "skills"])
+    skills = {r.payload["filename"]: r.payload.get("skills") for r in records}
+
+    assert (profile.candidate_id, profile.name, profile.raw_text) == ("c5", "Asha", RESUMES["resume_05.docx"])
+    assert skills["resume_05.docx"] == ["abap", "javascript", "python"]
+    assert store.get_profile("resume_06.docx", candidate_id="c6") is None
+
+
+@pytest.mark.parametrize("backend", ["qdrant", "local"])
+def test_batch_search_runs_the_cascade_per_jd(open_store, folder, embedder, backend):
+    store = open_store()
+    store.ingest_resumes(str(folder))
+    queries = ["Python data engineer", "SQL analyst", "Rust systems programmer"]
+
+    shortlists = store.search_resumes_batch(queries, top_k_stage1=6, top_k_final=3, backend=backend)
+
+    # Stage 1 keeps 6 of 12 on the prefix, so compare with the same cascade done by hand
+    names = list(RESUMES)
+    vectors = np.stack([embedder.vector(RESUMES[n]) for n in names])
+    prefix = vectors[:, :store.PREFIX_DIM] / np.linalg.norm(vectors[:, :store.PREFIX_DIM], axis=1, keepdims=True)
+    for query, hits in zip(queries, shortlists):
+        q = embedder.vector(query)
+        stage1 = np.argsort(-(prefix @ (q[:store.PREFIX_DIM] / np.linalg.norm(q[:store.PREFIX_DIM]))))[:6]
+        expected = stage1[np.argsort(-(vectors[stage1] @ q))][:3]
+        assert [name for name, _, _ in hits] == [names[i] for i in expected]
+
+
+def test_batch_search_with_full_width_equals_single_search(open_store, folder, embedder):
+    store = open_store()
+    store.ingest_resumes(str(folder))
+    queries = ["Python data engineer", "SQL analyst"]
+
+    batch = store.search_resumes_batch(queries, top_k_stage1=len(RESUMES), top_k_final=4, backend="qdrant")
+
+    for query, hits in zip(queries, batch):
+        single = store.search_resumes(query, top_k_stage1=len(RESUMES), top_k_final=4, backend="qdrant")
+        assert [name for name, _, _ in hits] == [name for name, _, _ in single]
+        assert [name for name, _, _ in hits] == exact_top_k(embedder, RESUMES, query, 4)
+        assert np.allclose([s for _, _, s in hits], [s for _, _, s in single], atol=1e-4)
+
+
+def test_local_and_qdrant_search_match_exact_search(open_store, folder, embedder):
+    store = open_store()
+    store.ingest_resumes(str(folder))
+    query = "SQL analyst"
+
+    local = store.search_resumes(query, top_k_stage1=len(RESUMES), top_k_final=5, backend="local")
+    remote = store.search_resumes(query, top_k_stage1=len(RESUMES), top_k_final=5, backend="qdrant")
+
+    expected = exact_top_k(embedder, RESUMES, query, 5)
+    assert [name for name, _, _ in local] == expected
+    assert [name for name, _, _ in remote] == expected
+    assert np.allclose([s for _, _, s in local], [s for _, _, s in remote], atol=1e-2)  # float16 matrix
+
+
+def test_matrix_follows_the_corpus_version(open_store, folder):
+    store = open_store()
+    store.ingest_resumes(str(folder))
+    version = store.manifest.version
+    assert store.matrix.version == version
+
+    store.ingest_resumes(str(folder))
+    assert store.manifest.version == version  # nothing changed
+
+    (folder / "resume_00.docx").unlink()
+    store.ingest_resumes(str(folder))
+    assert store.manifest.version == store.matrix.version == version + 1
+    assert len(store.matrix) == store.count() == len(RESUMES) - 1
+
+
+def test_stale_matrix_is_rebuilt_from_qdrant(open_store, folder, embedder):
+    store = open_store()
+    store.ingest_resumes(str(folder))
+    store.matrix.reset()
+    store.matrix.flush(store.manifest.version - 1)  # e.g. an ingest interrupted before the matrix flush
+    store.client.close()
+
+    reopened = open_store()
+
+    assert reopened.matrix.version == reopened.manifest.version
+    assert sorted(reopened.matrix.ids) == sorted(str(r.id) for r in reopened.client.scroll(
+        reopened.COLLECTION_NAME, limit=100
+    )[0])
+    hits = reopened.search_resumes("SQL analyst", top_k_stage1=len(RESUMES), backend="local")
+    assert [name for name, _, _ in hits] == exact_top_k(embedder, RESUMES, "SQL analyst", 4)
@@ -0,0 +1,174 @@
+"""Tests for the async ranking pipeline, with stub chains, store and scoring."""
+import asyncio
+
+import numpy as np
+import pytest
+
+from app.schemas import CandidateEvaluation, ParsedJD, ParsedResume
+from app.scoring import SIGNAL_NAMES
+from app.services import ranking_pipeline
+from app.services.ranking_pipeline import PackBatcher, RankingPipeline
+
+
+RESUMES = [(f"r{i}.pdf", f"resume text {i}", 0.9 - i / 10) for i in range(5)]
+
+
+class StubJDParser:
+    async def aparse(self, jd_text):
+        return ParsedJD(role="ABAP Developer", must_have_skills=["ABAP"], summary="SAP ABAP role")
+
+
+class StubResumeParser:
+    async def aparse(self, text, candidate_id):
+        return ParsedResume(candidate_id=candidate_id, name=text.replace("resume text", "Candidate"), raw_text=text)
+
+
+class StubStore:
+    def __init__(self):
+        self.searches = []
+
+    def search_resumes_with_plan(self, jd_text, plan, top_k, parsed_jd):
+        self.searches.append(top_k)
+        return RESUMES[:top_k], None
+
+    def get_profile(self, filename, candidate_id):
+        return None
+
+    def save_profile(self, filename, profile):
+        pass
+
+
+class StubScorer:
+    """compute_batch_scores stand-in that records its batches and can reject one candidate."""
+
+    def __init__(self, reject: str = ""):
+        self.batches = []
+        self.reject = reject
+
+    def __call__(self, parsed_jd, resumes):
+        self.batches.append([r.name for r in resumes])
+        if any(r.name == self.reject for r in resumes):
+            raise ValueError(f"cannot score {self.reject}")
+        aggregates = np.array([100.0 - int(r.name.split()[-1]) for r in resumes])
+        return np.full((len(resumes), len(SIGNAL_NAMES)), 0.5), aggregates
+
+
+@pytest.fixture
+def stubs(monkeypatch):
+    store = StubStore()
+    scorer = StubScorer()
+    monkeypatch.setattr(ranking_pipeline, "get_jd_parser_chain", lambda: StubJDParser())
+    monkeypatch.setattr(ranking_pipeline, "get_resume_parser_chain", lambda: StubResumeParser())
+    monkeypatch.setattr(ranking_pipeline, "get_resume_store", lambda: store)
+    monkeypatch.setattr(ranking_pipeline, "compute_batch_scores", scorer)
+    return store, scorer
+
+
+def run(pipeline: RankingPipeline, jd_text: str = "ABAP developer"):
+    return asyncio.run(pipeline.run(jd_text))
+
+
+def test_candidates_are_scored_in_one_batch(stubs):
+    _, scorer = stubs
+
+    response = run(RankingPipeline(top_k=5, evaluate=False, rerank=False, cross_encoder=False))
+
+    assert len(scorer.batches) == 1
+    assert sorted(scorer.batches[0]) == [f"Candidate {i}" for i in range(5)]
+    assert [c.name for c in response.rankings] == [f"Candidate {i}" for i in range(5)]
+    assert [c.rank for c in response.rankings] == [1, 2, 3, 4, 5]
+
+
+def test_scoring_failure_drops_only_that_candidate(stubs, monkeypatch):
+    scorer = StubScorer(reject="Candidate 2")
+    monkeypatch.setattr(ranking_pipeline, "compute_batch_scores", scorer)
+
+    response = run(RankingPipeline(top_k=5, evaluate=False, rerank=False, cross_encoder=False))
+
+    assert [c.name for c in response.rankings] == ["Candidate 0", "Candidate 1", "Candidate 3", "Candidate 4"]
+
+
+def test_score_batch_size_splits_batches(stubs, monkeypatch):
+    _, scorer = stubs
+    monkeypatch.setattr(ranking_pipeline.settings.scoring, "batch_size", 2)
+
+    response = run(RankingPipeline(top_k=5, evaluate=False, rerank=False, cross_encoder=False))
+
+    assert sorted(len(batch) for batch in scorer.batches) == [1, 2, 2]
+    assert response.total_candidates == 5
+
+
+def test_scored_candidates_are_evaluated_in_packs(stubs, monkeypatch):
+    packs = []
+
+    class StubEvaluator:
+        async def aevaluate_many(self, jd, profiles, scores):
+            packs.append(len(profiles))
+            return [CandidateEvaluation(fit_summary=f"{p.name} fits") for p in profiles]
+
+    monkeypatch.setattr(ranking_pipeline, "get_llm_evaluator_chain", lambda: StubEvaluator())
+    monkeypatch.setattr(ranking_pipeline.settings.llm, "evaluation_max_pack", 8)
+
+    response = run(RankingPipeline(top_k=5, evaluate=True, rerank=False, cross_encoder=False))
+
+    assert packs == [5]
+    assert all(c.evaluation.fit_summary == f"{c.name} fits" for c in response.rankings)
+
+
+def test_pack_batcher_requires_process():
+    class NoProcess(PackBatcher):
+        pass
+
+    with pytest.raises(TypeError):
+        NoProcess(expected=1, max_pack=1)
+
+
+class StubCrossEncoder:
+    """Keeps the candidates with the highest resume number, so the cut differs from vector order."""
+
+    def __init__(self):
+        self.calls = []
+
+    def select(self, query, candidates, keep):
+        self.calls.append((len(candidates), keep))
+        ranked = sorted(candidates, key=lambda c: c[1], reverse=True)[:keep]
+        return [(filename, text, float(i)) for i, (filename, text, _) in enumerate(ranked)]
+
+
+def test_cross_encoder_prepass_trims_the_shortlist(stubs, monkeypatch):
+    store, scorer = stubs
+    cross_encoder = StubCrossEncoder()
+    monkeypatch.setattr(ranking_pipeline, "get_cross_encoder", lambda: cross_encoder)
+    monkeypatch.setattr(ranking_pipeline.settings.cross_encoder, "shortlist", 5)
+
+    response = run(RankingPipeline(top_k=2, evaluate=False, rerank=False, cross_encoder=True))
+
+    assert store.searches == [5]
+    assert cross_encoder.calls == [(5, 2)]
+    assert sorted(scorer.batches[0]) == ["Candidate 3", "Candidate 4"]
+    assert [c.filename for c in response.rankings] == ["r3.pdf", "r4.pdf"]
+    assert "cross_encode" in [s.stage for s in response.timeline]
+
+
+def test_pipeline_without_cross_encoder(stubs, monkeypatch):
+    store, _ = stubs
+
+    def unavailable():
+        raise AssertionError("cross-encoder used while disabled")
+
+    monkeypatch.setattr(ranking_pipeline, "get_cross_encoder", unavailable)
+    monkeypatch.setattr(ranking_pipeline.settings.cross_encoder, "shortlist", 5)
+
+    response = run(RankingPipeline(top_k=2, evaluate=False, rerank=False, cross_encoder=False))
+
+    assert store.searches == [2]
+    assert [c.filename for c in response.rankings] == ["r0.pdf", "r1.pdf"]
+    assert "cross_encode" not in [s.stage for s in response.timeline]
+
+
+def test_cross_encoder_default_follows_settings(monkeypatch):
+    monkeypatch.setattr(ranking_pipeline.settings.cross_encoder, "enabled", False)
+    assert RankingPipeline().cross_encoder is False
+
+    monkeypatch.setattr(ranking_pipeline.settings.cross_encoder, "enabled", True)
+    assert RankingPipeline().cross_encoder is True
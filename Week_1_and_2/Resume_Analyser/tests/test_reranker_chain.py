@@ -0,0 +1,142 @@
+"""Tests for windowed listwise reranking against a scripted chat model."""
+import asyncio
+import re
+
+import pytest
+
+from app.chains.reranker_chain import RerankedResult, RerankerChain
+from app.config import settings
+from app.schemas import ParsedJD, RankedCandidate, ScoringSignals
+from tests.fakes import ScriptedChatModel
+
+
+JD = ParsedJD(role="ABAP Developer", must_have_skills=["ABAP"], domain="SAP", min_experience_years=3)
+
+
+def candidates(n: int):
+    """c0..c{n-1}, in descending score order."""
+    return [
+        RankedCandidate(candidate_id=f"c{i}", name=f"Candidate {i}", rank=i + 1, final_score=90.0 - i, signals=ScoringSignals())
+        for i in range(n)
+    ]
+
+
+def results(*ids):
+    return [RerankedResult(candidate_id=cid, rank=i + 1, reason=f"reason {cid}") for i, cid in enumerate(ids)]
+
+
+def ids(rankings):
+    return [r.candidate_id for r in rankings]
+
+
+def reversing_model(fail=lambda ids: False) -> ScriptedChatModel:
+    """Ranks each prompt's candidates in reverse order; raises for windows where fail(ids) is true."""
+    def reply(prompt: str):
+        found = re.findall(r"\(ID: (\S+)\)", prompt)
+        if fail(found):
+            raise RuntimeError("model unavailable")
+        return "RerankerOutput", {"rankings": [
+            {"candidate_id": cid, "rank": i + 1, "reason": "reversed"} for i, cid in enumerate(reversed(found))
+        ]}
+    return ScriptedChatModel(reply=reply)
+
+
+@pytest.mark.parametrize("count,window,step", [(13, 5, 3), (20, 10, 5), (11, 4, 4), (7, 6, 1)])
+def test_windows_cover_every_position(count, window, step):
+    windows = RerankerChain.plan_windows(count, window, step)
+
+    assert all(end - start == window for start, end in windows)
+    assert windows[0][0] == 0 and windows[-1][1] == count
+    assert all(b[0] - a[0] <= step for a, b in zip(windows, windows[1:]))
+    assert set(range(count)) == {p for start, end in windows for p in range(start, end)}
+
+
+def test_small_shortlists_need_at_most_one_window():
+    assert RerankerChain.plan_windows(1, 5, 2) == []
+    assert RerankerChain.plan_windows(5, 5, 2) == [(0, 5)]
+
+
+def test_failed_window_keeps_its_score_order():
+    head = candidates(6)
+    windows = [(0, 4), (2, 6)]
+
+    merged = RerankerChain.merge_windows(head, [], windows, [None, results("c5", "c4", "c3", "c2")])
+
+    # Mean estimated positions: c0 0, c1 1, c5 2, c4 3, c2 3.5, c3 3.5 (tie broken by score)
+    assert ids(merged) == ["c0", "c1", "c5", "c4", "c2", "c3"]
+    assert [r.rank for r in merged] == [1, 2, 3, 4, 5, 6]
+    assert merged[0].reason == ""
+    assert merged[2].reason == "reason c5"
+
+
+def test_omitted_and_duplicate_ids_in_a_window_reply():
+    head = candidates(4)
+    reply = [
+        RerankedResult(candidate_id="c2", rank=1, reason="first"),
+        RerankedResult(candidate_id="c2", rank=2, reason="repeat"),
+        RerankedResult(candidate_id="c9", rank=3, reason="not in this window"),
+        RerankedResult(candidate_id="c0", rank=4, reason="second"),
+    ]
+
+    merged = RerankerChain.merge_windows(head, candidates(6)[4:], [(0, 4)], [reply])
+
+    # Ranked members in the model's order, omitted ones after in score order, then the tail
+    assert ids(merged) == ["c2", "c0", "c1", "c3", "c4", "c5"]
+    assert merged[0].reason == "first"
+    assert merged[4].reason == "Below the rerank cutoff; ordered by score"
+
+
+def test_final_call_reorders_only_the_top_window():
+    rankings = results("c0", "c1", "c2", "c3", "c4", "c5")
+
+    final = RerankerChain.apply_final(rankings, results("c2", "c5", "c0"), size=3)
+
+    assert ids(final) == ["c2", "c0", "c1", "c3", "c4", "c5"]
+    assert [r.rank for r in final] == [1, 2, 3, 4, 5, 6]
+
+
+@pytest.fixture
+def small_windows(monkeypatch):
+    monkeypatch.setattr(settings.llm, "rerank_window", 4)
+    monkeypatch.setattr(settings.llm, "rerank_step", 2)
+
+
+@pytest.mark.parametrize("mode", ["sync", "async"])
+def test_rerank_windows_then_final_call(small_windows, mode):
+    model = reversing_model()
+    chain = RerankerChain(llm=model)
+    shortlist = candidates(12)
+
+    if mode == "sync":
+        rankings = chain.rerank(JD, shortlist, top_m=8)
+    else:
+        rankings = asyncio.run(chain.arerank(JD, shortlist, top_m=8))
+
+    windows = RerankerChain.plan_windows(8, 4, 2)
+    merged = RerankerChain.merge_windows(
+        shortlist[:8], shortlist[8:], windows, [results(*reversed(ids(shortlist[s:e]))) for s, e in windows]
+    )
+    assert len(model.prompts) == len(windows) + 1
+    assert ids(rankings[:4]) == list(reversed(ids(merged[:4])))
+    assert ids(rankings[4:]) == ids(merged[4:])
+    assert ids(rankings[8:]) == ["c8", "c9", "c10", "c11"]
+    assert [r.rank for r in rankings] == list(range(1, 13))
+
+
+@pytest.mark.parametrize("mode", ["sync", "async"])
+def test_rerank_survives_a_failed_window(small_windows, mode):
+    chain = RerankerChain(llm=reversing_model(fail=lambda found: "c0" in found))
+
+    if mode == "sync":
+        rankings = chain.rerank(JD, candidates(6))
+    else:
+        rankings = asyncio.run(chain.arerank(JD, candidates(6)))
+
+    assert sorted(ids(rankings)) == sorted(ids(candidates(6)))
+
+
+def test_async_rerank_raises_when_every_window_fails(small_windows):
+    chain = RerankerChain(llm=reversing_model(fail=lambda found: True))
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(chain.arerank(JD, candidates(6)))
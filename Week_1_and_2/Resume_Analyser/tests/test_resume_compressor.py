@@ -0,0 +1,95 @@
+"""Tests for section-aware resume compression."""
+import pytest
+
+from app.utils.resume_compressor import _allocate, compress_resume, segment_resume
+from app.utils.tokens import count_tokens
+
+
+RESUME = """Jane Doe
+jane.doe@example.com | +1 555 123 4567
+Curriculum Vitae
+Summary
+Backend engineer with eight years of Python and distributed systems.
+Experience
+Senior Engineer, Acme Corp (2020 - present)
+Built the event pipeline on Kafka and Postgres.
+Page 1 of 2
+Jane Doe
+jane.doe@example.com | +1 555 123 4567
+Engineer, Beta Labs (2016 - 2020)
+Maintained the billing service.
+Skills
+Python, Go, Kafka, PostgreSQL, Kubernetes
+Hobbies
+Chess, hiking
+References available on request
+Page 2 of 2"""
+
+
+@pytest.mark.parametrize("line", [
+    "References available on request",
+    "References available upon request.",
+    "Page 1 of 2",
+    "2 / 3",
+    "Curriculum Vitae",
+    "I hereby declare that the above information is true."
+])
+def test_segment_drops_boilerplate_lines(line):
+    sections = segment_resume(f"Jane Doe\nSkills\nPython\n{line}")
+
+    assert sections == [("header", ["Jane Doe"]), ("skills", ["Skills", "Python"])]
+
+
+def test_segment_splits_sections_and_drops_unused_ones():
+    sections = segment_resume(RESUME)
+
+    assert [name for name, _ in sections] == ["header", "summary", "experience", "skills"]
+    assert sections[0][1] == ["Jane Doe", "jane.doe@example.com | +1 555 123 4567"]
+    assert sections[2][1] == [
+        "Experience",
+        "Senior Engineer, Acme Corp (2020 - present)",
+        "Built the event pipeline on Kafka and Postgres.",
+        "Engineer, Beta Labs (2016 - 2020)",
+        "Maintained the billing service."
+    ]
+
+
+def test_segment_keeps_repeated_content_lines():
+    text = (
+        "Jane Doe\nBackend engineer\nSummary\nEight years of Python\nProjects\n"
+        "Search\nTechnologies: Python, Qdrant\nBilling\nTechnologies: Python, Qdrant\n"
+        "Education\nBSc Computer Science\nState University\nAchievements\nHackathon winner\nDean's list"
+    )
+
+    projects = dict(segment_resume(text))["projects"]
+
+    assert projects.count("Technologies: Python, Qdrant") == 2
+
+
+def test_allocate_is_max_min_fair():
+    assert _allocate([10, 100, 40], 90) == [10, 40, 40]
+    assert _allocate([10, 20], 100) == [10, 20]
+    assert _allocate([50, 50], 40) == [20, 20]
+
+
+def test_compress_without_budget_only_drops_boilerplate():
+    compressed = compress_resume(RESUME, 0)
+
+    assert "Page 1 of 2" not in compressed
+    assert "References available" not in compressed
+    assert "Chess" not in compressed
+    assert compressed.count("jane.doe@example.com") == 1
+    assert "Maintained the billing service." in compressed
+
+
+def test_compress_fits_budget_and_keeps_header_and_first_lines():
+    experience = "\n".join(f"Engineer, Company {i} (20{i:02d}) shipped service {i} to production" for i in range(40))
+    text = f"Jane Doe\njane.doe@example.com\nExperience\n{experience}\nSkills\nPython, Go"
+
+    compressed = compress_resume(text, 120)
+
+    assert count_tokens(compressed) <= 120
+    assert compressed.startswith("Jane Doe\njane.doe@example.com")
+    assert "Engineer, Company 0 (2000)" in compressed
+    assert "Company 39" not in compressed
+    assert "Skills\nPython, Go" in compressed
@@ -0,0 +1,62 @@
+"""Tests for concurrent resume parsing against a scripted chat model."""
+import asyncio
+import re
+
+import pytest
+
+from app.chains.resume_parser_chain import ResumeParserChain
+from app.config import settings
+from tests.fakes import ScriptedChatModel
+
+
+RESUMES = [(f"Name: Candidate {i}\nSkills: ABAP, OData", f"c{i}") for i in range(6)]
+
+
+def reply(prompt: str):
+    name = re.search(r"Name: (.+)", prompt).group(1)
+    if name == "Candidate 3":
+        return "ParsedResume", {"name": name, "skills": "not a list"}
+    return "ParsedResume", {"candidate_id": "from-llm", "name": name, "skills": ["ABAP", "OData"]}
+
+
+@pytest.fixture
+def chain(monkeypatch):
+    monkeypatch.setattr(settings.llm, "parse_cache_enabled", False)
+    monkeypatch.setattr(settings.llm, "resume_compression", False)
+    return ResumeParserChain(llm=ScriptedChatModel(reply=reply, delay=0.05))
+
+
+def check_results(results):
+    assert [r.name for i, r in enumerate(results) if i != 3] == [f"Candidate {i}" for i in (0, 1, 2, 4, 5)]
+    assert [r.candidate_id for i, r in enumerate(results) if i != 3] == ["c0", "c1", "c2", "c4", "c5"]
+    assert isinstance(results[3], Exception)
+
+
+def test_aparse_many_keeps_order_and_captures_errors(chain):
+    check_results(asyncio.run(chain.aparse_many(RESUMES, max_concurrency=3)))
+
+
+def test_aparse_many_bounds_concurrency(chain):
+    asyncio.run(chain.aparse_many(RESUMES, max_concurrency=2))
+
+    assert chain.llm.peak == 2
+
+
+def test_parse_many_keeps_order_and_captures_errors(chain):
+    check_results(chain.parse_many(RESUMES, max_concurrency=3))
+
+
+def test_cached_parses_skip_the_llm(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings.llm, "parse_cache_dir", str(tmp_path))
+    monkeypatch.setattr(settings.llm, "resume_compression", False)
+    llm = ScriptedChatModel(reply=reply)
+    chain = ResumeParserChain(llm=llm)
+
+    chain.parse_many(RESUMES)
+    calls = len(llm.prompts)
+    results = asyncio.run(chain.aparse_many([(text, f"again-{i}") for i, (text, _) in enumerate(RESUMES)]))
+
+    # Only the resume that failed to parse is sent again
+    assert len(llm.prompts) == calls + 1
+    assert results[0].candidate_id == "again-0"
+    assert results[0].raw_text == RESUMES[0][0]
@@ -0,0 +1,80 @@
+"""Tests for the skill interning table and vectorized skill matching."""
+import numpy as np
+import pytest
+
+from app.scoring.skill_ontology import SkillOntology, batch_skill_match_scores
+
+
+ALIASES = {"javascript": ["js", "ecmascript"], "kubernetes": ["k8s"]}
+
+
+def test_aliases_share_a_canonical_id():
+    ontology = SkillOntology(ALIASES)
+
+    assert ontology.skill_id("JS") == ontology.skill_id("javascript")
+    assert ontology.canonical("k8s") == "kubernetes"
+    assert ontology.variants("ecmascript") == {"javascript", "js", "ecmascript"}
+
+
+def test_unknown_skills_are_not_interned():
+    ontology = SkillOntology(ALIASES)
+
+    for i in range(10_000):
+        batch_skill_match_scores([f"skill {i}"], [], [[f"skill {i}"]], ontology=ontology)
+
+    assert ontology.size == len(ALIASES)
+    assert ontology.canonical("ABAP") == "abap"
+    assert ontology.variants("ABAP") == {"abap"}
+    with pytest.raises(KeyError):
+        ontology.skill_id("ABAP")
+
+
+def test_unknown_skills_get_ids_past_the_alias_table():
+    ontology = SkillOntology(ALIASES)
+    local = {}
+
+    abap = ontology.skill_id("ABAP", local)
+
+    assert abap >= ontology.size
+    assert ontology.skill_id("abap", local) == abap
+    assert ontology.skill_id("OData", local) == abap + 1
+    assert ontology.skill_id("js", local) == ontology.skill_id("javascript")
+
+
+def test_batch_scores_with_unknown_skills():
+    scores = batch_skill_match_scores(
+        ["js", "abap"], ["k8s"],
+        [["JavaScript", "ABAP", "Kubernetes"], ["ecmascript"], ["cobol"]],
+        ontology=SkillOntology(ALIASES)
+    )
+
+    assert np.allclose(scores, [1.0, 0.35, 0.0])
+
+
+class InterleavingOntology(SkillOntology):
+    """Runs another scoring call between encoding the JD and the candidates."""
+
+    def __init__(self, aliases):
+        super().__init__(aliases)
+        self.interleaved = False
+
+    def encode(self, skills, local=None):
+        if not self.interleaved:
+            self.interleaved = True
+            # Enough unknown skills to have evicted the JD's from any bounded table
+            other = [f"other skill {i}" for i in range(1_000)]
+            batch_skill_match_scores(other, [], [other], ontology=self)
+        return super().encode(skills, local)
+
+
+def test_unknown_jd_skill_survives_a_call_in_between():
+    ontology = InterleavingOntology(ALIASES)
+
+    scores = batch_skill_match_scores(
+        ["abap"], [],
+        [["fiori"], ["other skill 0"], ["ABAP"]],
+        ontology=ontology
+    )
+
+    assert ontology.interleaved
+    assert np.allclose(scores, [0.0, 0.0, 1.0])
@@ -0,0 +1,32 @@
+"""Tests for text cleaning and chunking."""
+from app.utils import chunk_text
+
+
+WORDS = " ".join(f"w{i}" for i in range(1000))
+
+
+def test_short_text_is_one_chunk():
+    assert chunk_text("a b c", chunk_words=10) == ["a b c"]
+
+
+def test_chunks_overlap_and_cover_the_text():
+    chunks = chunk_text(WORDS, chunk_words=200, overlap_words=40, max_chunks=32)
+
+    assert chunks[0].split()[0] == "w0"
+    assert chunks[-1].split()[-1] == "w999"
+    assert all(len(c.split()) == 200 for c in chunks)
+    assert chunks[1].split()[0] == "w160"
+
+
+def test_cap_spreads_chunks_over_the_text():
+    chunks = chunk_text(WORDS, chunk_words=200, overlap_words=40, max_chunks=3)
+
+    assert len(chunks) == 3
+    assert chunks[0].split()[0] == "w0"
+    assert chunks[-1].split()[-1] == "w999"
+
+
+def test_cap_of_one_returns_the_head_chunk():
+    chunks = chunk_text(WORDS, chunk_words=200, overlap_words=40, max_chunks=1)
+
+    assert chunks == [" ".join(f"w{i}" for i in range(200))]
@@ -0,0 +1,104 @@
+"""Tests for the memory-mapped local vector matrix."""
+import numpy as np
+import pytest
+
+from app.schemas.search_schema import CascadeStage
+from app.vector_store.matrix_search import normalize_rows
+from app.vector_store.vector_matrix import ResumeVectorMatrix
+
+
+DIM = 32
+
+
+def random_vectors(n: int, seed: int = 0) -> np.ndarray:
+    return normalize_rows(np.random.default_rng(seed).standard_normal((n, DIM)))
+
+
+def exact_ids(matrix: ResumeVectorMatrix, queries: np.ndarray, k: int):
+    """Brute-force top-k over the matrix's stored (dequantized) vectors."""
+    stored = normalize_rows(matrix.vectors(np.arange(len(matrix))))
+    order = np.argsort(-(normalize_rows(queries) @ stored.T), axis=1)[:, :k]
+    return [[matrix.ids[i] for i in row] for row in order]
+
+
+def test_upsert_overwrites_and_delete_moves_the_last_row(tmp_path):
+    matrix = ResumeVectorMatrix(tmp_path, dim=DIM)
+    vectors = random_vectors(4)
+    matrix.upsert(["a", "b", "c", "d"], vectors)
+    matrix.upsert(["b"], vectors[:1])
+
+    matrix.delete(["a", "missing"])
+
+    assert matrix.ids == ["d", "b", "c"]
+    assert np.allclose(matrix.vectors(np.array([0, 1])), vectors[[3, 0]], atol=1e-3)
+
+
+def test_flush_persists_rows_and_version(tmp_path):
+    matrix = ResumeVectorMatrix(tmp_path, dim=DIM)
+    vectors = random_vectors(3)
+    matrix.upsert(["a", "b", "c"], vectors)
+    matrix.flush(version=7)
+
+    reopened = ResumeVectorMatrix(tmp_path, dim=DIM)
+
+    assert (reopened.version, reopened.ids) == (7, ["a", "b", "c"])
+    assert np.allclose(reopened.vectors(np.arange(3)), vectors, atol=1e-3)
+
+
+def test_other_dtype_or_dim_starts_empty(tmp_path):
+    matrix = ResumeVectorMatrix(tmp_path, dim=DIM)
+    matrix.upsert(["a"], random_vectors(1))
+    matrix.flush(version=3)
+
+    assert len(ResumeVectorMatrix(tmp_path, dim=DIM, dtype="int8")) == 0
+    assert ResumeVectorMatrix(tmp_path, dim=DIM * 2).version == -1
+
+
+def test_grows_past_its_initial_capacity(tmp_path, monkeypatch):
+    monkeypatch.setattr(ResumeVectorMatrix, "MIN_CAPACITY", 4)
+    matrix = ResumeVectorMatrix(tmp_path, dim=DIM)
+    vectors = random_vectors(10)
+
+    for i in range(10):
+        matrix.upsert([str(i)], vectors[i:i + 1])
+
+    assert matrix.capacity >= 10
+    assert np.allclose(matrix.vectors(np.arange(10)), vectors, atol=1e-3)
+
+
+@pytest.mark.parametrize("dtype", ["float16", "int8"])
+def test_exact_cascade_matches_brute_force(tmp_path, dtype):
+    matrix = ResumeVectorMatrix(tmp_path, dim=DIM, dtype=dtype)
+    matrix.upsert([f"p{i}" for i in range(200)], random_vectors(200))
+    queries = random_vectors(5, seed=1)
+
+    found, scores = matrix.cascade(queries, [], top_k_final=5)
+
+    assert found == exact_ids(matrix, queries, 5)
+    assert np.all(np.diff(scores, axis=1) <= 0)
+
+
+def test_wide_cascade_stages_are_exact(tmp_path):
+    matrix = ResumeVectorMatrix(tmp_path, dim=DIM)
+    matrix.upsert([f"p{i}" for i in range(300)], random_vectors(300))
+    queries = random_vectors(4, seed=2)
+    stages = [
+        CascadeStage(kind="binary", dim=DIM, width=300),
+        CascadeStage(dim=8, width=300),
+        CascadeStage(dim=16, width=300)
+    ]
+
+    found, _ = matrix.cascade(queries, stages, top_k_final=3)
+
+    assert found == exact_ids(matrix, queries, 3)
+
+
+def test_stage_ranks_count_rows_scoring_above_the_target(tmp_path):
+    matrix = ResumeVectorMatrix(tmp_path, dim=DIM)
+    matrix.upsert([str(i) for i in range(50)], random_vectors(50))
+    query = random_vectors(1, seed=3)
+    order = np.argsort(-(normalize_rows(matrix.vectors(np.arange(50))) @ query[0]))
+
+    ranks = matrix.stage_ranks(query, order[None, [0, 4, 9]], CascadeStage(dim=DIM, width=10))
+
+    assert ranks.tolist() == [[0, 4, 9]]